@@ -0,0 +1,44 @@
+"""
+Compare full and items-only decoding of __NEXT_DATA__ payloads
+
+Usage:
+    python -m benchmarks.bench_decode [page.html ...]
+"""
+
+import sys
+import timeit
+import tracemalloc
+
+from bidfta_scraper.decoders import get_decoder
+from bidfta_scraper.extractors import scan_next_data
+from benchmarks.bench_extract import load_pages
+
+
+def peak_memory(decode, payloads):
+    """Return the peak traced allocation while decoding every payload once"""
+    tracemalloc.start()
+    for payload in payloads:
+        decode(payload)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main(argv=None):
+    pages = load_pages(argv if argv is not None else sys.argv[1:])
+    payloads = [scan_next_data(page) for page in pages]
+
+    results = {}
+    for mode in ('full', 'items'):
+        decode = get_decoder(mode)
+        runs = 50
+        seconds = min(timeit.repeat(lambda: [decode(payload) for payload in payloads], number=runs, repeat=3))
+        results[mode] = seconds / (runs * len(payloads))
+        peak = peak_memory(decode, payloads)
+        print(f"{mode:>5}: {results[mode] * 1e3:8.3f} ms/page, peak {peak / 1024:,.0f} KiB")
+
+    print(f"speedup: {results['full'] / results['items']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
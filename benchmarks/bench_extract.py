@@ -0,0 +1,42 @@
+"""
+Compare __NEXT_DATA__ extractors on recorded or synthetic pages
+
+Usage:
+    python -m benchmarks.bench_extract [page.html ...]
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+from bidfta_scraper.extractors import get_extractor
+from benchmarks.pages import build_page
+
+
+def load_pages(paths):
+    """Load recorded pages from disk, or synthesize a set when none are given"""
+    if paths:
+        return [Path(path).read_bytes() for path in paths]
+    return [build_page(item_count=count, seed=count) for count in (24, 48, 96)]
+
+
+def main(argv=None):
+    pages = load_pages(argv if argv is not None else sys.argv[1:])
+    total_kib = sum(len(page) for page in pages) / 1024
+    print(f"{len(pages)} pages, {total_kib:,.0f} KiB total")
+
+    results = {}
+    for name in ('soup', 'scan'):
+        extractor = get_extractor(name)
+        payloads = [extractor.extract(page) for page in pages]
+        assert all(payloads), f"{name} failed to find a payload"
+        runs = 20
+        seconds = min(timeit.repeat(lambda: [extractor.extract(page) for page in pages], number=runs, repeat=3))
+        results[name] = seconds / (runs * len(pages))
+        print(f"{name:>5}: {results[name] * 1e3:8.3f} ms/page")
+
+    print(f"speedup: {results['soup'] / results['scan']:,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
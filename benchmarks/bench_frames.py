@@ -0,0 +1,66 @@
+"""
+Compare row-oriented and columnar DataFrame construction
+
+Usage:
+    python -m benchmarks.bench_frames [--sizes 10000 100000 1000000]
+"""
+
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from bidfta_scraper.frames import FrameBuilder
+from bidfta_scraper.items import BidFTAItem
+from benchmarks.pages import build_item
+
+
+def row_oriented(rows):
+    """The original path: items -> to_dict() -> DataFrame -> post-processing"""
+    items = [BidFTAItem.from_row(row, "bench") for row in rows]
+    df = pd.DataFrame([item.to_dict() for item in items])
+    df['end_datetime'] = pd.to_datetime(df['end_datetime'])
+    df['hours_remaining'] = df['time_remaining'].astype(float) / 3600
+    return df
+
+
+def columnar_items(rows):
+    """Items appended to typed column buffers"""
+    builder = FrameBuilder()
+    builder.extend(BidFTAItem.from_row(row, "bench") for row in rows)
+    return builder.build()
+
+
+def columnar_rows(rows):
+    """Compact rows appended to typed column buffers without building items"""
+    builder = FrameBuilder()
+    builder.extend_rows(rows, "bench")
+    return builder.build()
+
+
+def timed(function, rows):
+    start = time.perf_counter()
+    df = function(rows)
+    elapsed = time.perf_counter() - start
+    assert len(df) == len(rows)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    template = [BidFTAItem.row_from_data(build_item(i, rng)) for i in range(1000)]
+
+    print(f"{'items':>10} {'row dicts':>12} {'cols/items':>12} {'cols/rows':>12}")
+    for size in args.sizes:
+        rows = (template * (size // len(template) + 1))[:size]
+        results = [timed(function, rows) for function in (row_oriented, columnar_items, columnar_rows)]
+        print(f"{size:>10,} " + " ".join(f"{seconds:>11.3f}s" for seconds in results))
+
+
+if __name__ == "__main__":
+    main()
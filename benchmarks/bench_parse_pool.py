@@ -0,0 +1,69 @@
+"""
+Measure async scraping throughput with parsing inline vs on a process pool
+
+Pages are replayed from memory with a simulated network latency, so the
+numbers reflect how well parsing keeps up as worker processes are added.
+
+Usage:
+    python -m benchmarks.bench_parse_pool [--pages N] [--latency SECONDS]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from bidfta_scraper import AsyncBidFTAScraper
+from bidfta_scraper.cache import PageResponse
+from benchmarks.pages import build_page
+
+
+class ReplayScraper(AsyncBidFTAScraper):
+    """Async scraper that serves every page from memory"""
+
+    def __init__(self, pages, latency, **kwargs):
+        super().__init__(request_delay=0, **kwargs)
+        self.pages = pages
+        self.latency = latency
+
+    async def fetch_response(self, session, url, search_term=None, page_id=None, headers=None):
+        async with self.semaphore:
+            await asyncio.sleep(self.latency)
+            page_id = int(url.split("pageId=")[1].split("&")[0])
+            return PageResponse(self.pages[page_id - 1], 200)
+
+
+def run(pages, latency, concurrency, executor=None):
+    """Scrape every page once and return pages per second"""
+    scraper = ReplayScraper(pages, latency, max_concurrent_requests=concurrency, parse_executor=executor)
+    start = time.perf_counter()
+    items = asyncio.run(scraper.scrape_search_term(None, "bench"))
+    elapsed = time.perf_counter() - start
+    assert items, "no items parsed"
+    return len(pages) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    pages = [build_page(item_count=96, page_id=i, total_pages=args.pages) for i in range(1, args.pages + 1)]
+    print(f"{args.pages} pages, {os.cpu_count()} CPUs, {args.latency * 1e3:.0f} ms latency")
+
+    print(f"  inline: {run(pages, args.latency, args.concurrency):8.1f} pages/s")
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Warm the pool so process start-up is not measured
+            list(executor.map(abs, range(workers)))
+            rate = run(pages, args.latency, args.concurrency, executor)
+        print(f"{workers:>3} proc: {rate:8.1f} pages/s")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Time deal scoring and top-K selection against a full sort
+
+Usage:
+    python -m benchmarks.bench_scoring [--sizes 100000 1000000 5000000] [--top 50]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from bidfta_scraper.scoring import DealScorer
+
+
+def build_frame(size, rng):
+    return pd.DataFrame({
+        'current_bid': rng.random(size) * 500,
+        'msrp': rng.random(size) * 1000,
+        'bids_count': rng.integers(0, 50, size),
+        'hours_remaining': rng.random(size) * 96,
+    })
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000, 5_000_000])
+    parser.add_argument("--top", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    scorer = DealScorer()
+
+    print(f"{'rows':>10} {'score':>10} {'top-K':>10} {'full sort':>10}")
+    for size in args.sizes:
+        df = build_frame(size, rng)
+        results = [
+            timed(lambda: scorer.score(df)),
+            timed(lambda: scorer.top(df, args.top)),
+            timed(lambda: df.assign(score=scorer.score(df)).sort_values('score', ascending=False).head(args.top)),
+        ]
+        print(f"{size:>10,} " + " ".join(f"{seconds:>9.3f}s" for seconds in results))
+
+
+if __name__ == "__main__":
+    main()
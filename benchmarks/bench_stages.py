@@ -0,0 +1,177 @@
+"""
+Time each stage of scrape_search_terms separately, plus end-to-end throughput
+
+Stages run over the same synthetic pages: HTML extraction, full and
+items-only JSON decoding, extract_items_from_json, BidFTAItem construction,
+to_dict, and DataFrame building. End-to-end throughput is measured with the
+async scraper against the local replay server. Results are written as JSON
+so runs on different commits can be compared.
+
+Usage:
+    python -m benchmarks.bench_stages [--pages 20] [--items 96] [--repeat 5]
+        [--latency 0.0] [--output results.json] [--compare baseline.json]
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from bidfta_scraper import AsyncBidFTAScraper, BidFTAScraper
+from bidfta_scraper.decoders import decode_full, decode_items_or_full
+from bidfta_scraper.extractors import ScanExtractor
+from bidfta_scraper.frames import FrameBuilder
+from bidfta_scraper.items import BidFTAItem
+from benchmarks.pages import build_page
+from benchmarks.replay_server import ReplayServer
+
+
+def measure(function: Callable[[], object], repeat: int, units: int) -> Dict[str, float]:
+    """Run a stage `repeat` times and summarize the timings"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    median = statistics.median(timings)
+    return {
+        'median': median,
+        'min': min(timings),
+        'max': max(timings),
+        'units': units,
+        'per_second': units / median if median else 0.0,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_stages(pages: int, items: int, repeat: int, latency: float = 0.0) -> Dict:
+    """
+    Measure every stage and return the results as a JSON-ready dictionary
+
+    Args:
+        pages: Synthetic pages per stage
+        items: Items per page
+        repeat: Timed runs per stage; the median is reported
+        latency: Simulated network latency of the replay server in seconds
+
+    Returns:
+        {'meta': {...}, 'stages': {name: {'median', 'min', 'max', 'units', 'per_second'}}}
+    """
+    html = [build_page(items, page_id, pages) for page_id in range(1, pages + 1)]
+    extractor = ScanExtractor()
+    payloads = [extractor.extract(page) for page in html]
+    documents = [decode_full(payload) for payload in payloads]
+    raw_items = [item for document in documents for item in document['props']['pageProps']['initialData']['items']]
+    built = [BidFTAItem(item_data, "bench") for item_data in raw_items]
+    rows = [BidFTAItem.row_from_data(item_data) for item_data in raw_items]
+    scraper = BidFTAScraper(request_delay=0)
+    total = len(raw_items)
+
+    def dataframe_from_dicts():
+        df = pd.DataFrame([item.to_dict() for item in built])
+        df['end_datetime'] = pd.to_datetime(df['end_datetime'])
+        df['hours_remaining'] = df['time_remaining'].astype(float) / 3600
+
+    def dataframe_from_columns():
+        builder = FrameBuilder()
+        builder.extend(built)
+        builder.build()
+
+    def dataframe_from_rows():
+        builder = FrameBuilder()
+        builder.extend_rows(rows, "bench")
+        builder.build()
+
+    stages = {
+        'extract': (lambda: [extractor.extract(page) for page in html], pages),
+        'json_loads': (lambda: [decode_full(payload) for payload in payloads], pages),
+        'json_items_only': (lambda: [decode_items_or_full(payload) for payload in payloads], pages),
+        'extract_items_from_json': (lambda: [scraper.extract_items_from_json(document, "bench") for document in documents], total),
+        'item_build': (lambda: [BidFTAItem(item_data, "bench") for item_data in raw_items], total),
+        'row_build': (lambda: [BidFTAItem.from_row(BidFTAItem.row_from_data(item_data), "bench") for item_data in raw_items], total),
+        'to_dict': (lambda: [item.to_dict() for item in built], total),
+        'dataframe_from_dicts': (dataframe_from_dicts, total),
+        'dataframe_from_items': (dataframe_from_columns, total),
+        'dataframe_from_rows': (dataframe_from_rows, total),
+    }
+    results = {name: measure(function, repeat, units) for name, (function, units) in stages.items()}
+    results['end_to_end_async'] = measure(lambda: asyncio.run(scrape_replay(pages, items, latency)), repeat, total)
+
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': sys.version.split()[0],
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+            'pages': pages,
+            'items_per_page': items,
+            'repeat': repeat,
+            'latency': latency,
+        },
+        'stages': results,
+    }
+
+
+async def scrape_replay(pages: int, items: int, latency: float) -> None:
+    async with ReplayServer(items_per_page=items, total_pages=pages, latency=latency) as url:
+        df = await AsyncBidFTAScraper(base_url=url, request_delay=0).scrape_search_terms(["bench"])
+    assert len(df) == pages * items, f"expected {pages * items} items, got {len(df)}"
+
+
+def compare(current: Dict, baseline: Dict) -> List[str]:
+    """Format a line per stage with its median time relative to a baseline run"""
+    lines = []
+    for name, result in current['stages'].items():
+        before = baseline['stages'].get(name)
+        if before is None or not before['median']:
+            lines.append(f"{name:<26} {result['median'] * 1e3:>10.2f} ms {'(new)':>10}")
+            continue
+        ratio = result['median'] / before['median']
+        lines.append(f"{name:<26} {result['median'] * 1e3:>10.2f} ms {ratio:>9.2f}x")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--items", type=int, default=96, help="items per page")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.0, help="replay server latency in seconds")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON results of an earlier run to compare against")
+    args = parser.parse_args()
+
+    results = run_stages(args.pages, args.items, args.repeat, args.latency)
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        print(f"vs {args.compare} (commit {baseline['meta'].get('commit')})")
+        print("\n".join(compare(results, baseline)))
+    else:
+        print(f"{'stage':<26} {'median':>13} {'units/s':>12}")
+        for name, result in results['stages'].items():
+            print(f"{name:<26} {result['median'] * 1e3:>10.2f} ms {result['per_second']:>12,.0f}")
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+        print(f"Saved results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
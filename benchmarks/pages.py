@@ -0,0 +1,79 @@
+"""
+Synthetic BidFTA result pages for benchmarks
+"""
+
+import json
+import random
+from typing import Dict, List
+
+
+def build_item(index: int, rng: random.Random) -> Dict:
+    """Build one raw item dictionary as it appears in the Next.js payload"""
+    msrp = round(rng.uniform(5, 900), 2)
+    return {
+        "title": f"Synthetic Item {index} - {rng.choice(['Aquarium', 'Monitor', 'Filter', 'Motor'])}",
+        "currentBid": round(msrp * rng.uniform(0.01, 0.8), 2),
+        "imageUrl": f"https://example.com/images/{index}.jpg",
+        "utcEndDateTime": f"2025-01-{rng.randint(10, 28):02d}T{rng.randint(0, 23):02d}:19:00Z",
+        "itemTimeRemaining": str(rng.randint(60, 7 * 24 * 3600)),
+        "msrp": msrp,
+        "condition": rng.choice(["New", "Like New", "As Is", "Damaged"]),
+        "lotCode": f"LOT{index:07d}",
+        "bidsCount": rng.randint(0, 40),
+        "auctionId": str(100000 + index // 50),
+        "description": "Lorem ipsum dolor sit amet " * rng.randint(2, 8),
+    }
+
+
+def build_next_data(items: List[Dict], page_id: int = 1, total_pages: int = 1) -> Dict:
+    """Wrap raw items in a Next.js __NEXT_DATA__ document"""
+    return {
+        "props": {
+            "pageProps": {
+                "initialData": {
+                    "items": items,
+                    "totalPages": total_pages,
+                    "totalItems": len(items) * total_pages,
+                    "pageId": page_id,
+                },
+                "locale": {f"key{i}": f"Localized string number {i}" for i in range(300)},
+            },
+            "__N_SSP": True,
+        },
+        "page": "/items",
+        "query": {"pageId": str(page_id)},
+        "buildId": "synthetic",
+        "runtimeConfig": {f"feature{i}": bool(i % 2) for i in range(200)},
+    }
+
+
+def build_page(item_count: int = 24, page_id: int = 1, total_pages: int = 1, seed: int = 0) -> bytes:
+    """
+    Build a complete results page
+
+    Args:
+        item_count: Number of items on the page
+        page_id: Page number reported in the payload
+        total_pages: Total page count reported in the payload
+        seed: Random seed so pages are reproducible
+
+    Returns:
+        The page as UTF-8 encoded HTML
+    """
+    rng = random.Random(seed * 1000 + page_id)
+    items = [build_item((page_id - 1) * item_count + i, rng) for i in range(item_count)]
+    cards = "".join(
+        f'<div class="card"><a href="/item/{item["lotCode"]}"><img src="{item["imageUrl"]}">'
+        f'<span class="title">{item["title"]}</span><span class="bid">${item["currentBid"]}</span></a></div>'
+        for item in items
+    )
+    payload = json.dumps(build_next_data(items, page_id, total_pages))
+    html = (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>Items | BidFTA</title>'
+        + '<link rel="preload" href="/_next/static/chunk.js" as="script">' * 40
+        + '</head><body><div id="__next"><nav>' + '<a href="#">Menu</a>' * 60 + '</nav>'
+        + f'<main>{cards}</main></div>'
+        + f'<script id="__NEXT_DATA__" type="application/json">{payload}</script>'
+        + '<script src="/_next/static/main.js" async=""></script></body></html>'
+    )
+    return html.encode("utf-8")
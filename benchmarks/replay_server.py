@@ -0,0 +1,270 @@
+"""
+Local stand-in for bidfta.com that serves synthetic or recorded result pages
+
+Point either scraper at it with base_url to measure throughput without
+touching the real site:
+
+    async with ReplayServer(items_per_page=96, total_pages=10, latency=0.05) as url:
+        scraper = AsyncBidFTAScraper(base_url=url, request_delay=0)
+        df = await scraper.scrape_search_terms(["aquarium"])
+
+Usage:
+    python -m benchmarks.replay_server [--port 8080] [--items 24] [--pages 5]
+        [--latency 0.05] [--jitter 0.02] [--error-rate 0.01] [--fixtures DIR]
+    python -m benchmarks.replay_server --write-fixtures DIR [--items 24] [--pages 5]
+    python -m benchmarks.replay_server --record DIR --term aquarium [--pages 5]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import os
+import random
+import threading
+import zlib
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from aiohttp import web
+
+from benchmarks.pages import build_page
+
+
+def load_fixtures(fixtures_dir: str) -> List[bytes]:
+    """Read recorded pages from a directory, ordered by file name"""
+    names = sorted(name for name in os.listdir(fixtures_dir) if name.endswith(".html"))
+    pages = []
+    for name in names:
+        with open(os.path.join(fixtures_dir, name), "rb") as file:
+            pages.append(file.read())
+    return pages
+
+
+def write_fixtures(fixtures_dir: str, items_per_page: int = 24, total_pages: int = 5, seed: int = 0) -> List[str]:
+    """Write a synthetic fixture corpus of page-0001.html, page-0002.html, ..."""
+    os.makedirs(fixtures_dir, exist_ok=True)
+    paths = []
+    for page_id in range(1, total_pages + 1):
+        path = os.path.join(fixtures_dir, f"page-{page_id:04d}.html")
+        with open(path, "wb") as file:
+            file.write(build_page(items_per_page, page_id, total_pages, seed))
+        paths.append(path)
+    return paths
+
+
+def record_fixtures(fixtures_dir: str, search_term: str, total_pages: int = 5, location_id: str = "616") -> List[str]:
+    """Save real result pages from bidfta.com as a fixture corpus"""
+    from bidfta_scraper import BidFTAScraper
+
+    scraper = BidFTAScraper(location_id=location_id)
+    os.makedirs(fixtures_dir, exist_ok=True)
+    paths = []
+    for page_id in range(1, total_pages + 1):
+        body = scraper.fetch_page(scraper.build_url(search_term, page_id), search_term, page_id)
+        path = os.path.join(fixtures_dir, f"page-{page_id:04d}.html")
+        with open(path, "wb") as file:
+            file.write(body)
+        paths.append(path)
+    return paths
+
+
+class ReplayServer:
+    """
+    aiohttp server that answers /items search requests like bidfta.com
+
+    Synthetic pages are generated per (search term, location, page) and
+    reused, so repeated requests cost no generation time. Pages past
+    total_pages come back with no items, which ends a scrape the same way
+    the real site does. Responses carry an ETag and honour If-None-Match, so
+    the response cache can be exercised too.
+    """
+
+    def __init__(self,
+                 items_per_page: int = 24,
+                 total_pages: int = 5,
+                 latency: float = 0.0,
+                 jitter: float = 0.0,
+                 error_rate: float = 0.0,
+                 fixtures_dir: Optional[str] = None,
+                 seed: int = 0,
+                 host: str = "127.0.0.1",
+                 port: int = 0):
+        """
+        Initialize the server
+
+        Args:
+            items_per_page: Items on each synthetic page
+            total_pages: Pages per search term
+            latency: Seconds to wait before each response
+            jitter: Extra random delay of up to this many seconds
+            error_rate: Fraction of requests answered with HTTP 503
+            fixtures_dir: Serve these recorded pages (in file name order) for
+                every search term instead of synthetic ones
+            seed: Seed for page contents and simulated errors
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free one)
+        """
+        self.items_per_page = items_per_page
+        self.total_pages = total_pages
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.fixtures = load_fixtures(fixtures_dir) if fixtures_dir else None
+        self.seed = seed
+        self.host = host
+        self.port = port
+        self.requests = 0
+        self.errors = 0
+        self.not_modified = 0
+        # Client address of every connection seen, to check keep-alive reuse
+        self.connections: Set[Tuple] = set()
+        self.user_agents: Set[str] = set()
+        self._rng = random.Random(seed)
+        self._pages: Dict[Tuple[str, str, int], Tuple[bytes, str]] = {}
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def url(self) -> str:
+        """Search endpoint to pass to a scraper as base_url"""
+        return f"http://{self.host}:{self.port}/items"
+
+    def page(self, search_term: str, location_id: str, page_id: int) -> Tuple[bytes, str]:
+        """Return the body and ETag served for one page"""
+        key = (search_term, location_id, page_id)
+        if key not in self._pages:
+            if self.fixtures is not None:
+                if page_id <= len(self.fixtures):
+                    body = self.fixtures[page_id - 1]
+                else:
+                    body = build_page(0, page_id, len(self.fixtures))
+            else:
+                seed = self.seed ^ zlib.crc32(f"{search_term}|{location_id}".encode())
+                item_count = self.items_per_page if page_id <= self.total_pages else 0
+                body = build_page(item_count, page_id, self.total_pages, seed)
+            self._pages[key] = (body, f'"{hashlib.sha1(body).hexdigest()[:16]}"')
+        return self._pages[key]
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        if request.transport is not None:
+            self.connections.add(request.transport.get_extra_info('peername'))
+        self.user_agents.add(request.headers.get('User-Agent', ''))
+        delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.error_rate and self._rng.random() < self.error_rate:
+            self.errors += 1
+            return web.Response(status=503, text="Service Unavailable")
+
+        query = request.query
+        try:
+            page_id = int(query.get("pageId", "1"))
+        except ValueError:
+            return web.Response(status=400, text="Bad pageId")
+        body, etag = self.page(query.get("itemSearchKeywords", ""), query.get("locations", ""), page_id)
+        if request.headers.get("If-None-Match") == etag:
+            self.not_modified += 1
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(body=body, content_type="text/html", headers={"ETag": etag})
+
+    async def start(self) -> str:
+        """Start listening and return the search endpoint URL"""
+        app = web.Application()
+        app.router.add_get("/items", self.handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self.url
+
+    async def stop(self) -> None:
+        """Stop the server"""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> str:
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    @contextlib.contextmanager
+    def running_in_thread(self) -> Iterator[str]:
+        """Run the server on a background event loop, e.g. for the sync scraper"""
+        loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def serve() -> None:
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(self.start())
+            started.set()
+            loop.run_forever()
+
+        thread = threading.Thread(target=serve, daemon=True)
+        thread.start()
+        started.wait()
+        try:
+            yield self.url
+        finally:
+            asyncio.run_coroutine_threadsafe(self.stop(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+
+async def serve_forever(server: ReplayServer) -> None:
+    url = await server.start()
+    print(f"Serving on {url} (Ctrl+C to stop)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--items", type=int, default=24, help="items per page")
+    parser.add_argument("--pages", type=int, default=5, help="pages per search term")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fixtures", help="serve recorded pages from this directory")
+    parser.add_argument("--write-fixtures", metavar="DIR", help="write a synthetic fixture corpus and exit")
+    parser.add_argument("--record", metavar="DIR", help="save real pages for --term from bidfta.com and exit")
+    parser.add_argument("--term", default="aquarium", help="search term to record")
+    parser.add_argument("--location", default="616", help="location to record")
+    args = parser.parse_args()
+
+    if args.write_fixtures:
+        paths = write_fixtures(args.write_fixtures, args.items, args.pages, args.seed)
+        print(f"Wrote {len(paths)} pages to {args.write_fixtures}")
+        return
+    if args.record:
+        paths = record_fixtures(args.record, args.term, args.pages, args.location)
+        print(f"Recorded {len(paths)} pages to {args.record}")
+        return
+
+    server = ReplayServer(
+        items_per_page=args.items,
+        total_pages=args.pages,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        fixtures_dir=args.fixtures,
+        seed=args.seed,
+        host=args.host,
+        port=args.port,
+    )
+    try:
+        asyncio.run(serve_forever(server))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,19 @@ A Python package for scraping auction listings from BidFTA.com.
 """
 
 from .scraper import BidFTAScraper, BidFTAItem, format_results
+from .frames import FrameBuilder
 from .async_scraper import AsyncBidFTAScraper, format_async_results
+from .rate_limit import TokenBucket
+from .concurrency import AdaptiveConcurrencyController
+from .retry import RetryPolicy, ScrapeReport
+from .cache import ResponseCache
+from .scoring import DealScorer, top_deals
+from .store import ItemStore
+from .export import write_parquet, read_parquet
+from .delta import DeltaEngine, ItemEvent
+from .watch import WatchScheduler, WatchResult
+from .metrics import MetricsSink, InMemoryMetrics, PrometheusExporter
+from .profiling import Profiler
 
 __version__ = "0.2.0"
 __author__ = "Graham Kowalski"
@@ -16,6 +28,25 @@ __all__ = [
     "BidFTAScraper",
     "AsyncBidFTAScraper",
     "BidFTAItem",
+    "FrameBuilder",
     "format_results",
-    "format_async_results"
+    "format_async_results",
+    "TokenBucket",
+    "AdaptiveConcurrencyController",
+    "RetryPolicy",
+    "ScrapeReport",
+    "ResponseCache",
+    "DealScorer",
+    "top_deals",
+    "ItemStore",
+    "write_parquet",
+    "read_parquet",
+    "DeltaEngine",
+    "ItemEvent",
+    "WatchScheduler",
+    "WatchResult",
+    "MetricsSink",
+    "InMemoryMetrics",
+    "PrometheusExporter",
+    "Profiler"
 ]
\ No newline at end of file
@@ -4,13 +4,30 @@ Async implementation of the BidFTA Scraper
 
 import aiohttp
 import asyncio
-from bs4 import BeautifulSoup
-import json
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime
 import pandas as pd
-from typing import List, Dict, Optional
+from concurrent.futures import Executor
+from typing import Hashable, AsyncIterator, Awaitable, Callable, Iterable, List, Dict, Optional, Sequence, Tuple, Union
 import logging
-from .scraper import BidFTAItem
+from .items import BidFTAItem, unique_rows
+from .locations import page_count_key, parse_location_ids
+from .frames import FrameBuilder, merge_duplicate_terms
+from .formatting import format_currency_columns
+from .parsing import parse_page_rows
+from .extractors import get_extractor
+from .decoders import get_decoder
+from .rate_limit import TokenBucket, make_rate_limiter
+from .concurrency import AdaptiveConcurrencyController, parse_retry_after
+from .retry import RetryPolicy, ScrapeReport
+from .cache import ResponseCache, PageResponse
+from .store import ItemStore
+from .metrics import (MetricsSink, RunMetrics, BYTES, CACHE_HITS, DATAFRAME, ERRORS, FETCH, ITEMS,
+                      NOT_MODIFIED, PARSE, REQUESTS, RETRIES, RUN, STORE)
+from .profiling import Profiler, profile_run
+from .session import USER_AGENT, create_session
+from . import profiling
 
 # Set up logging
 logging.basicConfig(
@@ -19,30 +36,177 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+PageCallback = Callable[[List[BidFTAItem]], Awaitable[None]]
+RowsCallback = Callable[[List[Tuple]], Awaitable[None]]
+
 class AsyncBidFTAScraper:
     """Asynchronous scraper class for BidFTA.com"""
     
     def __init__(self, 
-                 location_id: str = "616", 
+                 location_id: Union[str, Sequence[str]] = "616", 
                  request_delay: float = 0.5,
-                 max_concurrent_requests: int = 5):
+                 max_concurrent_requests: int = 5,
+                 max_pages: Optional[int] = None,
+                 extractor=None,
+                 json_mode: str = "items",
+                 parse_executor: Optional[Executor] = None,
+                 requests_per_second: Optional[float] = None,
+                 burst: Optional[int] = None,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 adaptive_concurrency: Union[bool, AdaptiveConcurrencyController] = False,
+                 max_adaptive_concurrency: Optional[int] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 cache: Optional[ResponseCache] = None,
+                 currency_strings: bool = False,
+                 store: Optional[ItemStore] = None,
+                 dedupe_terms: bool = False,
+                 base_url: str = "https://www.bidfta.com/items",
+                 metrics: Optional[MetricsSink] = None,
+                 profiler: Optional[Profiler] = None,
+                 limit_per_host: Optional[int] = None,
+                 keepalive_timeout: float = 30.0,
+                 dns_cache_ttl: int = 300,
+                 user_agent: str = USER_AGENT):
         """
         Initialize the async BidFTA scraper
         
         Args:
-            location_id: The location ID to filter results (default: "616")
-            request_delay: Delay between requests in seconds (default: 0.5)
+            location_id: The location ID to filter results, or a list of location
+                IDs to scrape in one run over a shared session and rate limiter
+                (default: "616")
+            request_delay: Per-slot delay between requests in seconds, used when
+                requests_per_second is not given (default: 0.5)
             max_concurrent_requests: Maximum number of concurrent requests (default: 5)
+            max_pages: Maximum number of result pages per search term (default: no limit)
+            extractor: How to find the __NEXT_DATA__ payload: 'auto', 'scan', 'soup'
+                or an extractor object (default: 'auto')
+            json_mode: 'items' to decode only the items subtree of the payload,
+                or 'full' to decode all of it (default: 'items')
+            parse_executor: Executor used to parse pages off the event loop, e.g. a
+                ProcessPoolExecutor (default: parse inline on the event loop)
+            requests_per_second: Request rate limit, independent of the concurrency
+                limit (default: max_concurrent_requests / request_delay)
+            burst: Number of requests that may be made back to back
+                (default: max_concurrent_requests)
+            rate_limiter: A TokenBucket to share with other scrapers, overrides
+                requests_per_second and burst
+            adaptive_concurrency: True to tune the concurrency window from latency and
+                429/503 responses, starting at max_concurrent_requests, or an
+                AdaptiveConcurrencyController to use (default: fixed window).
+                The default rate limit does not depend on the window.
+            max_adaptive_concurrency: Largest window adaptive_concurrency=True may
+                grow to (default: max(64, max_concurrent_requests))
+            retry_policy: How to retry failed requests (default: RetryPolicy())
+            cache: ResponseCache consulted before the network (default: no cache)
+            currency_strings: Return current_bid and msrp as "$1,234.50" strings,
+                as earlier releases did, instead of floats (default: False)
+            store: ItemStore that scrape_search_terms upserts its results into
+                (default: no store)
+            dedupe_terms: Return one row per lot, with a search_terms list of
+                every term that found it, instead of one row per term
+                (default: False)
+            base_url: Search endpoint, e.g. a local replay server for benchmarks
+                (default: "https://www.bidfta.com/items")
+            metrics: MetricsSink that also receives every counter and stage
+                timing, e.g. a PrometheusExporter (default: only last_metrics)
+            profiler: Profiler that wraps every scrape_search_terms run and
+                writes CPU profiles and memory snapshots (default: no profiling)
+            limit_per_host: Maximum open connections to the site (default: the
+                largest concurrency window the scraper may use)
+            keepalive_timeout: Seconds an idle connection is kept for reuse (default: 30)
+            dns_cache_ttl: Seconds resolved addresses are cached (default: 300)
+            user_agent: User-Agent header sent with every request (default: the
+                same browser string as BidFTAScraper)
         """
-        self.base_url = "https://www.bidfta.com/items"
-        self.location_id = location_id
+        self.base_url = base_url
+        self.location_ids = parse_location_ids(location_id)
+        self.location_id = self.location_ids[0]
         self.request_delay = request_delay
+        
+        if adaptive_concurrency is True:
+            adaptive_concurrency = AdaptiveConcurrencyController(
+                initial=max_concurrent_requests,
+                max_limit=max_adaptive_concurrency or max(64, max_concurrent_requests)
+            )
+        self.concurrency_controller = adaptive_concurrency or None
+        
+        if requests_per_second is None and request_delay:
+            requests_per_second = max_concurrent_requests / request_delay
+        self.rate_limiter = make_rate_limiter(
+            requests_per_second, burst or max_concurrent_requests, rate_limiter
+        )
         self.max_concurrent_requests = max_concurrent_requests
-        self.semaphore = asyncio.Semaphore(max_concurrent_requests)
+        self.max_pages = max_pages
+        # Keyed by search term, or by (search_term, location_id) with several locations
+        self.page_counts: Dict[Hashable, int] = {}
+        self.extractor = get_extractor(extractor)
+        self.json_mode = json_mode
+        self.decoder = get_decoder(json_mode)
+        self.parse_executor = parse_executor
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.last_report = ScrapeReport()
+        self.metrics = metrics
+        self.last_metrics = RunMetrics(metrics)
+        self.profiler = profiler
+        self.cache = cache
+        self.currency_strings = currency_strings
+        self.store = store
+        self.dedupe_terms = dedupe_terms
+        self.semaphore = self.concurrency_controller or asyncio.Semaphore(max_concurrent_requests)
+        self.limit_per_host = limit_per_host or (
+            self.concurrency_controller.max_limit if self.concurrency_controller else max_concurrent_requests
+        )
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.user_agent = user_agent
+        self.session: Optional[aiohttp.ClientSession] = None
+    
+    async def __aenter__(self) -> 'AsyncBidFTAScraper':
+        await self.open()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def open(self) -> aiohttp.ClientSession:
+        """
+        Open the long-lived session reused by every later call
+        
+        Without it each scrape_search_terms or iter_items call opens and
+        closes its own session, repeating DNS lookups and TCP/TLS handshakes.
+        Prefer `async with AsyncBidFTAScraper(...) as scraper:`, which opens
+        and closes the session for you.
+        
+        Returns:
+            The open session
+        """
+        if self.session is None or self.session.closed:
+            self.session = self.new_session()
+        return self.session
+    
+    async def close(self) -> None:
+        """Close the session opened by open(), if any"""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+    
+    def new_session(self) -> aiohttp.ClientSession:
+        """Create a session with the scraper's connection pool and headers"""
+        return create_session(self.limit_per_host, self.keepalive_timeout, self.dns_cache_ttl, self.user_agent)
+    
+    @asynccontextmanager
+    async def session_scope(self) -> AsyncIterator[aiohttp.ClientSession]:
+        """Yield the open session, or a temporary one closed on exit if none is open"""
+        if self.session is not None and not self.session.closed:
+            yield self.session
+            return
+        async with self.new_session() as session:
+            yield session
         
-    def build_url(self, search_term: str) -> str:
-        """Build the URL for the search query"""
-        return f"{self.base_url}?pageId=1&itemSearchKeywords={search_term}&locations={self.location_id}"
+    def build_url(self, search_term: str, page_id: int = 1, location_id: Optional[str] = None) -> str:
+        """Build the URL for the search query (location_id defaults to the first configured location)"""
+        location_id = location_id or self.location_id
+        return f"{self.base_url}?pageId={page_id}&itemSearchKeywords={search_term}&locations={location_id}"
     
     async def extract_items_from_json(self, json_data: Dict, search_term: str) -> List[BidFTAItem]:
         """Extract item information from JSON data"""
@@ -56,41 +220,352 @@ class AsyncBidFTAScraper:
         
         return items
 
-    async def fetch_page(self, session: aiohttp.ClientSession, url: str) -> Optional[str]:
-        """Fetch a page with rate limiting"""
-        async with self.semaphore:
+    async def fetch_response(self, 
+                             session: aiohttp.ClientSession, 
+                             url: str, 
+                             search_term: Optional[str] = None, 
+                             page_id: Optional[int] = None,
+                             headers: Optional[Dict[str, str]] = None) -> Optional[PageResponse]:
+        """
+        Fetch a page with rate limiting, retrying transient failures
+        
+        Returns the body (None for 304 Not Modified), status and validators, or
+        None once retries are exhausted; the failure is recorded in last_report
+        along with search_term and page_id when given.
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.rate_limiter:
+                # Wait for a token before taking a concurrency slot, so waiting
+                # never holds a slot idle
+                await self.rate_limiter.acquire_async()
             try:
-                async with session.get(url) as response:
-                    response.raise_for_status()
-                    await asyncio.sleep(self.request_delay)
-                    return await response.text()
-            except aiohttp.ClientError as e:
-                logger.error(f"Error fetching {url}: {str(e)}")
+                async with self.semaphore:
+                    self.last_metrics.increment(REQUESTS)
+                    start = time.monotonic()
+                    async with session.get(url, headers=headers) as response:
+                        if self.concurrency_controller:
+                            self.concurrency_controller.record(
+                                time.monotonic() - start,
+                                response.status,
+                                parse_retry_after(response.headers.get('Retry-After'))
+                            )
+                        response.raise_for_status()
+                        body = await response.read() if response.status != 304 else None
+                        self.last_metrics.observe(FETCH, time.monotonic() - start)
+                        if body:
+                            self.last_metrics.increment(BYTES, len(body))
+                        return PageResponse(
+                            body,
+                            response.status,
+                            response.headers.get('ETag'),
+                            response.headers.get('Last-Modified')
+                        )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                status = getattr(e, 'status', None)
+                if not self.retry_policy.should_retry(attempt, status):
+                    logger.error(f"Error fetching {url}: {str(e)}")
+                    self.last_report.add_failure(url, str(e), attempt, search_term, page_id)
+                    self.last_metrics.increment(ERRORS)
+                    return None
+                retry_headers = getattr(e, 'headers', None) or {}
+                delay = self.retry_policy.backoff(attempt, parse_retry_after(retry_headers.get('Retry-After')))
+                self.last_report.retries += 1
+                self.last_metrics.increment(RETRIES)
+                logger.warning(f"Attempt {attempt} for {url} failed ({str(e)}), retrying in {delay:.1f}s")
+                # Back off outside the semaphore so the slot stays usable
+                await asyncio.sleep(delay)
+
+    async def fetch_page(self, 
+                         session: aiohttp.ClientSession, 
+                         url: str, 
+                         search_term: Optional[str] = None, 
+                         page_id: Optional[int] = None) -> Optional[bytes]:
+        """Fetch a page body, returning None if the request failed"""
+        response = await self.fetch_response(session, url, search_term, page_id)
+        return response.body if response else None
+
+    async def parse_rows(self, html_content: bytes) -> Optional[Tuple[List[Tuple], int]]:
+        """
+        Parse a page into item rows and its reported page count
+        
+        Parsing runs on parse_executor when one is configured, so CPU-bound
+        extraction and decoding do not stall network I/O on the event loop.
+        """
+        if self.parse_executor is None:
+            return parse_page_rows(html_content, self.extractor, self.decoder)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.parse_executor, parse_page_rows, html_content, self.extractor, self.decoder
+        )
+
+    async def parse_response(self, 
+                             url: str, 
+                             response: PageResponse) -> Tuple[List[Tuple], int]:
+        """Parse a fetched page into item rows and store it in the cache"""
+        with self.last_metrics.time(PARSE):
+            parsed = await self.parse_rows(response.body)
+        if parsed is None:
+            return [], 0
+        rows, page_count = parsed
+        if self.cache is not None:
+            self.cache.set(url, response.body, rows, page_count, response.etag, response.last_modified)
+        return rows, page_count
+
+    async def fetch_rows(self, 
+                         session: aiohttp.ClientSession, 
+                         search_term: str, 
+                         page_id: int = 1,
+                         location_id: Optional[str] = None) -> Optional[Tuple[List[Tuple], int]]:
+        """
+        Fetch and parse one result page, consulting the cache first
+        
+        Fresh cache entries are used as-is. Stale entries with an ETag or
+        Last-Modified validator are revalidated with a conditional request,
+        and a 304 response reuses the cached rows.
+        
+        Returns (rows, page_count) with rows ordered like BidFTAItem.ROW_FIELDS,
+        ([], 0) if the page has no payload, or None if the request failed
+        (recorded in last_report).
+        """
+        location_id = location_id or self.location_id
+        url = self.build_url(search_term, page_id, location_id)
+        cached = self.cache.get(url, allow_stale=True) if self.cache is not None else None
+        
+        if cached is None or not cached.fresh:
+            headers = cached.conditional_headers() if cached is not None else None
+            response = await self.fetch_response(session, url, search_term, page_id, headers)
+            if response is None:
                 return None
+            if cached is None or not response.not_modified:
+                return await self.parse_response(url, response)
+            self.cache.revalidated(url)
+            self.last_metrics.increment(NOT_MODIFIED)
+        
+        self.last_metrics.increment(CACHE_HITS)
+        if cached.rows is None:
+            return await self.parse_response(url, PageResponse(cached.body, 200, cached.etag, cached.last_modified))
+        return cached.rows, cached.page_count
 
-    async def scrape_search_term(self, 
-                               session: aiohttp.ClientSession, 
-                               search_term: str) -> List[BidFTAItem]:
-        """Scrape data for a single search term"""
-        url = self.build_url(search_term)
-        items = []
+    async def fetch_page_rows(self, 
+                              session: aiohttp.ClientSession, 
+                              search_term: str, 
+                              page_id: int,
+                              location_id: Optional[str] = None) -> Optional[List[Tuple]]:
+        """
+        Fetch and extract the item rows on a single result page
         
+        Returns None if the page failed (recorded in last_report), and an empty
+        list if the page exists but has no items.
+        """
         try:
-            html_content = await self.fetch_page(session, url)
-            if html_content:
-                soup = BeautifulSoup(html_content, 'html.parser')
-                script_tag = soup.find('script', {'id': '__NEXT_DATA__'})
-                
-                if script_tag:
-                    json_data = json.loads(script_tag.string)
-                    items = await self.extract_items_from_json(json_data, search_term)
-                    logger.info(f"Found {len(items)} items for search term: {search_term}")
-                else:
-                    logger.warning(f"No data found for search term: {search_term}")
+            parsed = await self.fetch_rows(session, search_term, page_id, location_id)
+            return parsed[0] if parsed is not None else None
+        except Exception as e:
+            logger.error(f"Error processing page {page_id} of '{search_term}': {str(e)}")
+            self.last_report.add_failure(
+                self.build_url(search_term, page_id, location_id), str(e), 1, search_term, page_id
+            )
+            self.last_metrics.increment(ERRORS)
+        return None
+
+    async def scrape_remaining_pages(self, 
+                                     session: aiohttp.ClientSession, 
+                                     search_term: str, 
+                                     page_count: int,
+                                     on_page: Optional[RowsCallback] = None,
+                                     location_id: Optional[str] = None) -> List[Tuple]:
+        """
+        Fetch pages 2..page_count concurrently as item rows
+        
+        Pages are fanned out under the shared semaphore. As soon as a page comes
+        back empty, every pending page after it is cancelled. If on_page is
+        given it is awaited with each page's rows in page order, as soon as
+        that page and every page before it have been fetched, so pages past
+        the end of the listing are never streamed.
+        """
+        tasks = {
+            asyncio.ensure_future(self.fetch_page_rows(session, search_term, page_id, location_id)): page_id
+            for page_id in range(2, page_count + 1)
+        }
+        pages: Dict[int, List[Tuple]] = {}
+        resolved = set()
+        next_page = 2
+        last_page = page_count
+        pending = set(tasks)
+        
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                page_id = tasks[task]
+                page_rows = task.result()
+                resolved.add(page_id)
+                if page_rows is None:
+                    # Failed pages are reported; they do not end the listing
+                    continue
+                if not page_rows:
+                    last_page = min(last_page, page_id - 1)
+                elif page_id <= last_page:
+                    pages[page_id] = page_rows
+            
+            while next_page <= last_page and next_page in resolved:
+                if on_page and next_page in pages:
+                    await on_page(pages[next_page])
+                next_page += 1
+            
+            stale = {task for task in pending if tasks[task] > last_page}
+            for task in stale:
+                task.cancel()
+            if stale:
+                await asyncio.gather(*stale, return_exceptions=True)
+            pending -= stale
+        
+        rows = []
+        for page_id in sorted(pages):
+            if page_id <= last_page:
+                rows.extend(pages[page_id])
+        return rows
+
+    async def scrape_search_term_rows(self, 
+                                      session: aiohttp.ClientSession, 
+                                      search_term: str,
+                                      on_page: Optional[RowsCallback] = None,
+                                      location_id: Optional[str] = None) -> List[Tuple]:
+        """
+        Scrape a single search term as item rows, following all result pages
+        
+        Rows are ordered like BidFTAItem.ROW_FIELDS. If on_page is given it is
+        awaited with each page's rows as soon as the page is parsed.
+        location_id defaults to the first configured location.
+        """
+        rows = []
+        location_id = location_id or self.location_id
+        
+        try:
+            parsed = await self.fetch_rows(session, search_term, location_id=location_id)
+            # A page count of 0 means the page had no __NEXT_DATA__ payload
+            if parsed is None or not parsed[1]:
+                logger.warning(f"No data found for search term: {search_term}")
+            else:
+                first_page, page_count = parsed
+                self.page_counts[page_count_key(self.location_ids, search_term, location_id)] = page_count
+                if first_page and on_page:
+                    await on_page(first_page)
+                rows = list(first_page)
+                if self.max_pages is not None:
+                    page_count = min(page_count, self.max_pages)
+                if rows and page_count > 1:
+                    rows.extend(await self.scrape_remaining_pages(session, search_term, page_count, on_page, location_id))
+                logger.info(f"Found {len(rows)} items for search term: {search_term}")
         except Exception as e:
             logger.error(f"Error processing search term '{search_term}': {str(e)}")
+            self.last_report.add_failure(self.build_url(search_term, 1, location_id), str(e), 1, search_term, 1)
+            self.last_metrics.increment(ERRORS)
         
-        return items
+        return rows
+
+    async def scrape_search_term(self, 
+                               session: aiohttp.ClientSession, 
+                               search_term: str,
+                               on_page: Optional[PageCallback] = None,
+                               location_id: Optional[str] = None) -> List[BidFTAItem]:
+        """
+        Scrape data for a single search term, following all result pages
+        
+        If on_page is given it is awaited with each page's items as soon as
+        the page is parsed. location_id defaults to the first configured
+        location.
+        """
+        location_id = location_id or self.location_id
+        
+        def to_items(rows: List[Tuple]) -> List[BidFTAItem]:
+            return [BidFTAItem.from_row(row, search_term, location_id) for row in rows]
+        
+        on_rows = None
+        if on_page is not None:
+            async def on_rows(rows: List[Tuple]) -> None:
+                await on_page(to_items(rows))
+        
+        return to_items(await self.scrape_search_term_rows(session, search_term, on_rows, location_id))
+
+    async def iter_items(self, 
+                         search_terms: Iterable[str], 
+                         batches: bool = False, 
+                         buffer_size: int = 100,
+                         max_pending_terms: Optional[int] = None) -> AsyncIterator:
+        """
+        Iterate over items as soon as each result page is parsed
+        
+        Usage:
+            async for item in scraper.iter_items(search_terms):
+                ...
+        
+        Args:
+            search_terms: Terms to search for; may be a lazy iterable
+            batches: Yield one list of items per page instead of single items
+            buffer_size: Maximum number of parsed pages waiting to be consumed;
+                scraping pauses when the consumer falls this far behind
+            max_pending_terms: Maximum number of term/location searches scraped
+                at once (default: 2 * max_concurrent_requests)
+            
+        Yields:
+            BidFTAItem objects, or lists of them when batches is True
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+        done = object()
+        searches = ((term, location_id) for term in search_terms for location_id in self.location_ids)
+        # Only needed when several locations can return the same listing
+        seen = set() if len(self.location_ids) > 1 else None
+        self.last_report = ScrapeReport()
+        self.last_metrics = RunMetrics(self.metrics)
+        
+        async def scrape(session: aiohttp.ClientSession, term: str, location_id: str) -> None:
+            async def on_page(rows: List[Tuple]) -> None:
+                await queue.put((term, location_id, rows))
+            await self.scrape_search_term_rows(session, term, on_page, location_id)
+        
+        async def worker(session: aiohttp.ClientSession) -> None:
+            for term, location_id in searches:
+                await scrape(session, term, location_id)
+        
+        async def produce() -> None:
+            try:
+                async with self.session_scope() as session:
+                    worker_count = max_pending_terms or 2 * self.max_concurrent_requests
+                    await asyncio.gather(*[worker(session) for _ in range(worker_count)])
+            except asyncio.CancelledError:
+                # Only cancelled once the consumer has stopped reading, so the
+                # end marker is not needed and waiting on a full queue would hang
+                raise
+            except BaseException:
+                await queue.put(done)
+                raise
+            await queue.put(done)
+        
+        producer = asyncio.ensure_future(produce())
+        try:
+            while True:
+                entry = await queue.get()
+                if entry is done:
+                    break
+                term, location_id, rows = entry
+                if seen is not None:
+                    rows = unique_rows(rows, term, seen)
+                    if not rows:
+                        continue
+                page = [BidFTAItem.from_row(row, term, location_id) for row in rows]
+                self.last_metrics.increment(ITEMS, len(page))
+                if batches:
+                    yield page
+                else:
+                    for item in page:
+                        yield item
+            await producer
+        finally:
+            if not producer.done():
+                producer.cancel()
+                await asyncio.gather(producer, return_exceptions=True)
 
     async def scrape_search_terms(self, search_terms: List[str]) -> pd.DataFrame:
         """
@@ -100,34 +575,65 @@ class AsyncBidFTAScraper:
             search_terms: List of terms to search for
             
         Returns:
-            DataFrame containing all found items
+            DataFrame containing all found items, with numeric current_bid
+            and msrp columns and the location_id each item was found at.
+            An item listed at several locations appears once. Requests that
+            failed permanently are listed in last_report, and request counts
+            and stage timings in last_metrics.
         """
-        async with aiohttp.ClientSession() as session:
-            tasks = [self.scrape_search_term(session, term) for term in search_terms]
-            results = await asyncio.gather(*tasks)
+        self.last_report = ScrapeReport()
+        self.last_metrics = RunMetrics(self.metrics)
+        with profile_run(self.profiler, "async"), self.last_metrics.time(RUN):
+            async with self.session_scope() as session:
+                searches = [(term, location_id) for term in search_terms for location_id in self.location_ids]
+                results = await asyncio.gather(*[
+                    self.scrape_search_term_rows(session, term, location_id=location_id)
+                    for term, location_id in searches
+                ])
+            if self.profiler is not None:
+                self.profiler.checkpoint(profiling.SCRAPED)
+            
+            if self.concurrency_controller:
+                logger.info(f"Adaptive concurrency window: {self.concurrency_controller.window}")
             
-        # Flatten results and convert to list of dictionaries
-        all_items = []
-        for items in results:
-            all_items.extend([item.to_dict() for item in items])
-        
-        # Convert to DataFrame
-        df = pd.DataFrame(all_items)
-        if not df.empty:
-            # Process DataFrame
-            df['end_datetime'] = pd.to_datetime(df['end_datetime'])
-            df['hours_remaining'] = df['time_remaining'].astype(float) / 3600
-            df['current_bid'] = df['current_bid'].apply(lambda x: f"${x:,.2f}")
-            df['msrp'] = df['msrp'].apply(lambda x: f"${x:,.2f}")
+            with self.last_metrics.time(DATAFRAME):
+                # Flatten results into columns; gather keeps the term/location order, so
+                # an item listed at several locations is kept from the first one
+                all_items = FrameBuilder()
+                seen = set()
+                for (term, location_id), rows in zip(searches, results):
+                    if len(self.location_ids) > 1:
+                        rows = unique_rows(rows, term, seen)
+                    all_items.extend_rows(rows, term, location_id)
+                self.last_metrics.increment(ITEMS, len(all_items))
+                
+                # Convert to DataFrame
+                df = all_items.build()
+                if self.dedupe_terms:
+                    before = len(df)
+                    df = merge_duplicate_terms(df)
+                    logger.info(f"Merged {before - len(df)} rows found by more than one search term")
+            if self.profiler is not None:
+                self.profiler.checkpoint(profiling.DATAFRAME)
+            if self.store is not None:
+                with self.last_metrics.time(STORE):
+                    written = self.store.upsert_frame(df)
+                logger.info(f"Stored {written} items in '{self.store.path}'")
+            if self.currency_strings:
+                with self.last_metrics.time(DATAFRAME):
+                    df = format_currency_columns(df)
         
         return df
 
 def format_async_results(df: pd.DataFrame, save_path: Optional[str] = None) -> None:
     """Format and optionally save the results"""
     if df.empty:
-        logger.info("No items found")
+        print("No items found")
         return
     
+    # Prices stay numeric in the scraped data and are formatted for output only
+    df = format_currency_columns(df)
+    
     # Display results
     print("\nFound Items:")
     display_columns = ['title', 'current_bid', 'hours_remaining', 'search_term']
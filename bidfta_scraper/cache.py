@@ -0,0 +1,215 @@
+"""
+Persistent on-disk response cache
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CacheEntry(NamedTuple):
+    """A cached response and the item rows parsed from it"""
+    url: str
+    body: Optional[bytes]
+    rows: Optional[List[Tuple]]
+    page_count: Optional[int]
+    stored_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fresh: bool = True
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Request headers that revalidate this entry with the server"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class PageResponse(NamedTuple):
+    """A fetched page with the validators needed to revalidate it later"""
+    body: Optional[bytes]
+    status: int
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+
+class ResponseCache:
+    """
+    SQLite-backed HTTP response cache keyed by URL
+
+    Each entry keeps the raw page body and the item rows parsed from it, so a
+    cache hit skips both the network and re-parsing. Entries expire after
+    `ttl` seconds, and the least recently used entries are evicted once the
+    cache grows past `max_bytes`.
+
+    Expired entries that carry an ETag or Last-Modified validator are kept so
+    the scrapers can revalidate them with a conditional request; a 304
+    response reuses the stored rows. With ttl=0 every request is revalidated,
+    which suits frequent polling.
+    """
+
+    def __init__(self,
+                 path: str = "bidfta_cache.sqlite",
+                 ttl: float = 3600,
+                 max_bytes: Optional[int] = 256 * 1024 * 1024,
+                 store_body: bool = True):
+        """
+        Initialize the cache
+
+        Args:
+            path: SQLite database file, or ":memory:" for a per-process cache
+            ttl: Seconds an entry stays fresh
+            max_bytes: Total size cap for stored entries (None for no cap)
+            store_body: Keep the raw page body as well as the parsed rows
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.store_body = store_body
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                body BLOB,
+                rows TEXT,
+                page_count INTEGER,
+                stored_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+        """)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(responses)")}
+        for column in ('etag', 'last_modified'):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE responses ADD COLUMN {column} TEXT")
+        self._conn.commit()
+
+    def get(self, url: str, allow_stale: bool = False) -> Optional[CacheEntry]:
+        """
+        Return the cached entry for a URL
+
+        Args:
+            url: Request URL
+            allow_stale: Also return expired entries that can be revalidated
+                (check CacheEntry.fresh)
+
+        Returns:
+            The cached entry, or None if there is none usable
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, rows, page_count, stored_at, etag, last_modified FROM responses WHERE url = ?",
+                (url,)
+            ).fetchone()
+            fresh = row is not None and row[3] > now - self.ttl
+            if fresh:
+                self.hits += 1
+                self._conn.execute("UPDATE responses SET last_access = ? WHERE url = ?", (now, url))
+                self._conn.commit()
+            else:
+                self.misses += 1
+                if row is None or not allow_stale or not (row[4] or row[5]):
+                    return None
+
+        body, rows, page_count, stored_at, etag, last_modified = row
+        if rows is not None:
+            rows = [tuple(item) for item in json.loads(rows)]
+        return CacheEntry(url, body, rows, page_count, stored_at, etag, last_modified, fresh)
+
+    def revalidated(self, url: str) -> None:
+        """Mark an entry fresh again after the server answered 304 Not Modified"""
+        now = time.time()
+        with self._lock:
+            self.not_modified += 1
+            self._conn.execute("UPDATE responses SET stored_at = ?, last_access = ? WHERE url = ?", (now, now, url))
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit, miss and 304 counters since the cache was opened"""
+        return {'hits': self.hits, 'misses': self.misses, 'not_modified': self.not_modified}
+
+    def set(self,
+            url: str,
+            body: Optional[bytes],
+            rows: Optional[List[Tuple]] = None,
+            page_count: Optional[int] = None,
+            etag: Optional[str] = None,
+            last_modified: Optional[str] = None) -> None:
+        """
+        Store a response
+
+        Args:
+            url: Request URL
+            body: Raw page body
+            rows: Item rows parsed from the body (see BidFTAItem.ROW_FIELDS)
+            page_count: Page count reported by the page
+            etag: ETag response header, for conditional requests
+            last_modified: Last-Modified response header, for conditional requests
+        """
+        if not self.store_body and rows is not None:
+            body = None
+        rows_json = json.dumps(rows) if rows is not None else None
+        size = len(body or b"") + len(rows_json or "")
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(url, body, rows, page_count, stored_at, last_access, size, etag, last_modified) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, body, rows_json, page_count, now, now, size, etag, last_modified)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop expired entries that cannot be revalidated, then least recently used ones until under max_bytes"""
+        self._conn.execute(
+            "DELETE FROM responses WHERE stored_at <= ? AND etag IS NULL AND last_modified IS NULL",
+            (time.time() - self.ttl,)
+        )
+        if self.max_bytes is None:
+            return
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = 0
+        for url, size in self._conn.execute("SELECT url, size FROM responses ORDER BY last_access").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+            total -= size
+            evicted += 1
+        logger.debug(f"Evicted {evicted} cached responses")
+
+    def clear(self) -> None:
+        """Remove every entry"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the underlying database"""
+        self._conn.close()
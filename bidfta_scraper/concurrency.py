@@ -0,0 +1,181 @@
+"""
+Adaptive concurrency control for the async scraper
+"""
+
+import asyncio
+import collections
+import email.utils
+import logging
+import math
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header into a number of seconds
+
+    Args:
+        value: Header value, either delta-seconds or an HTTP date
+
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+class AdaptiveConcurrencyController:
+    """
+    AIMD concurrency limiter
+
+    Works as a drop-in replacement for an asyncio.Semaphore (`async with
+    controller:`). The window grows by one slot after each window's worth of
+    successful responses while latency stays flat, and is cut multiplicatively
+    on HTTP 429/503 or when p95 latency rises above the observed baseline.
+    A Retry-After header pauses all new requests until it expires.
+    """
+
+    def __init__(self,
+                 initial: int = 5,
+                 min_limit: int = 1,
+                 max_limit: int = 64,
+                 decrease_factor: float = 0.5,
+                 latency_tolerance: float = 1.5,
+                 sample_size: int = 20,
+                 backoff_statuses=(429, 503),
+                 cooldown: float = 1.0):
+        """
+        Initialize the controller
+
+        Args:
+            initial: Starting window size
+            min_limit: Smallest allowed window
+            max_limit: Largest allowed window
+            decrease_factor: Multiplier applied to the window on backoff
+            latency_tolerance: Back off when p95 latency exceeds the baseline
+                p95 by this factor
+            sample_size: Number of responses per p95 measurement
+            backoff_statuses: HTTP statuses that trigger a backoff
+            cooldown: Minimum seconds between two backoffs, so one burst of
+                errors only shrinks the window once
+        """
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValueError("expected 1 <= min_limit <= initial <= max_limit")
+        self.window = initial
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.backoff_statuses = frozenset(backoff_statuses)
+        self.cooldown = cooldown
+        self.baseline_p95: Optional[float] = None
+        self.in_flight = 0
+        self._latencies = collections.deque(maxlen=sample_size)
+        self._successes = 0
+        self._last_decrease = -math.inf
+        self._paused_until = 0.0
+        self._waiters = collections.deque()
+
+    async def acquire(self) -> None:
+        """Wait for a free slot in the current window"""
+        while True:
+            pause = self._paused_until - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+                continue
+            if self.in_flight < self.window:
+                self.in_flight += 1
+                return
+
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                # Pass on a wake-up this task may have consumed
+                self._wake()
+                raise
+
+    def release(self) -> None:
+        """Return a slot to the window"""
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        free = self.window - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+
+    def record(self, latency: float, status: int, retry_after: Optional[float] = None) -> None:
+        """
+        Feed one response into the controller
+
+        Args:
+            latency: Seconds until the response headers arrived
+            status: HTTP status code
+            retry_after: Seconds from a Retry-After header, if any
+        """
+        if retry_after:
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+        if status in self.backoff_statuses:
+            self._decrease(f"HTTP {status}")
+            return
+        if status >= 400:
+            return
+
+        self._latencies.append(latency)
+        if len(self._latencies) == self._latencies.maxlen:
+            p95 = sorted(self._latencies)[int(0.95 * (len(self._latencies) - 1))]
+            self._latencies.clear()
+            if self.baseline_p95 is None or p95 < self.baseline_p95:
+                self.baseline_p95 = p95
+            elif p95 > self.baseline_p95 * self.latency_tolerance:
+                self._decrease(f"p95 latency {p95:.3f}s over baseline {self.baseline_p95:.3f}s")
+                # Let the baseline drift so a permanently slower server is not
+                # punished forever
+                self.baseline_p95 = 0.9 * self.baseline_p95 + 0.1 * p95
+                return
+
+        self._successes += 1
+        if self._successes >= self.window and self.window < self.max_limit:
+            self._successes = 0
+            self.window += 1
+            self._wake()
+
+    def _decrease(self, reason: str) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self._successes = 0
+        new_window = max(self.min_limit, int(self.window * self.decrease_factor))
+        if new_window != self.window:
+            logger.info(f"Reducing concurrency window {self.window} -> {new_window} ({reason})")
+        self.window = new_window
@@ -0,0 +1,165 @@
+"""
+Decoders that turn a __NEXT_DATA__ payload into Python data
+"""
+
+import json
+import re
+from typing import Dict, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+Payload = Union[str, bytes]
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r'\s*')
+# A JSON string (with escapes) or a single bracket; everything else is skipped over
+_container_token = re.compile(r'"(?:[^"\\]|\\.)*"|[\[\]{}]', re.DOTALL)
+
+
+class PartialDecodeError(ValueError):
+    """Raised when the payload does not have the expected Next.js structure"""
+
+
+def decode_full(payload: Payload) -> Dict:
+    """Decode the entire payload"""
+    return json.loads(payload)
+
+
+def _skip_whitespace(text: str, index: int) -> int:
+    return _whitespace.match(text, index).end()
+
+
+def _expect(text: str, index: int, char: str) -> int:
+    index = _skip_whitespace(text, index)
+    if text[index:index + 1] != char:
+        raise PartialDecodeError(f"Expected '{char}' at offset {index}")
+    return index + 1
+
+
+def _skip_container(text: str, index: int) -> int:
+    """Return the offset just past the object or array starting at index"""
+    depth = 0
+    for match in _container_token.finditer(text, index):
+        token = match.group()
+        if token in '[{':
+            depth += 1
+        elif token in ']}':
+            depth -= 1
+            if depth == 0:
+                return match.end()
+    raise PartialDecodeError("Unterminated object or array")
+
+
+def _skip_value(text: str, index: int) -> int:
+    """Return the offset just past the JSON value starting at index"""
+    if text[index:index + 1] in ('{', '['):
+        return _skip_container(text, index)
+    return _decoder.raw_decode(text, index)[1]
+
+
+def _find_member(text: str, index: int, key: str) -> int:
+    """
+    Return the offset of the value of `key` in the object starting at index
+
+    Only the object's own keys are matched; nested objects are skipped over
+    whole, so a deeper key with the same name is never picked up.
+    """
+    index = _expect(text, index, '{')
+    index = _skip_whitespace(text, index)
+    if text[index:index + 1] == '}':
+        raise PartialDecodeError(f"Key '{key}' not found")
+    while True:
+        name, index = _decoder.raw_decode(text, index)
+        if not isinstance(name, str):
+            raise PartialDecodeError(f"Expected a key at offset {index}")
+        index = _skip_whitespace(text, _expect(text, index, ':'))
+        if name == key:
+            return index
+        index = _skip_whitespace(text, _skip_value(text, index))
+        separator = text[index:index + 1]
+        if separator == '}':
+            raise PartialDecodeError(f"Key '{key}' not found")
+        if separator != ',':
+            raise PartialDecodeError(f"Expected ',' or '}}' at offset {index}")
+        index = _skip_whitespace(text, index + 1)
+
+
+def decode_items(payload: Payload) -> Dict:
+    """
+    Decode only the initialData block (items and pagination metadata)
+
+    Everything else in the Next.js state (build manifests, locale blobs, ...)
+    is scanned past without being materialized.
+
+    Args:
+        payload: The raw __NEXT_DATA__ JSON
+
+    Returns:
+        A dictionary shaped like the full payload but holding only
+        props.pageProps.initialData, with nested objects other than items
+        left out
+    """
+    text = payload.decode('utf-8') if isinstance(payload, bytes) else payload
+
+    index = 0
+    for key in ('props', 'pageProps', 'initialData'):
+        index = _find_member(text, index, key)
+    index = _expect(text, index, '{')
+    initial_data = {}
+
+    index = _skip_whitespace(text, index)
+    if text[index:index + 1] == '}':
+        return {'props': {'pageProps': {'initialData': initial_data}}}
+
+    while True:
+        key, index = _decoder.raw_decode(text, _skip_whitespace(text, index))
+        if not isinstance(key, str):
+            raise PartialDecodeError(f"Expected a key at offset {index}")
+        index = _skip_whitespace(text, _expect(text, index, ':'))
+
+        if key != 'items' and text[index:index + 1] in ('{', '['):
+            index = _skip_container(text, index)
+        else:
+            initial_data[key], index = _decoder.raw_decode(text, index)
+
+        index = _skip_whitespace(text, index)
+        separator = text[index:index + 1]
+        if separator == '}':
+            break
+        if separator != ',':
+            raise PartialDecodeError(f"Expected ',' or '}}' at offset {index}")
+        index += 1
+
+    return {'props': {'pageProps': {'initialData': initial_data}}}
+
+
+def decode_items_or_full(payload: Payload) -> Dict:
+    """Decode only initialData, falling back to a full decode on unexpected structure"""
+    try:
+        return decode_items(payload)
+    except ValueError as e:
+        logger.debug(f"Partial decode failed ({str(e)}), decoding full payload")
+        return decode_full(payload)
+
+
+DECODERS = {
+    'full': decode_full,
+    'items': decode_items_or_full,
+}
+
+
+def get_decoder(json_mode: str = 'items'):
+    """
+    Resolve a JSON decoding mode to a decoder function
+
+    Args:
+        json_mode: 'items' to decode only the items subtree, or 'full'
+
+    Returns:
+        A function taking the raw payload and returning a dictionary
+    """
+    try:
+        return DECODERS[json_mode]
+    except KeyError:
+        raise ValueError(f"Unknown json_mode '{json_mode}', expected one of {sorted(DECODERS)}")
@@ -0,0 +1,203 @@
+"""
+Change detection between polls
+"""
+
+import json
+import os
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+import logging
+
+import pandas as pd
+
+from .formatting import parse_currency
+from .items import BidFTAItem
+from .times import to_epoch_seconds, to_utc_series
+
+logger = logging.getLogger(__name__)
+
+NEW = 'new'
+BID_CHANGED = 'bid_changed'
+ENDED = 'ended'
+REMOVED = 'removed'
+
+ItemKey = Tuple[str, str]
+
+
+class ItemEvent(NamedTuple):
+    """A change to one item between two polls"""
+    kind: str
+    auction_id: str
+    lot_code: str
+    search_term: str
+    current_bid: Optional[float] = None
+    previous_bid: Optional[float] = None
+    bids_count: Optional[int] = None
+    title: Optional[str] = None
+
+
+# Snapshot entries are plain tuples: (search_term, current_bid, bids_count, end_time, ended)
+_Seen = Tuple[str, Optional[float], Optional[int], Optional[float], bool]
+_TERM, _BID, _BIDS, _END, _ENDED = range(5)
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class DeltaEngine:
+    """
+    Compares each polled batch with the previous one and emits only the changes
+
+    Items are keyed by (auction_id, lot_code), the same key ItemStore uses.
+    The previous poll is kept as a dict from key to a small snapshot tuple, so
+    each update is a single pass over the batch plus one over the snapshot.
+
+    Events:
+        new: the item was not in the previous snapshot
+        bid_changed: the current bid or bid count changed
+        ended: the item's end time has passed
+        removed: the item disappeared before its end time
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the engine
+
+        Args:
+            path: JSON file the snapshot is loaded from and saved to after every
+                update, so changes are tracked across restarts (default: memory only)
+        """
+        self.path = path
+        self.snapshot: Dict[ItemKey, _Seen] = {}
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def update(self,
+               items: Iterable[BidFTAItem],
+               search_terms: Optional[Iterable[str]] = None,
+               now: Optional[float] = None) -> List[ItemEvent]:
+        """
+        Compare a batch of scraped items with the previous snapshot
+
+        Args:
+            items: Items from the latest poll
+            search_terms: Terms the poll covered. Only their items can be
+                reported as ended or removed; by default the poll is assumed
+                to cover every tracked item.
+            now: Current time in seconds since the epoch (default: time.time())
+
+        Returns:
+            Events in the order new, bid_changed, ended, removed
+        """
+        # Items of one auction share their end time, so parse each string once
+        end_times: Dict[str, Optional[float]] = {}
+
+        def end_time(value) -> Optional[float]:
+            if value not in end_times:
+                end_times[value] = to_epoch_seconds(value)
+            return end_times[value]
+
+        records = (
+            (item.auction_id, item.lot_code, item.search_term, _to_float(item.current_bid),
+             item.bids_count, end_time(item.end_datetime), item.title)
+            for item in items
+        )
+        return self._update(records, search_terms, now)
+
+    def update_frame(self,
+                     df: pd.DataFrame,
+                     search_terms: Optional[Iterable[str]] = None,
+                     now: Optional[float] = None) -> List[ItemEvent]:
+        """
+        Compare a DataFrame returned by scrape_search_terms with the previous snapshot
+
+        Args:
+            df: Result DataFrame; prices may be numeric or currency strings
+            search_terms: Terms the poll covered (see update)
+            now: Current time in seconds since the epoch (default: time.time())
+
+        Returns:
+            Events in the order new, bid_changed, ended, removed
+        """
+        if df.empty:
+            return self._update([], search_terms, now)
+        end_times = to_utc_series(df['end_datetime'])
+        end_times = (end_times - pd.Timestamp(0, tz='UTC')) / pd.Timedelta(seconds=1)
+        columns = [
+            df['auction_id'].tolist(),
+            df['lot_code'].tolist(),
+            df['search_term'].tolist(),
+            parse_currency(df['current_bid']).tolist(),
+            df['bids_count'].tolist(),
+            end_times.astype(object).where(end_times.notna(), None).tolist(),
+            df['title'].tolist(),
+        ]
+        return self._update(zip(*columns), search_terms, now)
+
+    def _update(self, records, search_terms, now) -> List[ItemEvent]:
+        now = time.time() if now is None else now
+        previous = self.snapshot
+        current: Dict[ItemKey, _Seen] = {}
+        new, changed, ended = [], [], []
+
+        for auction_id, lot_code, term, bid, bids, end_time, title in records:
+            key = (auction_id, lot_code)
+            if key in current:
+                continue
+            seen = previous.get(key)
+            is_over = end_time is not None and end_time <= now
+            if seen is None:
+                new.append(ItemEvent(NEW, auction_id, lot_code, term, bid, None, bids, title))
+                already_ended = False
+            else:
+                if seen[_BID] != bid or seen[_BIDS] != bids:
+                    changed.append(ItemEvent(BID_CHANGED, auction_id, lot_code, term, bid, seen[_BID], bids, title))
+                already_ended = seen[_ENDED]
+            if is_over and not already_ended:
+                ended.append(ItemEvent(ENDED, auction_id, lot_code, term, bid, None, bids, title))
+            entry = (term, bid, bids, end_time, is_over or already_ended)
+            # Reuse the previous tuple when nothing changed to keep the pass allocation-light
+            current[key] = seen if entry == seen else entry
+
+        removed = []
+        terms = None if search_terms is None else set(search_terms)
+        for key, seen in previous.items():
+            if key in current:
+                continue
+            if terms is not None and seen[_TERM] not in terms:
+                # Not polled this time: keep tracking it
+                current[key] = seen
+                continue
+            if seen[_ENDED]:
+                continue
+            kind = ENDED if seen[_END] is not None and seen[_END] <= now else REMOVED
+            event = ItemEvent(kind, key[0], key[1], seen[_TERM], seen[_BID], None, seen[_BIDS])
+            (ended if kind == ENDED else removed).append(event)
+
+        self.snapshot = current
+        if self.path:
+            self.save(self.path)
+        events = new + changed + ended + removed
+        logger.debug(f"{len(events)} changes across {len(current)} tracked items")
+        return events
+
+    def save(self, path: str) -> None:
+        """Write the snapshot to a JSON file, replacing it atomically"""
+        entries = [list(key) + list(seen) for key, seen in self.snapshot.items()]
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w') as file:
+            json.dump(entries, file)
+        os.replace(temp_path, path)
+
+    def load(self, path: str) -> None:
+        """Replace the snapshot with one saved by save()"""
+        with open(path) as file:
+            entries = json.load(file)
+        self.snapshot = {(entry[0], entry[1]): tuple(entry[2:]) for entry in entries}
+
+    def __len__(self) -> int:
+        return len(self.snapshot)
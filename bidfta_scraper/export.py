@@ -0,0 +1,146 @@
+"""
+Partitioned Parquet export of scraped results
+
+Requires the optional pyarrow dependency (pip install "BidFTAScraper[parquet]").
+"""
+
+import uuid
+from datetime import date, datetime, timezone
+from typing import List, Optional, Sequence, Union
+import logging
+
+import pandas as pd
+
+from .formatting import CURRENCY_COLUMNS, parse_currency
+
+logger = logging.getLogger(__name__)
+
+PARTITION_COLUMNS = ('scrape_date', 'location_id')
+
+DateLike = Union[str, date, datetime, pd.Timestamp]
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.dataset
+    except ImportError:
+        raise ImportError("Parquet export requires pyarrow: pip install pyarrow")
+    return pyarrow
+
+
+def _date_text(value: DateLike) -> str:
+    return pd.Timestamp(value).strftime('%Y-%m-%d')
+
+
+def _partitioning(pa, schema=None):
+    # Declared explicitly so "616" reads back as a string instead of an int
+    if schema is None:
+        schema = pa.schema([(column, pa.string()) for column in PARTITION_COLUMNS])
+    return pa.dataset.partitioning(pa.schema([schema.field(column) for column in PARTITION_COLUMNS]), flavor='hive')
+
+
+def write_parquet(df: pd.DataFrame,
+                  root: str,
+                  location_id: Optional[str] = None,
+                  scrape_date: Optional[DateLike] = None,
+                  row_group_size: Optional[int] = None) -> int:
+    """
+    Append a result DataFrame to a Parquet dataset partitioned by date and location
+
+    Files are laid out as root/scrape_date=YYYY-MM-DD/location_id=616/. Each
+    call adds new files to its partitions and never rewrites existing ones, so
+    repeated runs append to the history. Numeric and datetime dtypes are kept.
+    Rows are partitioned by their own location_id, so results of a
+    multi-location scrape land in one partition per location.
+
+    Args:
+        df: DataFrame returned by scrape_search_terms
+        root: Dataset directory
+        location_id: Location written for rows without a location_id value
+        scrape_date: Partition date (default: today, UTC)
+        row_group_size: Maximum rows per row group (default: pyarrow's)
+
+    Returns:
+        Number of rows written
+    """
+    pa = _require_pyarrow()
+    if df.empty:
+        return 0
+
+    df = df.copy()
+    for column in CURRENCY_COLUMNS:
+        if column in df.columns:
+            df[column] = parse_currency(df[column])
+    if 'location_id' not in df.columns:
+        df['location_id'] = ''
+    blank = df['location_id'].isna() | (df['location_id'].astype(str) == '')
+    if blank.any():
+        if location_id is None:
+            raise ValueError("location_id is required for rows without a location_id")
+        df.loc[blank, 'location_id'] = location_id
+    df['location_id'] = df['location_id'].astype(str)
+    df['scrape_date'] = _date_text(scrape_date if scrape_date is not None else datetime.now(timezone.utc))
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # A unique basename per run makes every write an append
+    run_id = f"{datetime.now(timezone.utc):%H%M%S}-{uuid.uuid4().hex[:8]}"
+    pa.dataset.write_dataset(
+        table,
+        root,
+        format='parquet',
+        partitioning=_partitioning(pa, table.schema),
+        basename_template=f"part-{run_id}-{{i}}.parquet",
+        existing_data_behavior='overwrite_or_ignore',
+        max_rows_per_group=row_group_size or 1024 * 1024
+    )
+    logger.info(f"Wrote {len(df)} rows to '{root}'")
+    return len(df)
+
+
+def read_parquet(root: str,
+                 start: Optional[DateLike] = None,
+                 end: Optional[DateLike] = None,
+                 location_id: Optional[Union[str, Sequence[str]]] = None,
+                 columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Read exported results back with a single columnar scan
+
+    Partitions outside the date range or locations are skipped without being
+    opened. The schema is the union of every matching file's, so runs written
+    with and without optional columns such as search_terms read back together,
+    with nulls where a run had no value.
+
+    Args:
+        root: Dataset directory
+        start: First scrape date to include
+        end: Last scrape date to include
+        location_id: One location ID or a list of them
+        columns: Columns to read (default: all)
+
+    Returns:
+        DataFrame of the matching rows
+    """
+    pa = _require_pyarrow()
+    field = pa.dataset.field
+    dataset = pa.dataset.dataset(root, format='parquet', partitioning=_partitioning(pa))
+
+    conditions = []
+    if start is not None:
+        conditions.append(field('scrape_date') >= _date_text(start))
+    if end is not None:
+        conditions.append(field('scrape_date') <= _date_text(end))
+    if location_id is not None:
+        locations = [location_id] if isinstance(location_id, str) else list(location_id)
+        conditions.append(field('location_id').isin([str(location) for location in locations]))
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+
+    # The discovered schema is only the first file's; widen it to cover every run
+    fragments = list(dataset.get_fragments(filter=expression))
+    schema = pa.unify_schemas([dataset.schema] + [fragment.physical_schema for fragment in fragments])
+    if schema != dataset.schema:
+        dataset = pa.dataset.dataset(root, schema=schema, format='parquet', partitioning=_partitioning(pa))
+    return dataset.to_table(columns=columns, filter=expression).to_pandas()
@@ -0,0 +1,109 @@
+"""
+Extractors that pull the __NEXT_DATA__ JSON payload out of a results page
+"""
+
+from bs4 import BeautifulSoup
+from typing import Optional, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+Page = Union[str, bytes]
+
+
+def scan_next_data(html: Page) -> Optional[Page]:
+    """
+    Locate the __NEXT_DATA__ script tag without building a DOM
+
+    Args:
+        html: Raw page body as bytes or text
+
+    Returns:
+        The JSON payload sliced from the page (same type as html), or None
+        if no __NEXT_DATA__ script tag could be found
+    """
+    if isinstance(html, bytes):
+        marker, script_open, tag_close, script_close = b'__NEXT_DATA__', b'<script', b'>', b'</script'
+    else:
+        marker, script_open, tag_close, script_close = '__NEXT_DATA__', '<script', '>', '</script'
+
+    position = html.find(marker)
+    while position != -1:
+        tag_start = html.rfind(script_open, 0, position)
+        tag_end = html.find(tag_close, position)
+        # The marker must sit inside the opening tag of a <script> element
+        if tag_start != -1 and tag_end != -1 and html.rfind(tag_close, tag_start, position) == -1:
+            payload_end = html.find(script_close, tag_end)
+            if payload_end == -1:
+                return None
+            return html[tag_end + 1:payload_end]
+        position = html.find(marker, position + len(marker))
+
+    return None
+
+
+class ScanExtractor:
+    """Byte-level scanner that slices the payload out of the raw page"""
+    name = 'scan'
+
+    def extract(self, html: Page) -> Optional[Page]:
+        """Return the __NEXT_DATA__ payload, or None if it cannot be found"""
+        return scan_next_data(html)
+
+
+class SoupExtractor:
+    """Full BeautifulSoup parse, slower but tolerant of unusual markup"""
+    name = 'soup'
+
+    def extract(self, html: Page) -> Optional[Page]:
+        """Return the __NEXT_DATA__ payload, or None if it cannot be found"""
+        soup = BeautifulSoup(html, 'html.parser')
+        script_tag = soup.find('script', {'id': '__NEXT_DATA__'})
+        if script_tag:
+            return script_tag.string
+        return None
+
+
+class FallbackExtractor:
+    """Try each extractor in turn until one finds the payload"""
+    name = 'auto'
+
+    def __init__(self, *extractors):
+        self.extractors = extractors
+
+    def extract(self, html: Page) -> Optional[Page]:
+        """Return the first payload found by the wrapped extractors"""
+        for extractor in self.extractors:
+            payload = extractor.extract(html)
+            if payload:
+                return payload
+            logger.debug(f"Extractor '{extractor.name}' found no payload, falling back")
+        return None
+
+
+EXTRACTORS = {
+    'scan': ScanExtractor,
+    'soup': SoupExtractor,
+    'auto': lambda: FallbackExtractor(ScanExtractor(), SoupExtractor()),
+}
+
+
+def get_extractor(extractor=None):
+    """
+    Resolve an extractor by name or pass an extractor object through
+
+    Args:
+        extractor: 'auto', 'scan', 'soup', an object with an extract() method,
+            or None for the default ('auto')
+
+    Returns:
+        An extractor object
+    """
+    if extractor is None:
+        extractor = 'auto'
+    if isinstance(extractor, str):
+        try:
+            return EXTRACTORS[extractor]()
+        except KeyError:
+            raise ValueError(f"Unknown extractor '{extractor}', expected one of {sorted(EXTRACTORS)}")
+    return extractor
@@ -0,0 +1,68 @@
+"""
+Presentation formatting for result DataFrames
+"""
+
+import numpy as np
+import pandas as pd
+
+CURRENCY_COLUMNS = ('current_bid', 'msrp')
+_CURRENCY_FORMAT = '${:,.2f}'.format
+
+
+def format_currency(values: pd.Series) -> pd.Series:
+    """
+    Format a numeric Series as dollar strings such as "$1,234.50"
+
+    The column is converted in one pass with a bound str.format, which is
+    faster than Series.apply with a lambda. Missing values become empty
+    strings.
+
+    Args:
+        values: Numeric Series
+
+    Returns:
+        Series of strings with the same index
+    """
+    numbers = pd.to_numeric(values, errors='coerce')
+    missing = numbers.isna().to_numpy()
+    text = np.array(list(map(_CURRENCY_FORMAT, numbers.fillna(0.0).tolist())), dtype=object)
+    text[missing] = ''
+    return pd.Series(text, index=values.index, name=values.name)
+
+
+def parse_currency(values: pd.Series) -> pd.Series:
+    """
+    Convert a price column to float64
+
+    Accepts numeric columns as well as "$1,234.50" strings produced with
+    currency_strings=True. Unparseable values become NaN.
+
+    Args:
+        values: Numeric or currency string Series
+
+    Returns:
+        float64 Series with the same index
+    """
+    if not pd.api.types.is_numeric_dtype(values):
+        values = pd.to_numeric(values.astype(str).str.replace(r'[$,]', '', regex=True), errors='coerce')
+    return values.astype(np.float64)
+
+
+def format_currency_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return a copy of a result DataFrame with prices formatted for display
+
+    Only numeric currency columns are converted; columns that already hold
+    strings are left as they are.
+
+    Args:
+        df: DataFrame returned by scrape_search_terms
+
+    Returns:
+        Formatted copy of the DataFrame
+    """
+    formatted = df.copy()
+    for column in CURRENCY_COLUMNS:
+        if column in formatted.columns and pd.api.types.is_numeric_dtype(formatted[column]):
+            formatted[column] = format_currency(formatted[column])
+    return formatted
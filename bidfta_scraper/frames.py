@@ -0,0 +1,184 @@
+"""
+Columnar DataFrame construction for scraped items
+"""
+
+import math
+from array import array
+from operator import attrgetter
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .items import BidFTAItem
+from .times import to_utc_series
+
+FLOAT_COLUMNS = ('current_bid', 'msrp', 'time_remaining')
+INT_COLUMNS = ('bids_count',)
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _to_int(value) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+class FrameBuilder:
+    """
+    Accumulates items into typed column buffers and builds one DataFrame
+
+    Appended items or parsed row tuples are transposed into columns (named
+    like BidFTAItem.to_dict keys) and numeric fields are converted in bulk
+    into array('d')/array('q') buffers, so large result sets hold no
+    per-item objects and the DataFrame is created once, column by column,
+    with its final dtypes and without any per-item dictionaries. Indexing
+    and iteration give item views over the buffered, converted values.
+    """
+
+    COLUMNS = BidFTAItem.__slots__
+
+    def __init__(self, items: Iterable[BidFTAItem] = ()):
+        self.columns: Dict[str, object] = {}
+        for name in self.COLUMNS:
+            if name in FLOAT_COLUMNS:
+                self.columns[name] = array('d')
+            elif name in INT_COLUMNS:
+                self.columns[name] = array('q')
+            else:
+                self.columns[name] = []
+        self._get_fields = attrgetter(*self.COLUMNS)
+        self.extend(items)
+
+    def _extend_column(self, name: str, values: Sequence) -> None:
+        """Append values to one column, converting numeric fields in bulk"""
+        column = self.columns[name]
+        if name in FLOAT_COLUMNS:
+            exact, fallback = float, _to_float
+        elif name in INT_COLUMNS:
+            exact, fallback = int, _to_int
+        else:
+            column.extend(values)
+            return
+        try:
+            chunk = array(column.typecode, map(exact, values))
+        except (TypeError, ValueError):
+            # Missing or malformed values: convert one by one with defaults
+            chunk = array(column.typecode, map(fallback, values))
+        column.extend(chunk)
+
+    def append(self, item: BidFTAItem) -> None:
+        """Add one item"""
+        self.extend([item])
+
+    def extend(self, items: Iterable[BidFTAItem]) -> None:
+        """Add many items"""
+        fields = list(map(self._get_fields, items))
+        if not fields:
+            return
+        for name, values in zip(self.COLUMNS, zip(*fields)):
+            self._extend_column(name, values)
+
+    def extend_rows(self, rows: Iterable[Tuple], search_term: str, location_id: str = '') -> None:
+        """Add compact row tuples (see BidFTAItem.ROW_FIELDS) without building items"""
+        rows = list(rows)
+        if not rows:
+            return
+        for (name, _, _), values in zip(BidFTAItem.ROW_FIELDS, zip(*rows)):
+            self._extend_column(name, values)
+        self.columns['search_term'].extend([search_term] * len(rows))
+        self.columns['location_id'].extend([location_id] * len(rows))
+
+    def __len__(self) -> int:
+        return len(self.columns['title'])
+
+    def __getitem__(self, index: int) -> BidFTAItem:
+        item = BidFTAItem.__new__(BidFTAItem)
+        for name, column in self.columns.items():
+            setattr(item, name, column[index])
+        return item
+
+    def __iter__(self) -> Iterator[BidFTAItem]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def to_dicts(self) -> List[Dict]:
+        """Row-wise view for compatibility with code expecting to_dict() output"""
+        return [dict(zip(self.columns, values)) for values in zip(*self.columns.values())]
+
+    def build(self) -> pd.DataFrame:
+        """
+        Materialize the buffers as a DataFrame
+
+        Returns:
+            DataFrame with float64 prices and seconds remaining, int64 bid
+            counts, a UTC end_datetime and an hours_remaining column
+        """
+        data = {}
+        for name in self.COLUMNS:
+            column = self.columns[name]
+            if name in FLOAT_COLUMNS:
+                data[name] = np.frombuffer(column, dtype=np.float64).copy()
+            elif name in INT_COLUMNS:
+                data[name] = np.frombuffer(column, dtype=np.int64).copy()
+            else:
+                data[name] = column
+        df = pd.DataFrame(data, copy=False)
+
+        df['end_datetime'] = to_utc_series(df['end_datetime'])
+        df['hours_remaining'] = df['time_remaining'] / 3600
+        return df
+
+    def build_arrow(self):
+        """
+        Materialize the buffers as a pyarrow Table
+
+        Requires the optional pyarrow dependency.
+        """
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("build_arrow() requires pyarrow: pip install pyarrow")
+        return pa.Table.from_pandas(self.build(), preserve_index=False)
+
+
+def merge_duplicate_terms(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Collapse rows for the same lot found by several search terms
+
+    Rows are matched on (auction_id, lot_code) in one hashed pass. The first
+    row of each lot is kept and gains a search_terms column listing every
+    term that matched it, in scrape order; search_term keeps the first one.
+    Rows with neither an auction_id nor a lot_code are never merged.
+
+    Args:
+        df: DataFrame returned by scrape_search_terms
+
+    Returns:
+        Deduplicated DataFrame with a search_terms column
+    """
+    first: Dict[Tuple, int] = {}
+    keep = []
+    terms = []
+    keys = zip(df['auction_id'].tolist(), df['lot_code'].tolist())
+    for position, (key, term) in enumerate(zip(keys, df['search_term'].tolist())):
+        keyed = bool(key[0] or key[1])
+        merged = first.get(key) if keyed else None
+        if merged is None:
+            if keyed:
+                first[key] = len(keep)
+            keep.append(position)
+            terms.append([term])
+        elif term not in terms[merged]:
+            terms[merged].append(term)
+
+    merged_df = df.iloc[keep].reset_index(drop=True)
+    merged_df['search_terms'] = pd.Series(terms, dtype=object)
+    return merged_df
@@ -0,0 +1,131 @@
+"""
+Item model for BidFTA auction listings
+"""
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+class BidFTAItem:
+    """Class to represent a single BidFTA auction item"""
+
+    __slots__ = (
+        'title', 'current_bid', 'image_url', 'end_datetime', 'time_remaining', 'msrp',
+        'condition', 'lot_code', 'search_term', 'bids_count', 'auction_id', 'location_id'
+    )
+
+    # (attribute, payload key, default) in the order used by compact row tuples
+    ROW_FIELDS = (
+        ('title', 'title', ''),
+        ('current_bid', 'currentBid', 0),
+        ('image_url', 'imageUrl', ''),
+        ('end_datetime', 'utcEndDateTime', ''),
+        ('time_remaining', 'itemTimeRemaining', ''),
+        ('msrp', 'msrp', 0),
+        ('condition', 'condition', ''),
+        ('lot_code', 'lotCode', ''),
+        ('bids_count', 'bidsCount', 0),
+        ('auction_id', 'auctionId', ''),
+    )
+
+    def __init__(self, item_data: Dict, search_term: str, location_id: str = ''):
+        self.title = item_data.get('title', '')
+        self.current_bid = item_data.get('currentBid', 0)
+        self.image_url = item_data.get('imageUrl', '')
+        self.end_datetime = item_data.get('utcEndDateTime', '')
+        self.time_remaining = item_data.get('itemTimeRemaining', '')
+        self.msrp = item_data.get('msrp', 0)
+        self.condition = item_data.get('condition', '')
+        self.lot_code = item_data.get('lotCode', '')
+        self.search_term = search_term
+        self.bids_count = item_data.get('bidsCount', 0)
+        self.auction_id = item_data.get('auctionId', '')
+        self.location_id = location_id
+
+    @staticmethod
+    def row_from_data(item_data: Dict) -> Tuple:
+        """Convert raw item data to a compact tuple ordered like ROW_FIELDS"""
+        return tuple(item_data.get(key, default) for _, key, default in BidFTAItem.ROW_FIELDS)
+
+    @classmethod
+    def from_row(cls, row: Tuple, search_term: str, location_id: str = '') -> 'BidFTAItem':
+        """Build an item from a compact tuple produced by row_from_data"""
+        item = cls.__new__(cls)
+        for (attribute, _, _), value in zip(cls.ROW_FIELDS, row):
+            setattr(item, attribute, value)
+        item.search_term = search_term
+        item.location_id = location_id
+        return item
+
+    def to_dict(self) -> Dict:
+        """Convert item to dictionary format (kept for compatibility; FrameBuilder builds result columns without it)"""
+        return {
+            'title': self.title,
+            'current_bid': self.current_bid,
+            'image_url': self.image_url,
+            'end_datetime': self.end_datetime,
+            'time_remaining': self.time_remaining,
+            'msrp': self.msrp,
+            'condition': self.condition,
+            'lot_code': self.lot_code,
+            'search_term': self.search_term,
+            'bids_count': self.bids_count,
+            'auction_id': self.auction_id,
+            'location_id': self.location_id
+        }
+
+
+def unique_items(items: Iterable[BidFTAItem], seen: Optional[Set[Tuple]] = None) -> List[BidFTAItem]:
+    """
+    Drop items already seen for the same search term, keeping the first
+
+    Items are matched on (search_term, auction_id, lot_code), so a listing
+    returned by several locations is kept once. Items with neither an
+    auction_id nor a lot_code are always kept.
+
+    Args:
+        items: Items in priority order
+        seen: Keys seen so far; updated in place, so it can be shared across
+            calls while streaming
+
+    Returns:
+        The items that were not seen before
+    """
+    seen = set() if seen is None else seen
+    unique = []
+    for item in items:
+        if item.auction_id or item.lot_code:
+            key = (item.search_term, item.auction_id, item.lot_code)
+            if key in seen:
+                continue
+            seen.add(key)
+        unique.append(item)
+    return unique
+
+
+_AUCTION_ID = [name for name, _, _ in BidFTAItem.ROW_FIELDS].index('auction_id')
+_LOT_CODE = [name for name, _, _ in BidFTAItem.ROW_FIELDS].index('lot_code')
+
+
+def unique_rows(rows: Iterable[Tuple], search_term: str, seen: Optional[Set[Tuple]] = None) -> List[Tuple]:
+    """
+    unique_items for compact row tuples (see BidFTAItem.ROW_FIELDS)
+
+    Args:
+        rows: Rows of one search term in priority order
+        search_term: Term the rows were found by
+        seen: Keys seen so far, shared with unique_items; updated in place
+
+    Returns:
+        The rows that were not seen before
+    """
+    seen = set() if seen is None else seen
+    unique = []
+    for row in rows:
+        auction_id, lot_code = row[_AUCTION_ID], row[_LOT_CODE]
+        if auction_id or lot_code:
+            key = (search_term, auction_id, lot_code)
+            if key in seen:
+                continue
+            seen.add(key)
+        unique.append(row)
+    return unique
@@ -0,0 +1,37 @@
+"""
+Helpers for scraping several warehouse locations in one run
+"""
+
+from typing import Hashable, List, Sequence, Union
+
+
+def parse_location_ids(location_id: Union[str, int, Sequence[Union[str, int]]]) -> List[str]:
+    """
+    Normalize the location_id scraper argument to a list of IDs
+
+    Args:
+        location_id: One location ID, a comma-separated string of IDs, or a
+            list of IDs
+
+    Returns:
+        Location IDs as strings, in order and without duplicates
+    """
+    if isinstance(location_id, (str, int)):
+        location_id = str(location_id).split(',')
+    location_ids = list(dict.fromkeys(str(location).strip() for location in location_id))
+    location_ids = [location for location in location_ids if location]
+    if not location_ids:
+        raise ValueError("at least one location_id is required")
+    return location_ids
+
+
+def page_count_key(location_ids: Sequence[str], search_term: str, location_id: str) -> Hashable:
+    """
+    Key for a scraper's page_counts entry
+
+    Single-location scrapers key page counts by search term alone, as they
+    always have; with several locations the key is (search_term, location_id).
+    """
+    if len(location_ids) == 1:
+        return search_term
+    return (search_term, location_id)
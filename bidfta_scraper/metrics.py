@@ -0,0 +1,197 @@
+"""
+Per-stage timings and counters for scrape runs
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Counters recorded by the scrapers
+REQUESTS = 'requests'
+BYTES = 'bytes'
+ITEMS = 'items'
+ERRORS = 'errors'
+RETRIES = 'retries'
+CACHE_HITS = 'cache_hits'
+NOT_MODIFIED = 'not_modified'
+
+# Timed stages
+FETCH = 'fetch'
+PARSE = 'parse'
+DATAFRAME = 'dataframe'
+STORE = 'store'
+RUN = 'run'
+
+_HELP = {
+    REQUESTS: "HTTP requests made, including retries",
+    BYTES: "Response body bytes received",
+    ITEMS: "Items scraped",
+    ERRORS: "Requests or pages that failed permanently",
+    RETRIES: "Requests retried after a transient failure",
+    CACHE_HITS: "Pages served from the response cache",
+    NOT_MODIFIED: "Cached pages revalidated with a 304 response",
+}
+
+
+class MetricsSink:
+    """
+    Destination for scraper metrics
+
+    Subclass and override increment and observe to forward metrics to a
+    monitoring system; both do nothing by default.
+    """
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """Add to a counter"""
+
+    def observe(self, stage: str, seconds: float) -> None:
+        """Record the duration of one run of a stage"""
+
+
+class StageTiming:
+    """Running totals for one stage"""
+
+    __slots__ = ('count', 'total', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else 0.0,
+            'max': self.max,
+        }
+
+
+class InMemoryMetrics(MetricsSink):
+    """Keeps counters and stage timing totals in memory"""
+
+    def __init__(self):
+        self.counters: Dict[str, float] = {}
+        self.timings: Dict[str, StageTiming] = {}
+
+    def increment(self, name: str, value: float = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, stage: str, seconds: float) -> None:
+        timing = self.timings.get(stage)
+        if timing is None:
+            timing = self.timings[stage] = StageTiming()
+        timing.add(seconds)
+
+    def summary(self) -> Dict[str, Dict]:
+        """
+        Counters and per-stage timings as plain dictionaries
+
+        Returns:
+            {'counters': {name: value}, 'timings': {stage: {'count', 'total', 'mean', 'max'}}}
+        """
+        return {
+            'counters': dict(self.counters),
+            'timings': {stage: timing.to_dict() for stage, timing in self.timings.items()},
+        }
+
+
+class RunMetrics(InMemoryMetrics):
+    """
+    Metrics of one scrape run, also forwarded to an optional sink
+
+    The scrapers keep one as last_metrics, reset at the start of every run
+    like last_report.
+    """
+
+    def __init__(self, sink: Optional[MetricsSink] = None):
+        super().__init__()
+        self.sink = sink
+
+    def increment(self, name: str, value: float = 1) -> None:
+        super().increment(name, value)
+        if self.sink is not None:
+            self.sink.increment(name, value)
+
+    def observe(self, stage: str, seconds: float) -> None:
+        super().observe(stage, seconds)
+        if self.sink is not None:
+            self.sink.observe(stage, seconds)
+
+    @contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        """Time the enclosed block as one run of a stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+
+class PrometheusExporter(InMemoryMetrics):
+    """
+    Accumulates metrics across runs and renders them in the Prometheus text format
+
+    Counters are exported as <prefix>_<name>_total and stage timings as a
+    <prefix>_stage_seconds summary labelled by stage. Serve render() from an
+    HTTP handler, or call write() after each run for node_exporter's textfile
+    collector. One exporter can be shared by several scrapers and threads.
+    """
+
+    def __init__(self, prefix: str = 'bidfta'):
+        """
+        Initialize the exporter
+
+        Args:
+            prefix: Metric name prefix (default: 'bidfta')
+        """
+        super().__init__()
+        self.prefix = prefix
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            super().increment(name, value)
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            super().observe(stage, seconds)
+
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text exposition format"""
+        with self._lock:
+            counters = sorted(self.counters.items())
+            timings = sorted((stage, timing.count, timing.total) for stage, timing in self.timings.items())
+
+        lines: List[str] = []
+        for name, value in counters:
+            metric = f"{self.prefix}_{name}_total"
+            lines.append(f"# HELP {metric} {_HELP.get(name, name)}")
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value:.15g}")
+        if timings:
+            metric = f"{self.prefix}_stage_seconds"
+            lines.append(f"# HELP {metric} Time spent in each scrape stage")
+            lines.append(f"# TYPE {metric} summary")
+            for stage, count, total in timings:
+                lines.append(f'{metric}_sum{{stage="{stage}"}} {total:.6f}')
+                lines.append(f'{metric}_count{{stage="{stage}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """Write render() to a file, replacing it atomically"""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w') as file:
+            file.write(self.render())
+        os.replace(temp_path, path)
@@ -0,0 +1,52 @@
+"""
+Pagination helpers for BidFTA search results
+"""
+
+import math
+from typing import Dict, Optional
+
+# Keys the Next.js payload has used for page/total metadata on initialData
+PAGE_COUNT_KEYS = ('totalPages', 'pageCount', 'numberOfPages')
+TOTAL_ITEMS_KEYS = ('totalItems', 'totalCount', 'itemsCount', 'total')
+
+
+def get_initial_data(json_data: Dict) -> Dict:
+    """Return the initialData block of a __NEXT_DATA__ payload"""
+    return json_data.get('props', {}).get('pageProps', {}).get('initialData', {}) or {}
+
+
+def _first_int(data: Dict, keys) -> Optional[int]:
+    """Return the first key in data that holds an integer-like value"""
+    for key in keys:
+        value = data.get(key)
+        if value is None or isinstance(value, bool):
+            continue
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def get_page_count(json_data: Dict, page_size: int) -> int:
+    """
+    Determine how many result pages a search has
+
+    Args:
+        json_data: JSON data from the first result page
+        page_size: Number of items found on the first page
+
+    Returns:
+        Total number of pages (at least 1)
+    """
+    initial_data = get_initial_data(json_data)
+
+    page_count = _first_int(initial_data, PAGE_COUNT_KEYS)
+    if page_count is not None:
+        return max(page_count, 1)
+
+    total_items = _first_int(initial_data, TOTAL_ITEMS_KEYS)
+    if total_items is not None and page_size > 0:
+        return max(math.ceil(total_items / page_size), 1)
+
+    return 1
@@ -0,0 +1,35 @@
+"""
+Page parsing that can run in a worker process
+
+Everything here is a plain module-level function over picklable arguments so
+it can be submitted to a ProcessPoolExecutor. Items are returned as compact
+tuples rather than BidFTAItem objects to keep the results cheap to pickle.
+"""
+
+from typing import List, Optional, Tuple
+
+from .items import BidFTAItem
+from .pagination import get_initial_data, get_page_count
+
+
+def parse_page_rows(html, extractor, decoder) -> Optional[Tuple[List[Tuple], int]]:
+    """
+    Parse a results page into item rows
+
+    Args:
+        html: Raw page body as bytes or text
+        extractor: Extractor object used to find the __NEXT_DATA__ payload
+        decoder: Function that decodes the payload
+
+    Returns:
+        (rows, page_count) where rows are tuples ordered like
+        BidFTAItem.ROW_FIELDS, or None if the page has no payload
+    """
+    payload = extractor.extract(html)
+    if not payload:
+        return None
+
+    json_data = decoder(payload)
+    raw_items = get_initial_data(json_data).get('items') or []
+    rows = [BidFTAItem.row_from_data(item_data) for item_data in raw_items]
+    return rows, get_page_count(json_data, len(rows))
@@ -0,0 +1,215 @@
+"""
+Opt-in CPU and memory profiling of scrape runs
+"""
+
+import cProfile
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+CPU_MODES = ('cprofile', 'sample', None)
+
+# Points in a run where memory snapshots can be taken
+START = 'start'
+SCRAPED = 'scraped'
+DATAFRAME = 'dataframe'
+END = 'end'
+MEMORY_STAGES = (START, SCRAPED, DATAFRAME, END)
+
+
+class StackSampler:
+    """
+    Low-overhead sampling profiler for one thread
+
+    A background thread records the target thread's Python stack every
+    `interval` seconds. The result is written in the collapsed-stack format
+    read by flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._target: Optional[int] = None
+
+    def start(self) -> None:
+        """Start sampling the calling thread"""
+        self._target = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="bidfta-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def write(self, path: str) -> None:
+        """Write the samples as collapsed stacks, one 'frame;frame;frame count' line each"""
+        with open(path, 'w') as file:
+            for stack, count in self.samples.most_common():
+                file.write(f"{stack} {count}\n")
+
+
+class Profiler:
+    """
+    Writes profile artifacts for every scrape run it wraps
+
+    Pass one to a scraper as profiler= and each scrape_search_terms call
+    writes, under output_dir and prefixed with the run's timestamp:
+
+        <run>.prof          cProfile stats (cpu='cprofile'), for pstats or snakeviz
+        <run>.collapsed     sampled stacks (cpu='sample'), for flame graphs
+        <run>-<stage>.tracemalloc
+                            tracemalloc snapshots (memory=True), for
+                            tracemalloc.Snapshot.load
+        <run>-memory.txt    top allocations at each stage and growth since
+                            the previous one
+
+    The paths of the latest run are in last_artifacts.
+    """
+
+    def __init__(self,
+                 output_dir: str = "profiles",
+                 cpu: Optional[str] = 'cprofile',
+                 sample_interval: float = 0.005,
+                 memory: bool = False,
+                 memory_stages: Sequence[str] = MEMORY_STAGES,
+                 memory_frames: int = 10,
+                 top: int = 25):
+        """
+        Initialize the profiler
+
+        Args:
+            output_dir: Directory artifacts are written to (created if missing)
+            cpu: 'cprofile' for deterministic profiling, 'sample' for a
+                low-overhead stack sampler, or None for no CPU profile
+            sample_interval: Seconds between stack samples in 'sample' mode
+            memory: Take tracemalloc snapshots during the run
+            memory_stages: Stages to snapshot, from 'start', 'scraped' (all
+                pages fetched and parsed), 'dataframe' (results built) and 'end'
+            memory_frames: Traceback depth tracemalloc records per allocation
+            top: Allocation sites listed per stage in the memory summary
+        """
+        if cpu not in CPU_MODES:
+            raise ValueError(f"Unknown cpu mode '{cpu}', expected one of {CPU_MODES}")
+        unknown = set(memory_stages) - set(MEMORY_STAGES)
+        if unknown:
+            raise ValueError(f"Unknown memory stages {sorted(unknown)}, expected some of {MEMORY_STAGES}")
+        self.output_dir = output_dir
+        self.cpu = cpu
+        self.sample_interval = sample_interval
+        self.memory = memory
+        self.memory_stages = tuple(memory_stages)
+        self.memory_frames = memory_frames
+        self.top = top
+        self.last_artifacts: List[str] = []
+        self._prefix: Optional[str] = None
+        self._snapshots: List[Tuple[str, tracemalloc.Snapshot]] = []
+
+    @contextmanager
+    def run(self, label: str = "scrape") -> Iterator[None]:
+        """
+        Profile the enclosed block as one run
+
+        Args:
+            label: Included in the artifact names
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._prefix = os.path.join(self.output_dir, f"{datetime.now():%Y%m%d-%H%M%S-%f}-{label}")
+        self._snapshots = []
+        self.last_artifacts = []
+
+        started_tracing = self.memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(self.memory_frames)
+        self.checkpoint(START)
+
+        profile = cProfile.Profile() if self.cpu == 'cprofile' else None
+        sampler = StackSampler(self.sample_interval) if self.cpu == 'sample' else None
+        if profile is not None:
+            profile.enable()
+        if sampler is not None:
+            sampler.start()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if profile is not None:
+                profile.disable()
+                self._add_artifact(f"{self._prefix}.prof", profile.dump_stats)
+            if sampler is not None:
+                sampler.stop()
+                self._add_artifact(f"{self._prefix}.collapsed", sampler.write)
+            self.checkpoint(END)
+            if self._snapshots:
+                self._add_artifact(f"{self._prefix}-memory.txt", self._write_memory_summary)
+            if started_tracing:
+                tracemalloc.stop()
+            self._prefix = None
+            logger.info(f"Profiled '{label}' ({elapsed:.2f}s), wrote {len(self.last_artifacts)} artifacts to '{self.output_dir}'")
+
+    def checkpoint(self, stage: str) -> None:
+        """Take a memory snapshot if the stage is configured and a run is active"""
+        if not self.memory or self._prefix is None or stage not in self.memory_stages:
+            return
+        if not tracemalloc.is_tracing():
+            return
+        snapshot = tracemalloc.take_snapshot()
+        self._snapshots.append((stage, snapshot))
+        self._add_artifact(f"{self._prefix}-{stage}.tracemalloc", snapshot.dump)
+
+    def _add_artifact(self, path: str, write) -> None:
+        write(path)
+        self.last_artifacts.append(path)
+
+    def _write_memory_summary(self, path: str) -> None:
+        previous = None
+        with open(path, 'w') as file:
+            for stage, snapshot in self._snapshots:
+                stats = snapshot.statistics('lineno')
+                total = sum(stat.size for stat in stats)
+                file.write(f"== {stage}: {total / 1024 / 1024:.1f} MiB traced ==\n")
+                for stat in stats[:self.top]:
+                    file.write(f"{stat}\n")
+                if previous is not None:
+                    file.write(f"-- growth since {previous[0]} --\n")
+                    for stat in snapshot.compare_to(previous[1], 'lineno')[:self.top]:
+                        file.write(f"{stat}\n")
+                file.write("\n")
+                previous = (stage, snapshot)
+
+    def summary(self) -> Dict[str, int]:
+        """Traced bytes at each memory stage of the latest run"""
+        return {
+            stage: sum(stat.size for stat in snapshot.statistics('filename'))
+            for stage, snapshot in self._snapshots
+        }
+
+
+def profile_run(profiler: Optional[Profiler], label: str = "scrape"):
+    """Context manager that profiles a run when a profiler is given and does nothing otherwise"""
+    return profiler.run(label) if profiler is not None else nullcontext()
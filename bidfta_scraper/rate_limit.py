@@ -0,0 +1,93 @@
+"""
+Token-bucket rate limiting shared by the sync and async scrapers
+"""
+
+import asyncio
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter
+
+    Tokens refill continuously at `rate` per second up to `burst`. Each request
+    takes one token; when none are left the caller waits until its token has
+    refilled. Waiting callers reserve tokens in arrival order, so the limiter
+    is fair and can be shared between threads, event loops and both scraper
+    types.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Initialize the token bucket
+
+        Args:
+            rate: Requests allowed per second
+            burst: Maximum number of requests that may be made back to back
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def release(self) -> None:
+        """Return a reserved token that will not be used"""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + 1)
+
+    def acquire(self) -> None:
+        """Block until a request may be made"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        """Wait without blocking the event loop until a request may be made"""
+        delay = self.reserve()
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                # A cancelled waiter never sends its request, so its slot goes
+                # to the next caller instead of delaying everyone behind it
+                self.release()
+                raise
+
+
+def make_rate_limiter(requests_per_second: Optional[float],
+                      burst: int = 1,
+                      rate_limiter: Optional[TokenBucket] = None) -> Optional[TokenBucket]:
+    """
+    Build the rate limiter for a scraper from its constructor settings
+
+    Args:
+        requests_per_second: Request rate, or None/0 for no limit
+        burst: Bucket size
+        rate_limiter: Existing limiter to share, overrides the other settings
+
+    Returns:
+        A TokenBucket, or None when requests should not be limited
+    """
+    if rate_limiter is not None:
+        return rate_limiter
+    if not requests_per_second or requests_per_second <= 0:
+        return None
+    return TokenBucket(requests_per_second, burst)
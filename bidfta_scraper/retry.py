@@ -0,0 +1,113 @@
+"""
+Retry policy and per-run failure reporting
+"""
+
+import random
+from typing import Dict, List, NamedTuple, Optional
+
+
+class RetryPolicy:
+    """Decides which failed requests to retry and how long to back off"""
+
+    def __init__(self,
+                 max_attempts: int = 3,
+                 backoff_base: float = 0.5,
+                 backoff_cap: float = 30.0,
+                 jitter: bool = True,
+                 retry_statuses=(429, 500, 502, 503, 504)):
+        """
+        Initialize the retry policy
+
+        Args:
+            max_attempts: Total attempts per request, including the first
+            backoff_base: Backoff before the first retry in seconds; doubles
+                on every further retry
+            backoff_cap: Upper bound on a single backoff in seconds
+            jitter: Randomize each backoff between 0 and its full value so
+                concurrent retries do not fire in lockstep
+            retry_statuses: HTTP statuses worth retrying; connection errors
+                and timeouts are always retried
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def should_retry(self, attempt: int, status: Optional[int] = None) -> bool:
+        """
+        Decide whether to retry after a failed attempt
+
+        Args:
+            attempt: Number of the attempt that just failed, starting at 1
+            status: HTTP status of the failure, or None for connection errors
+                and timeouts
+        """
+        if attempt >= self.max_attempts:
+            return False
+        return status is None or status in self.retry_statuses
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Seconds to wait before the next attempt
+
+        Args:
+            attempt: Number of the attempt that just failed, starting at 1
+            retry_after: Server-requested delay from a Retry-After header,
+                used as a lower bound
+        """
+        delay = min(self.backoff_cap, self.backoff_base * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_cap))
+        return delay
+
+
+class FailedRequest(NamedTuple):
+    """A request that still failed after all retries"""
+    url: str
+    error: str
+    attempts: int
+    search_term: Optional[str] = None
+    page_id: Optional[int] = None
+
+
+class ScrapeReport:
+    """Outcome of a scrape run: retries made and requests that failed permanently"""
+
+    def __init__(self):
+        self.failures: List[FailedRequest] = []
+        self.retries = 0
+
+    def add_failure(self,
+                    url: str,
+                    error: str,
+                    attempts: int = 1,
+                    search_term: Optional[str] = None,
+                    page_id: Optional[int] = None) -> None:
+        """Record a request that failed permanently"""
+        self.failures.append(FailedRequest(url, error, attempts, search_term, page_id))
+
+    @property
+    def ok(self) -> bool:
+        """True when nothing failed permanently"""
+        return not self.failures
+
+    @property
+    def failed_terms(self) -> List[str]:
+        """Search terms with at least one failed page"""
+        return sorted({failure.search_term for failure in self.failures if failure.search_term is not None})
+
+    def failed_pages(self) -> Dict[str, List[int]]:
+        """Failed page numbers grouped by search term"""
+        pages: Dict[str, List[int]] = {}
+        for failure in self.failures:
+            if failure.search_term is not None:
+                pages.setdefault(failure.search_term, []).append(failure.page_id)
+        return pages
+
+    def __repr__(self) -> str:
+        return f"ScrapeReport(failures={len(self.failures)}, retries={self.retries})"
@@ -0,0 +1,139 @@
+"""
+Vectorized deal scoring over scraped DataFrames
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .formatting import parse_currency
+
+
+def _numeric(df: pd.DataFrame, column: str) -> np.ndarray:
+    """Return a column as float64, accepting "$1,234.50" strings from currency_strings=True"""
+    if column not in df.columns:
+        return np.full(len(df), np.nan)
+    return parse_currency(df[column]).to_numpy()
+
+
+class DealScorer:
+    """
+    Ranks items by discount, competition and urgency
+
+    Each component is scaled to [0, 1], where higher is a better deal:
+
+    - discount: 1 - current_bid / msrp, 0 when the MSRP is unknown
+    - competition: 1 / (1 + bids per remaining hour), so items with few bids
+      relative to their time left score higher
+    - urgency: how close the auction is to ending, reaching 1 at the end and
+      0 at `urgency_horizon` hours or more; ended auctions score 0
+
+    The score is the weighted mean of the components; auctions that have
+    already ended score 0 since they can no longer be bid on. All work is done on
+    whole columns, so scoring millions of rows takes a fraction of a second.
+    """
+
+    COMPONENTS = ('discount', 'competition', 'urgency')
+
+    def __init__(self,
+                 discount_weight: float = 1.0,
+                 competition_weight: float = 0.5,
+                 urgency_weight: float = 0.5,
+                 urgency_horizon: float = 24.0):
+        """
+        Initialize the scorer
+
+        Args:
+            discount_weight: Weight of the discount vs MSRP
+            competition_weight: Weight of the bids-per-hour component
+            urgency_weight: Weight of the time-left component
+            urgency_horizon: Hours remaining at which urgency drops to 0
+        """
+        weights = np.array([discount_weight, competition_weight, urgency_weight], dtype=np.float64)
+        if (weights < 0).any() or weights.sum() <= 0:
+            raise ValueError("weights must be non-negative and not all zero")
+        if urgency_horizon <= 0:
+            raise ValueError("urgency_horizon must be positive")
+        self.weights = weights
+        self.urgency_horizon = urgency_horizon
+
+    def components(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compute the score components
+
+        Args:
+            df: DataFrame returned by scrape_search_terms
+
+        Returns:
+            DataFrame with discount, competition and urgency columns, indexed
+            like `df`
+        """
+        bid = _numeric(df, 'current_bid')
+        msrp = _numeric(df, 'msrp')
+        bids = _numeric(df, 'bids_count')
+        hours = _numeric(df, 'hours_remaining')
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            discount = np.where(msrp > 0, 1.0 - bid / msrp, 0.0)
+            bids_per_hour = bids / np.maximum(hours, 1.0)
+        discount = np.clip(np.nan_to_num(discount, nan=0.0), 0.0, 1.0)
+        competition = 1.0 / (1.0 + np.nan_to_num(np.maximum(bids_per_hour, 0.0), nan=0.0))
+        urgency = np.where(hours > 0, np.clip(1.0 - hours / self.urgency_horizon, 0.0, 1.0), 0.0)
+
+        return pd.DataFrame(
+            {'discount': discount, 'competition': competition, 'urgency': urgency},
+            index=df.index
+        )
+
+    def score(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Score every row
+
+        Args:
+            df: DataFrame returned by scrape_search_terms
+
+        Returns:
+            Scores between 0 and 1, indexed like `df`
+        """
+        components = self.components(df).to_numpy()
+        scores = components @ (self.weights / self.weights.sum())
+        scores[_numeric(df, 'hours_remaining') <= 0] = 0.0
+        return pd.Series(scores, index=df.index, name='score')
+
+    def top(self, df: pd.DataFrame, k: int = 10) -> pd.DataFrame:
+        """
+        Select the k best-scoring rows without sorting the whole frame
+
+        Args:
+            df: DataFrame returned by scrape_search_terms
+            k: Number of rows to return
+
+        Returns:
+            The top rows, best first, with a score column added
+        """
+        if k <= 0 or df.empty:
+            return df.iloc[:0].assign(score=pd.Series(dtype=np.float64))
+        scores = self.score(df).to_numpy()
+        if k < len(scores):
+            # argpartition finds the k largest in linear time; only they are sorted
+            positions = np.argpartition(-scores, k - 1)[:k]
+        else:
+            positions = np.arange(len(scores))
+        positions = positions[np.argsort(-scores[positions], kind='stable')]
+        return df.iloc[positions].assign(score=scores[positions])
+
+
+def top_deals(df: pd.DataFrame, k: int = 10, scorer: Optional[DealScorer] = None) -> pd.DataFrame:
+    """
+    Return the k best deals in a result DataFrame
+
+    Args:
+        df: DataFrame returned by scrape_search_terms
+        k: Number of rows to return
+        scorer: DealScorer to use (default: DealScorer())
+
+    Returns:
+        The top rows, best first, with a score column added
+    """
+    return (scorer or DealScorer()).top(df, k)
@@ -3,13 +3,29 @@ BidFTAScraper: A module for scraping auction data from BidFTA.com
 """
 
 import requests
-from bs4 import BeautifulSoup
 import json
 from datetime import datetime
 import pandas as pd
-from typing import List, Dict, Optional
+from typing import Hashable, List, Dict, Optional, Sequence, Tuple, Union
 import time
 import logging
+from .items import BidFTAItem, unique_rows
+from .locations import page_count_key, parse_location_ids
+from .frames import FrameBuilder, merge_duplicate_terms
+from .formatting import format_currency_columns
+from .parsing import parse_page_rows
+from .extractors import get_extractor
+from .decoders import get_decoder
+from .rate_limit import TokenBucket, make_rate_limiter
+from .retry import RetryPolicy, ScrapeReport
+from .concurrency import parse_retry_after
+from .cache import ResponseCache, PageResponse
+from .store import ItemStore
+from .metrics import (MetricsSink, RunMetrics, BYTES, CACHE_HITS, DATAFRAME, ERRORS, FETCH, ITEMS,
+                      NOT_MODIFIED, PARSE, REQUESTS, RETRIES, RUN, STORE)
+from .profiling import Profiler, profile_run
+from .session import USER_AGENT
+from . import profiling
 
 # Set up logging
 logging.basicConfig(
@@ -18,67 +34,101 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-class BidFTAItem:
-    """Class to represent a single BidFTA auction item"""
-    def __init__(self, item_data: Dict, search_term: str):
-        self.title = item_data.get('title', '')
-        self.current_bid = item_data.get('currentBid', 0)
-        self.image_url = item_data.get('imageUrl', '')
-        self.end_datetime = item_data.get('utcEndDateTime', '')
-        self.time_remaining = item_data.get('itemTimeRemaining', '')
-        self.msrp = item_data.get('msrp', 0)
-        self.condition = item_data.get('condition', '')
-        self.lot_code = item_data.get('lotCode', '')
-        self.search_term = search_term
-        self.bids_count = item_data.get('bidsCount', 0)
-        self.auction_id = item_data.get('auctionId', '')
-
-    def to_dict(self) -> Dict:
-        """Convert item to dictionary format"""
-        return {
-            'title': self.title,
-            'current_bid': self.current_bid,
-            'image_url': self.image_url,
-            'end_datetime': self.end_datetime,
-            'time_remaining': self.time_remaining,
-            'msrp': self.msrp,
-            'condition': self.condition,
-            'lot_code': self.lot_code,
-            'search_term': self.search_term,
-            'bids_count': self.bids_count,
-            'auction_id': self.auction_id
-        }
-
 class BidFTAScraper:
     """Main scraper class for BidFTA.com"""
     
-    def __init__(self, location_id: str = "616", request_delay: int = 2):
+    def __init__(self, 
+                 location_id: Union[str, Sequence[str]] = "616", 
+                 request_delay: int = 2,
+                 max_pages: Optional[int] = None,
+                 extractor=None,
+                 json_mode: str = "items",
+                 requests_per_second: Optional[float] = None,
+                 burst: int = 1,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 cache: Optional[ResponseCache] = None,
+                 currency_strings: bool = False,
+                 store: Optional[ItemStore] = None,
+                 dedupe_terms: bool = False,
+                 base_url: str = "https://www.bidfta.com/items",
+                 metrics: Optional[MetricsSink] = None,
+                 profiler: Optional[Profiler] = None):
         """
         Initialize the BidFTA scraper
         
         Args:
-            location_id: The location ID to filter results (default: "616")
-            request_delay: Delay between requests in seconds (default: 2)
+            location_id: The location ID to filter results, or a list of location
+                IDs to scrape in one run over a shared session and rate limiter
+                (default: "616")
+            request_delay: Minimum delay between requests in seconds, used when
+                requests_per_second is not given (default: 2)
+            max_pages: Maximum number of result pages per search term (default: no limit)
+            extractor: How to find the __NEXT_DATA__ payload: 'auto', 'scan', 'soup'
+                or an extractor object (default: 'auto')
+            json_mode: 'items' to decode only the items subtree of the payload,
+                or 'full' to decode all of it (default: 'items')
+            requests_per_second: Request rate limit (default: 1 / request_delay)
+            burst: Number of requests that may be made back to back (default: 1)
+            rate_limiter: A TokenBucket to share with other scrapers, overrides
+                requests_per_second and burst
+            retry_policy: How to retry failed requests (default: RetryPolicy())
+            cache: ResponseCache consulted before the network (default: no cache)
+            currency_strings: Return current_bid and msrp as "$1,234.50" strings,
+                as earlier releases did, instead of floats (default: False)
+            store: ItemStore that scrape_search_terms upserts its results into
+                (default: no store)
+            dedupe_terms: Return one row per lot, with a search_terms list of
+                every term that found it, instead of one row per term
+                (default: False)
+            base_url: Search endpoint, e.g. a local replay server for benchmarks
+                (default: "https://www.bidfta.com/items")
+            metrics: MetricsSink that also receives every counter and stage
+                timing, e.g. a PrometheusExporter (default: only last_metrics)
+            profiler: Profiler that wraps every scrape_search_terms run and
+                writes CPU profiles and memory snapshots (default: no profiling)
         """
-        self.base_url = "https://www.bidfta.com/items"
-        self.location_id = location_id
+        self.base_url = base_url
+        self.location_ids = parse_location_ids(location_id)
+        self.location_id = self.location_ids[0]
         self.request_delay = request_delay
+        if requests_per_second is None and request_delay:
+            requests_per_second = 1 / request_delay
+        self.rate_limiter = make_rate_limiter(requests_per_second, burst, rate_limiter)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.last_report = ScrapeReport()
+        self.metrics = metrics
+        self.last_metrics = RunMetrics(metrics)
+        self.profiler = profiler
+        self.cache = cache
+        self.currency_strings = currency_strings
+        self.store = store
+        self.dedupe_terms = dedupe_terms
+        self.max_pages = max_pages
+        # Keyed by search term, or by (search_term, location_id) with several locations
+        self.page_counts: Dict[Hashable, int] = {}
+        self.extractor = get_extractor(extractor)
+        self.json_mode = json_mode
+        self.decoder = get_decoder(json_mode)
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            'User-Agent': USER_AGENT
         })
         
-    def build_url(self, search_term: str) -> str:
+    def build_url(self, search_term: str, page_id: int = 1, location_id: Optional[str] = None) -> str:
         """
         Build the URL for the search query
         
         Args:
             search_term: Term to search for
+            page_id: Result page to request (default: 1)
+            location_id: Location to search (default: the first configured location)
             
         Returns:
             Complete URL for the search
         """
-        return f"{self.base_url}?pageId=1&itemSearchKeywords={search_term}&locations={self.location_id}"
+        location_id = location_id or self.location_id
+        return f"{self.base_url}?pageId={page_id}&itemSearchKeywords={search_term}&locations={location_id}"
     
     def extract_items_from_json(self, json_data: Dict, search_term: str) -> List[BidFTAItem]:
         """
@@ -101,36 +151,191 @@ class BidFTAScraper:
         
         return items
 
-    def scrape_search_term(self, search_term: str) -> List[BidFTAItem]:
+    def fetch_response(self, 
+                       url: str, 
+                       search_term: Optional[str] = None, 
+                       page_id: Optional[int] = None,
+                       headers: Optional[Dict[str, str]] = None) -> PageResponse:
         """
-        Scrape data for a single search term
+        Fetch a page, retrying transient failures
+        
+        Args:
+            url: URL of the page to fetch
+            search_term: Search term the page belongs to, for failure reporting
+            page_id: Result page number, for failure reporting
+            headers: Extra request headers, e.g. conditional request validators
+            
+        Returns:
+            The response body (None for 304 Not Modified), status and validators
+            
+        Raises:
+            requests.exceptions.RequestException: If the request still fails
+                after all retries; the failure is recorded in last_report
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            self.last_metrics.increment(REQUESTS)
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, headers=headers)
+                self.last_metrics.observe(FETCH, time.perf_counter() - start)
+                response.raise_for_status()
+                self.last_metrics.increment(BYTES, len(response.content))
+                return PageResponse(
+                    response.content if response.status_code != 304 else None,
+                    response.status_code,
+                    response.headers.get('ETag'),
+                    response.headers.get('Last-Modified')
+                )
+            except requests.exceptions.RequestException as e:
+                status = e.response.status_code if e.response is not None else None
+                if not self.retry_policy.should_retry(attempt, status):
+                    self.last_report.add_failure(url, str(e), attempt, search_term, page_id)
+                    self.last_metrics.increment(ERRORS)
+                    raise
+                retry_after = parse_retry_after(e.response.headers.get('Retry-After')) if e.response is not None else None
+                delay = self.retry_policy.backoff(attempt, retry_after)
+                self.last_report.retries += 1
+                self.last_metrics.increment(RETRIES)
+                logger.warning(f"Attempt {attempt} for {url} failed ({str(e)}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    def fetch_page(self, 
+                   url: str, 
+                   search_term: Optional[str] = None, 
+                   page_id: Optional[int] = None) -> bytes:
+        """
+        Fetch a page body, retrying transient failures
+        
+        Args:
+            url: URL of the page to fetch
+            search_term: Search term the page belongs to, for failure reporting
+            page_id: Result page number, for failure reporting
+            
+        Returns:
+            Raw page body
+        """
+        return self.fetch_response(url, search_term, page_id).body
+
+    def parse_response(self, 
+                       url: str, 
+                       response: PageResponse) -> Tuple[List[Tuple], int]:
+        """Parse a fetched page into item rows and store it in the cache"""
+        with self.last_metrics.time(PARSE):
+            parsed = parse_page_rows(response.body, self.extractor, self.decoder)
+        if parsed is None:
+            return [], 0
+        rows, page_count = parsed
+        if self.cache is not None:
+            self.cache.set(url, response.body, rows, page_count, response.etag, response.last_modified)
+        return rows, page_count
+
+    def fetch_rows(self,
+                   search_term: str,
+                   page_id: int = 1,
+                   location_id: Optional[str] = None) -> Tuple[List[Tuple], int]:
+        """
+        Fetch and parse one result page, consulting the cache first
+        
+        Fresh cache entries are used as-is. Stale entries with an ETag or
+        Last-Modified validator are revalidated with a conditional request,
+        and a 304 response reuses the cached rows.
         
         Args:
             search_term: Term to search for
+            page_id: Result page to fetch (default: 1)
+            location_id: Location to search (default: the first configured location)
             
         Returns:
-            List of BidFTAItem objects
+            (rows, page_count) with rows ordered like BidFTAItem.ROW_FIELDS,
+            or ([], 0) if the page has no payload
         """
-        url = self.build_url(search_term)
+        location_id = location_id or self.location_id
+        url = self.build_url(search_term, page_id, location_id)
+        cached = self.cache.get(url, allow_stale=True) if self.cache is not None else None
+        
+        if cached is None or not cached.fresh:
+            headers = cached.conditional_headers() if cached is not None else None
+            response = self.fetch_response(url, search_term, page_id, headers)
+            if cached is None or not response.not_modified:
+                return self.parse_response(url, response)
+            self.cache.revalidated(url)
+            self.last_metrics.increment(NOT_MODIFIED)
+        
+        self.last_metrics.increment(CACHE_HITS)
+        if cached.rows is None:
+            return self.parse_response(url, PageResponse(cached.body, 200, cached.etag, cached.last_modified))
+        return cached.rows, cached.page_count
+
+    def scrape_search_term_rows(self, search_term: str, location_id: Optional[str] = None) -> List[Tuple]:
+        """
+        Scrape a single search term as item rows, following all result pages
+        
+        Args:
+            search_term: Term to search for
+            location_id: Location to search (default: the first configured location)
+            
+        Returns:
+            Rows ordered like BidFTAItem.ROW_FIELDS. Pages that fail
+            permanently are recorded in last_report.
+        """
+        rows = []
+        page_id = 1
+        location_id = location_id or self.location_id
         try:
-            response = self.session.get(url)
-            response.raise_for_status()
+            rows, page_count = self.fetch_rows(search_term, location_id=location_id)
+            if not page_count:
+                return rows
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            script_tag = soup.find('script', {'id': '__NEXT_DATA__'})
+            self.page_counts[page_count_key(self.location_ids, search_term, location_id)] = page_count
+            if not rows:
+                return rows
+            if self.max_pages is not None:
+                page_count = min(page_count, self.max_pages)
             
-            if script_tag:
-                json_data = json.loads(script_tag.string)
-                return self.extract_items_from_json(json_data, search_term)
+            # Copy so later pages are not appended to a cached page's rows
+            rows = list(rows)
+            for page_id in range(2, page_count + 1):
+                page_rows, _ = self.fetch_rows(search_term, page_id, location_id)
+                if not page_rows:
+                    # An empty page means the listing is exhausted
+                    break
+                rows.extend(page_rows)
             
         except requests.exceptions.RequestException as e:
+            # Already recorded in last_report by fetch_page
             logger.error(f"Request error for term '{search_term}': {str(e)}")
         except json.JSONDecodeError as e:
             logger.error(f"JSON decode error for term '{search_term}': {str(e)}")
+            self.last_report.add_failure(self.build_url(search_term, page_id, location_id), str(e), 1, search_term, page_id)
+            self.last_metrics.increment(ERRORS)
         except Exception as e:
             logger.error(f"Unexpected error for term '{search_term}': {str(e)}")
+            self.last_report.add_failure(self.build_url(search_term, page_id, location_id), str(e), 1, search_term, page_id)
+            self.last_metrics.increment(ERRORS)
+        
+        return rows
+
+    def scrape_search_term(self, search_term: str, location_id: Optional[str] = None) -> List[BidFTAItem]:
+        """
+        Scrape data for a single search term, following all result pages
         
-        return []
+        Args:
+            search_term: Term to search for
+            location_id: Location to search (default: the first configured location)
+            
+        Returns:
+            List of BidFTAItem objects. Pages that fail permanently are
+            recorded in last_report.
+        """
+        location_id = location_id or self.location_id
+        return [
+            BidFTAItem.from_row(row, search_term, location_id)
+            for row in self.scrape_search_term_rows(search_term, location_id)
+        ]
 
     def scrape_search_terms(self, search_terms: List[str]) -> pd.DataFrame:
         """
@@ -140,23 +345,42 @@ class BidFTAScraper:
             search_terms: List of terms to search for
             
         Returns:
-            DataFrame containing all found items
+            DataFrame containing all found items, with numeric current_bid
+            and msrp columns and the location_id each item was found at.
+            An item listed at several locations appears once. Requests that failed permanently are listed in
+            last_report, and request counts and stage timings in last_metrics.
         """
-        all_items = []
-        
-        for term in search_terms:
-            logger.info(f"Scraping term: {term}")
-            items = self.scrape_search_term(term)
-            all_items.extend([item.to_dict() for item in items])
-            time.sleep(self.request_delay)
+        all_items = FrameBuilder()
+        self.last_report = ScrapeReport()
+        self.last_metrics = RunMetrics(self.metrics)
         
-        df = pd.DataFrame(all_items)
-        if not df.empty:
-            # Process DataFrame
-            df['end_datetime'] = pd.to_datetime(df['end_datetime'])
-            df['hours_remaining'] = df['time_remaining'].astype(float) / 3600
-            df['current_bid'] = df['current_bid'].apply(lambda x: f"${x:,.2f}")
-            df['msrp'] = df['msrp'].apply(lambda x: f"${x:,.2f}")
+        with profile_run(self.profiler, "sync"), self.last_metrics.time(RUN):
+            for term in search_terms:
+                # Items listed at several locations are kept once, from the first location
+                seen = set()
+                for location_id in self.location_ids:
+                    logger.info(f"Scraping term: {term} (location {location_id})")
+                    rows = self.scrape_search_term_rows(term, location_id)
+                    all_items.extend_rows(unique_rows(rows, term, seen), term, location_id)
+            self.last_metrics.increment(ITEMS, len(all_items))
+            if self.profiler is not None:
+                self.profiler.checkpoint(profiling.SCRAPED)
+            
+            with self.last_metrics.time(DATAFRAME):
+                df = all_items.build()
+                if self.dedupe_terms:
+                    before = len(df)
+                    df = merge_duplicate_terms(df)
+                    logger.info(f"Merged {before - len(df)} rows found by more than one search term")
+            if self.profiler is not None:
+                self.profiler.checkpoint(profiling.DATAFRAME)
+            if self.store is not None:
+                with self.last_metrics.time(STORE):
+                    written = self.store.upsert_frame(df)
+                logger.info(f"Stored {written} items in '{self.store.path}'")
+            if self.currency_strings:
+                with self.last_metrics.time(DATAFRAME):
+                    df = format_currency_columns(df)
         
         return df
 
@@ -169,9 +393,12 @@ def format_results(df: pd.DataFrame, save_path: Optional[str] = None) -> None:
         save_path: Optional path to save CSV file
     """
     if df.empty:
-        logger.info("No items found")
+        print("No items found")
         return
     
+    # Prices stay numeric in the scraped data and are formatted for output only
+    df = format_currency_columns(df)
+    
     # Display results
     print("\nFound Items:")
     display_columns = ['title', 'current_bid', 'hours_remaining', 'search_term']
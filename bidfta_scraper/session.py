@@ -0,0 +1,38 @@
+"""
+HTTP client settings shared by the scrapers
+"""
+
+import aiohttp
+
+USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+)
+
+
+def create_session(limit_per_host: int,
+                   keepalive_timeout: float = 30.0,
+                   dns_cache_ttl: int = 300,
+                   user_agent: str = USER_AGENT) -> aiohttp.ClientSession:
+    """
+    Create an aiohttp session with a connection pool tuned for one host
+
+    Must be called from inside a running event loop; the session is bound to it.
+
+    Args:
+        limit_per_host: Maximum open connections to the site; matches the
+            scraper's concurrency window so requests never queue for a socket
+        keepalive_timeout: Seconds an idle connection is kept for reuse
+        dns_cache_ttl: Seconds resolved addresses are cached
+        user_agent: User-Agent header sent with every request
+
+    Returns:
+        A new ClientSession; the caller closes it
+    """
+    connector = aiohttp.TCPConnector(
+        limit=max(100, limit_per_host),
+        limit_per_host=limit_per_host,
+        keepalive_timeout=keepalive_timeout,
+        ttl_dns_cache=dns_cache_ttl,
+    )
+    return aiohttp.ClientSession(connector=connector, headers={'User-Agent': user_agent})
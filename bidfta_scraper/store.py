@@ -0,0 +1,318 @@
+"""
+Incremental SQLite item store
+"""
+
+import itertools
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple, Union
+import logging
+
+import pandas as pd
+
+from .formatting import parse_currency
+from .items import BidFTAItem
+from .times import to_utc, to_utc_series
+
+logger = logging.getLogger(__name__)
+
+TimeLike = Union[str, datetime, pd.Timestamp]
+
+_ITEM_COLUMNS = (
+    'auction_id', 'lot_code', 'title', 'current_bid', 'msrp', 'bids_count',
+    'image_url', 'end_datetime', 'condition', 'search_term'
+)
+_TERM = _ITEM_COLUMNS.index('search_term')
+
+_UPSERT = f"""
+    INSERT INTO items ({', '.join(_ITEM_COLUMNS)}, first_seen, last_seen)
+    VALUES ({', '.join('?' * (len(_ITEM_COLUMNS) + 2))})
+    ON CONFLICT (auction_id, lot_code) DO UPDATE SET
+        {', '.join(f'{column} = excluded.{column}' for column in _ITEM_COLUMNS[2:])},
+        last_seen = excluded.last_seen
+"""
+
+# Every search term that found an item; items.search_term keeps the latest one
+_ADD_TERM = "INSERT OR IGNORE INTO item_terms (auction_id, lot_code, search_term) VALUES (?, ?, ?)"
+
+# Snapshot only items that are new or whose bid changed since the last write
+_SNAPSHOT = """
+    INSERT INTO bid_snapshots (auction_id, lot_code, observed_at, current_bid, bids_count)
+    SELECT ?, ?, ?, ?, ?
+    WHERE NOT EXISTS (
+        SELECT 1 FROM items
+        WHERE auction_id = ? AND lot_code = ? AND current_bid IS ? AND bids_count IS ?
+    )
+"""
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_utc_text(value) -> Optional[str]:
+    """Normalize an end time to sortable 'YYYY-MM-DD HH:MM:SS' UTC text"""
+    timestamp = to_utc(value)
+    return None if timestamp is None else timestamp.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _parse_bound(name: str, value) -> Optional[str]:
+    if value is None:
+        return None
+    text = _to_utc_text(value)
+    if text is None:
+        raise ValueError(f"{name} is not a valid time: {value!r}")
+    return text
+
+
+class ItemStore:
+    """
+    SQLite item store with upserts and bid history
+
+    Items are keyed by (auction_id, lot_code), so writing the results of each
+    polling run only updates what is already stored instead of rewriting a
+    full export. A bid snapshot is recorded whenever an item is first seen or
+    its current bid or bid count changes. Every search term that found an
+    item is kept in item_terms, so overlapping terms do not hide each other's
+    results. The database runs in WAL mode so readers are not blocked while a
+    run is being written.
+    """
+
+    def __init__(self, path: str = "bidfta_items.sqlite", batch_size: int = 1000):
+        """
+        Initialize the store
+
+        Args:
+            path: SQLite database file, or ":memory:" for a per-process store
+            batch_size: Number of items written per transaction
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.path = path
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        has_terms = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'item_terms'"
+        ).fetchone() is not None
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS items (
+                auction_id TEXT NOT NULL,
+                lot_code TEXT NOT NULL,
+                title TEXT,
+                current_bid REAL,
+                msrp REAL,
+                bids_count INTEGER,
+                image_url TEXT,
+                end_datetime TEXT,
+                condition TEXT,
+                search_term TEXT,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                PRIMARY KEY (auction_id, lot_code)
+            );
+            CREATE INDEX IF NOT EXISTS items_search_term ON items (search_term, end_datetime);
+            CREATE INDEX IF NOT EXISTS items_end_datetime ON items (end_datetime);
+            CREATE INDEX IF NOT EXISTS items_current_bid ON items (current_bid);
+            CREATE TABLE IF NOT EXISTS item_terms (
+                auction_id TEXT NOT NULL,
+                lot_code TEXT NOT NULL,
+                search_term TEXT NOT NULL,
+                PRIMARY KEY (auction_id, lot_code, search_term)
+            );
+            CREATE INDEX IF NOT EXISTS item_terms_search_term ON item_terms (search_term);
+            CREATE TABLE IF NOT EXISTS bid_snapshots (
+                auction_id TEXT NOT NULL,
+                lot_code TEXT NOT NULL,
+                observed_at REAL NOT NULL,
+                current_bid REAL,
+                bids_count INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS bid_snapshots_item ON bid_snapshots (auction_id, lot_code, observed_at);
+        """)
+        if not has_terms:
+            # Stores created before item_terms existed know one term per item
+            self._conn.execute(
+                "INSERT OR IGNORE INTO item_terms SELECT auction_id, lot_code, search_term "
+                "FROM items WHERE search_term IS NOT NULL"
+            )
+        self._conn.commit()
+
+    def upsert(self, items: Iterable[BidFTAItem], observed_at: Optional[float] = None) -> int:
+        """
+        Insert or update scraped items
+
+        Args:
+            items: Scraped items
+            observed_at: Snapshot timestamp (default: now)
+
+        Returns:
+            Number of items written
+        """
+        rows = (
+            (item.auction_id, item.lot_code, item.title, _to_float(item.current_bid),
+             _to_float(item.msrp), item.bids_count, item.image_url,
+             _to_utc_text(item.end_datetime), item.condition, item.search_term)
+            for item in items
+        )
+        return self._write(rows, observed_at)
+
+    def upsert_frame(self, df: pd.DataFrame, observed_at: Optional[float] = None) -> int:
+        """
+        Insert or update the rows of a DataFrame returned by scrape_search_terms
+
+        With dedupe_terms results, every term in the search_terms column is
+        recorded for the item.
+
+        Args:
+            df: Result DataFrame; prices may be numeric or currency strings
+            observed_at: Snapshot timestamp (default: now)
+
+        Returns:
+            Number of items written
+        """
+        if df.empty:
+            return 0
+        columns = {}
+        for column in _ITEM_COLUMNS:
+            values = df[column] if column in df.columns else pd.Series([None] * len(df), index=df.index)
+            if column in ('current_bid', 'msrp'):
+                values = parse_currency(values)
+            elif column == 'end_datetime':
+                values = to_utc_series(values).dt.strftime('%Y-%m-%d %H:%M:%S')
+            columns[column] = values.astype(object).where(values.notna(), None).tolist()
+        rows = zip(*(columns[column] for column in _ITEM_COLUMNS))
+        term_lists = df['search_terms'].tolist() if 'search_terms' in df.columns else None
+        return self._write(rows, observed_at, term_lists)
+
+    def _write(self,
+               rows: Iterable[Tuple],
+               observed_at: Optional[float],
+               term_lists: Optional[Iterable[List[str]]] = None) -> int:
+        """Write item rows in batched transactions, with every term that found each row"""
+        now = time.time() if observed_at is None else observed_at
+        written = skipped = 0
+        batch: List[Tuple] = []
+        terms: List[Tuple] = []
+        if term_lists is None:
+            term_lists = itertools.repeat(None)
+        for row, term_list in zip(rows, term_lists):
+            if not row[0] and not row[1]:
+                # Without auction_id or lot_code there is nothing to key on
+                skipped += 1
+                continue
+            row = (row[0] or '', row[1] or '') + tuple(row[2:])
+            batch.append(row)
+            for term in (term_list if term_list is not None else [row[_TERM]]):
+                if term is not None:
+                    terms.append((row[0], row[1], term))
+            if len(batch) >= self.batch_size:
+                written += self._write_batch(batch, terms, now)
+                batch, terms = [], []
+        if batch:
+            written += self._write_batch(batch, terms, now)
+        if skipped:
+            logger.debug(f"Skipped {skipped} items without auction_id or lot_code")
+        return written
+
+    def _write_batch(self, batch: List[Tuple], terms: List[Tuple], now: float) -> int:
+        # Keep the last row per key so a repeated item is snapshotted once
+        batch = list({(row[0], row[1]): row for row in batch}.values())
+        snapshots = [
+            (row[0], row[1], now, row[3], row[5], row[0], row[1], row[3], row[5])
+            for row in batch
+        ]
+        upserts = [row + (now, now) for row in batch]
+        with self._lock, self._conn:
+            self._conn.executemany(_SNAPSHOT, snapshots)
+            self._conn.executemany(_UPSERT, upserts)
+            self._conn.executemany(_ADD_TERM, terms)
+        return len(batch)
+
+    def query(self,
+              search_term: Optional[str] = None,
+              ending_before: Optional[TimeLike] = None,
+              ending_after: Optional[TimeLike] = None,
+              min_price: Optional[float] = None,
+              max_price: Optional[float] = None,
+              limit: Optional[int] = None) -> pd.DataFrame:
+        """
+        Look up stored items, soonest ending first
+
+        Args:
+            search_term: Only items found by this search term, in this or any
+                earlier run
+            ending_before: Only items ending before this time (naive times are UTC)
+            ending_after: Only items ending after this time (naive times are UTC)
+            min_price: Minimum current bid
+            max_price: Maximum current bid
+            limit: Maximum number of rows
+
+        Returns:
+            DataFrame of matching items with a parsed end_datetime column
+        """
+        clauses, params = [], []
+        ending_before, ending_after = (
+            _parse_bound(name, value)
+            for name, value in (('ending_before', ending_before), ('ending_after', ending_after))
+        )
+        sql = "SELECT * FROM items"
+        if search_term is not None:
+            sql = "SELECT items.* FROM items JOIN item_terms USING (auction_id, lot_code)"
+            clauses.append("item_terms.search_term = ?")
+            params.append(search_term)
+        if ending_before is not None:
+            clauses.append("end_datetime < ?")
+            params.append(ending_before)
+        if ending_after is not None:
+            clauses.append("end_datetime > ?")
+            params.append(ending_after)
+        if min_price is not None:
+            clauses.append("current_bid >= ?")
+            params.append(min_price)
+        if max_price is not None:
+            clauses.append("current_bid <= ?")
+            params.append(max_price)
+
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY end_datetime"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            df = pd.read_sql_query(sql, self._conn, params=params)
+        df['end_datetime'] = pd.to_datetime(df['end_datetime'], utc=True)
+        return df
+
+    def bid_history(self, auction_id: str, lot_code: str) -> pd.DataFrame:
+        """
+        Bid snapshots recorded for one item, oldest first
+
+        Returns:
+            DataFrame with observed_at (UTC datetime), current_bid and bids_count
+        """
+        with self._lock:
+            df = pd.read_sql_query(
+                "SELECT observed_at, current_bid, bids_count FROM bid_snapshots "
+                "WHERE auction_id = ? AND lot_code = ? ORDER BY observed_at",
+                self._conn, params=(auction_id, lot_code)
+            )
+        df['observed_at'] = pd.to_datetime(df['observed_at'], unit='s', utc=True)
+        return df
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the underlying database"""
+        self._conn.close()
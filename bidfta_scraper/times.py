@@ -0,0 +1,66 @@
+"""
+End time parsing shared by the delta engine, store and watch scheduler
+"""
+
+from datetime import datetime
+from typing import Optional
+
+import pandas as pd
+
+_EPOCH = pd.Timestamp(0, tz='UTC')
+
+# format='ISO8601' is new in pandas 2.0; older releases quietly return NaT for it
+_HAS_ISO8601_FORMAT = int(pd.__version__.split('.')[0]) >= 2
+
+
+def to_utc(value) -> Optional[pd.Timestamp]:
+    """
+    Parse an end time as a UTC timestamp
+
+    Matches to_utc_series: times without an offset are taken as UTC and a
+    trailing 'Z' is accepted.
+
+    Args:
+        value: ISO 8601 string, datetime or pd.Timestamp
+
+    Returns:
+        Timezone-aware UTC timestamp, or None if missing or unparseable
+    """
+    if not isinstance(value, (str, datetime)) or value == '':
+        return None
+    try:
+        timestamp = pd.Timestamp(value)
+    except (TypeError, ValueError):
+        return None
+    if timestamp is pd.NaT:
+        return None
+    if timestamp.tzinfo is None:
+        return timestamp.tz_localize('UTC')
+    return timestamp.tz_convert('UTC')
+
+
+def to_epoch_seconds(value) -> Optional[float]:
+    """Seconds since the epoch for an end time, or None if unknown"""
+    timestamp = to_utc(value)
+    if timestamp is None:
+        return None
+    return (timestamp - _EPOCH).total_seconds()
+
+
+def to_utc_series(values: pd.Series) -> pd.Series:
+    """
+    Parse a column of end times the same way as to_utc
+
+    Every value is parsed as ISO 8601 on its own, so a column mixing 'Z',
+    offset and naive strings does not lose the values that differ from the
+    first one.
+
+    Args:
+        values: Strings or datetimes
+
+    Returns:
+        datetime64[UTC] Series with NaT for missing or unparseable values
+    """
+    if _HAS_ISO8601_FORMAT:
+        return pd.to_datetime(values, errors='coerce', utc=True, format='ISO8601')
+    return pd.to_datetime(pd.Series(values).map(to_utc), utc=True)
@@ -0,0 +1,211 @@
+"""
+Watch mode: keep polling search terms, more often as their items near their end
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from typing import AsyncIterator, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+import logging
+
+import aiohttp
+
+from .async_scraper import AsyncBidFTAScraper
+from .delta import DeltaEngine, ItemEvent
+from .items import BidFTAItem, unique_items
+from .metrics import ITEMS, RunMetrics
+from .retry import ScrapeReport
+from .store import ItemStore
+from .times import to_epoch_seconds
+
+logger = logging.getLogger(__name__)
+
+# (ending within seconds, poll every seconds); the narrowest matching window wins
+DEFAULT_TIERS: Tuple[Tuple[float, float], ...] = (
+    (15 * 60, 60),
+    (60 * 60, 5 * 60),
+    (6 * 60 * 60, 30 * 60),
+)
+
+
+class WatchResult(NamedTuple):
+    """The outcome of one poll of a search term"""
+    search_term: str
+    items: List[BidFTAItem]
+    events: List[ItemEvent]
+    next_poll: float
+    failed: bool = False
+
+
+def seconds_left(item: BidFTAItem, now: float) -> Optional[float]:
+    """
+    Seconds until an item's auction ends
+
+    Uses end_datetime when it parses, otherwise time_remaining as reported
+    when the item was scraped.
+
+    Args:
+        item: Scraped item
+        now: Current time in seconds since the epoch
+
+    Returns:
+        Seconds left (negative once ended), or None if unknown
+    """
+    end_time = to_epoch_seconds(item.end_datetime)
+    if end_time is not None:
+        return end_time - now
+    try:
+        return float(item.time_remaining)
+    except (TypeError, ValueError):
+        return None
+
+
+class WatchScheduler:
+    """
+    Long-running poller that spends requests where prices are moving
+
+    Every search term sits in a priority queue ordered by its next due time.
+    After each poll a term is rescheduled according to the soonest-ending
+    open item it returned: terms with items ending within minutes are polled
+    every minute, terms whose items end in days only rarely. Everything runs
+    on one event loop with one shared HTTP session; the scraper's rate limit
+    and concurrency settings still apply.
+    """
+
+    def __init__(self,
+                 scraper: AsyncBidFTAScraper,
+                 search_terms: Iterable[str],
+                 tiers: Sequence[Tuple[float, float]] = DEFAULT_TIERS,
+                 idle_interval: float = 2 * 60 * 60,
+                 retry_interval: float = 60,
+                 delta: Optional[DeltaEngine] = None,
+                 store: Optional[ItemStore] = None):
+        """
+        Initialize the scheduler
+
+        Args:
+            scraper: Scraper used for every poll
+            search_terms: Terms to watch
+            tiers: (ending within seconds, poll every seconds) pairs; the
+                narrowest window containing the soonest end applies
+            idle_interval: Poll interval for terms with nothing ending within any tier
+            retry_interval: Poll interval after a poll in which a request failed
+            delta: DeltaEngine fed with every poll; its events are returned
+                with each result (default: no change detection)
+            store: ItemStore every poll is upserted into (default: no store)
+        """
+        self.scraper = scraper
+        self.search_terms = list(dict.fromkeys(search_terms))
+        self.tiers = sorted(tiers)
+        self.idle_interval = idle_interval
+        self.retry_interval = retry_interval
+        self.delta = delta
+        self.store = store
+        self._queue: List[Tuple[float, int, str]] = []
+        self._counter = itertools.count()
+
+    def interval_for(self, items: Sequence[BidFTAItem], now: Optional[float] = None) -> float:
+        """
+        Poll interval for a term given the items it returned
+
+        Args:
+            items: Items from the latest poll of the term
+            now: Current time in seconds since the epoch (default: time.time())
+
+        Returns:
+            Seconds until the term should be polled again
+        """
+        now = time.time() if now is None else now
+        soonest = math.inf
+        for item in items:
+            left = seconds_left(item, now)
+            if left is not None and 0 < left < soonest:
+                soonest = left
+        for ending_within, interval in self.tiers:
+            if soonest <= ending_within:
+                return interval
+        return self.idle_interval
+
+    def schedule(self, search_term: str, delay: float = 0.0) -> None:
+        """Queue a term to be polled after `delay` seconds"""
+        heapq.heappush(self._queue, (time.monotonic() + delay, next(self._counter), search_term))
+
+    async def poll(self, session: aiohttp.ClientSession, search_term: str) -> WatchResult:
+        """
+        Poll one term at every location, feed the delta engine and store, and reschedule it
+
+        If any page of the term failed permanently, the items are returned but
+        the delta engine and store are left untouched, since a partial result
+        would report missing items as removed, and the term is polled again
+        after retry_interval.
+        """
+        report = self.scraper.last_report
+        failures_before = len(report.failures)
+        results = await asyncio.gather(*[
+            self.scraper.scrape_search_term(session, search_term, location_id=location_id)
+            for location_id in self.scraper.location_ids
+        ])
+        items = unique_items(itertools.chain.from_iterable(results))
+        self.scraper.last_metrics.increment(ITEMS, len(items))
+
+        if any(failure.search_term == search_term for failure in report.failures[failures_before:]):
+            self.schedule(search_term, self.retry_interval)
+            logger.warning(f"Poll of '{search_term}' failed, retrying in {self.retry_interval:.0f}s")
+            return WatchResult(search_term, items, [], self.retry_interval, failed=True)
+
+        events = self.delta.update(items, search_terms=[search_term]) if self.delta is not None else []
+        if self.store is not None:
+            self.store.upsert(items)
+        interval = self.interval_for(items)
+        self.schedule(search_term, interval)
+        logger.info(f"Polled '{search_term}': {len(items)} items, {len(events)} changes, next in {interval:.0f}s")
+        return WatchResult(search_term, items, events, interval)
+
+    async def watch(self, max_polls: Optional[int] = None) -> AsyncIterator[WatchResult]:
+        """
+        Poll terms as they fall due, forever or until max_polls polls
+
+        Terms that are due at the same time are polled concurrently. Stop
+        early by breaking out of the loop.
+
+        Args:
+            max_polls: Stop after this many polls (default: run until cancelled)
+
+        Yields:
+            A WatchResult for every poll, in completion order
+        """
+        self.scraper.last_report = ScrapeReport()
+        self.scraper.last_metrics = RunMetrics(self.scraper.metrics)
+        self._queue = []
+        for term in self.search_terms:
+            self.schedule(term)
+
+        polls = 0
+        async with self.scraper.session_scope() as session:
+            while self._queue and (max_polls is None or polls < max_polls):
+                delay = self._queue[0][0] - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                now = time.monotonic()
+                due = []
+                while self._queue and self._queue[0][0] <= now:
+                    due.append(heapq.heappop(self._queue)[2])
+                if max_polls is not None:
+                    # Put back what this run will not get to
+                    for term in due[max_polls - polls:]:
+                        self.schedule(term)
+                    due = due[:max_polls - polls]
+
+                tasks = [asyncio.ensure_future(self.poll(session, term)) for term in due]
+                try:
+                    for result in asyncio.as_completed(tasks):
+                        polls += 1
+                        yield await result
+                finally:
+                    # The caller may stop iterating while polls are in flight
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
@@ -11,7 +11,7 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/GrahamKowalski/BidFTAScraper",
-    packages=find_packages(exclude=["tests*"]),
+    packages=find_packages(exclude=["tests*", "benchmarks*"]),
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Intended Audience :: Developers",
@@ -31,6 +31,9 @@ setup(
         "pandas>=1.2.0"
     ],
     extras_require={
+        "parquet": [
+            "pyarrow>=10.0"
+        ],
         "dev": [
             "pytest>=6.0",
             "pytest-cov>=2.0",
@@ -0,0 +1,206 @@
+"""
+Tests for the async BidFTA Scraper
+"""
+
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from benchmarks.replay_server import ReplayServer
+from bidfta_scraper import AsyncBidFTAScraper
+from bidfta_scraper.cache import PageResponse
+from bidfta_scraper.session import USER_AGENT
+
+
+def make_page(titles, **metadata):
+    """Build a results page whose __NEXT_DATA__ holds the given item titles"""
+    initial_data = {"items": [{"title": title, "lotCode": title} for title in titles]}
+    initial_data.update(metadata)
+    payload = json.dumps({"props": {"pageProps": {"initialData": initial_data}}})
+    return f'<html><script id="__NEXT_DATA__" type="application/json">{payload}</script></html>'.encode()
+
+def page_id_of(url):
+    """Return the pageId query value of a search URL"""
+    return int(url.split("pageId=")[1].split("&")[0])
+
+def test_scrape_search_term_fans_out_pages():
+    """Test that remaining pages are fetched and stop at the first empty page"""
+    scraper = AsyncBidFTAScraper(request_delay=0)
+    pages = {
+        1: make_page(["a"], totalPages=5),
+        2: make_page(["b"]),
+        3: make_page(["c"]),
+        4: make_page([]),
+        5: make_page(["stale"]),
+    }
+
+    async def fake_fetch_response(session, url, *args):
+        return PageResponse(pages[page_id_of(url)], 200)
+
+    with patch.object(scraper, 'fetch_response', side_effect=fake_fetch_response):
+        items = asyncio.run(scraper.scrape_search_term(None, "aquarium"))
+
+    assert [item.title for item in items] == ["a", "b", "c"]
+    assert scraper.page_counts == {"aquarium": 5}
+
+def test_on_page_skips_pages_past_the_end():
+    """Test that pages finishing before an earlier empty page are not streamed"""
+    scraper = AsyncBidFTAScraper(request_delay=0)
+    pages = {1: make_page(["a"], totalPages=4), 2: make_page(["b"]), 3: make_page([]), 4: make_page(["stale"])}
+    delays = {2: 0.05, 3: 0.03, 4: 0}
+    streamed = []
+
+    async def fake_fetch_response(session, url, *args):
+        page_id = page_id_of(url)
+        await asyncio.sleep(delays.get(page_id, 0))
+        return PageResponse(pages[page_id], 200)
+
+    async def on_page(items):
+        streamed.extend(item.title for item in items)
+
+    with patch.object(scraper, 'fetch_response', side_effect=fake_fetch_response):
+        items = asyncio.run(scraper.scrape_search_term(None, "aquarium", on_page=on_page))
+
+    assert [item.title for item in items] == ["a", "b"]
+    assert streamed == ["a", "b"]
+
+def test_scrape_search_term_single_page():
+    """Test that a single page result makes exactly one request"""
+    scraper = AsyncBidFTAScraper(request_delay=0)
+    calls = []
+
+    async def fake_fetch_response(session, url, *args):
+        calls.append(url)
+        return PageResponse(make_page(["a", "b"]), 200)
+
+    with patch.object(scraper, 'fetch_response', side_effect=fake_fetch_response):
+        items = asyncio.run(scraper.scrape_search_term(None, "aquarium"))
+
+    assert len(items) == 2
+    assert len(calls) == 1
+
+def test_parse_executor():
+    """Test parsing pages on an executor instead of the event loop"""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        scraper = AsyncBidFTAScraper(request_delay=0, parse_executor=executor)
+
+        async def fake_fetch_response(session, url, *args):
+            body = make_page(["a", "b"], totalPages=2) if page_id_of(url) == 1 else make_page(["c"])
+            return PageResponse(body, 200)
+
+        with patch.object(scraper, 'fetch_response', side_effect=fake_fetch_response):
+            items = asyncio.run(scraper.scrape_search_term(None, "aquarium"))
+
+    assert [item.title for item in items] == ["a", "b", "c"]
+    assert all(item.search_term == "aquarium" for item in items)
+
+def test_iter_items_streams_pages():
+    """Test yielding items and per-page batches for many terms"""
+    scraper = AsyncBidFTAScraper(request_delay=0, max_concurrent_requests=2)
+
+    async def fake_fetch_response(session, url, *args):
+        term = url.split("itemSearchKeywords=")[1].split("&")[0]
+        page_id = page_id_of(url)
+        return PageResponse(make_page([f"{term}-{page_id}"], totalPages=2), 200)
+
+    async def collect(**kwargs):
+        return [result async for result in scraper.iter_items((f"t{i}" for i in range(10)), **kwargs)]
+
+    with patch.object(scraper, 'fetch_response', side_effect=fake_fetch_response):
+        items = asyncio.run(collect(buffer_size=1))
+        batches = asyncio.run(collect(batches=True))
+
+    assert sorted(item.title for item in items) == sorted(f"t{i}-{p}" for i in range(10) for p in (1, 2))
+    assert len(batches) == 20
+    assert all(len(batch) == 1 for batch in batches)
+
+def test_iter_items_stops_early():
+    """Test that breaking out of the iterator cancels outstanding work"""
+    scraper = AsyncBidFTAScraper(request_delay=0)
+
+    async def fake_fetch_response(session, url, *args):
+        return PageResponse(make_page(["a", "b"]), 200)
+
+    async def first_item():
+        items = scraper.iter_items(["aquarium"] * 50, buffer_size=1)
+        async for item in items:
+            await items.aclose()
+            return item
+
+    with patch.object(scraper, 'fetch_response', side_effect=fake_fetch_response):
+        assert asyncio.run(asyncio.wait_for(first_item(), 2)).title == "a"
+
+def test_iter_items_closes_with_full_buffer():
+    """Test that closing or breaking out while the buffer is full does not hang"""
+    scraper = AsyncBidFTAScraper(request_delay=0)
+
+    async def fake_fetch_response(session, url, *args):
+        return PageResponse(make_page(["a", "b"]), 200)
+
+    async def close_when_full():
+        items = scraper.iter_items(["aquarium"] * 50, batches=True, buffer_size=1)
+        await items.__anext__()
+        # Let the workers fill the buffer and block on it
+        await asyncio.sleep(0.1)
+        await asyncio.wait_for(items.aclose(), 2)
+
+    async def break_when_full():
+        async for _ in scraper.iter_items(["aquarium"] * 50, batches=True, buffer_size=1):
+            await asyncio.sleep(0.1)
+            break
+
+    with patch.object(scraper, 'fetch_response', side_effect=fake_fetch_response):
+        asyncio.run(close_when_full())
+        # A break leaves the generator for asyncio.run to close on shutdown
+        thread = threading.Thread(target=asyncio.run, args=(break_when_full(),), daemon=True)
+        thread.start()
+        thread.join(5)
+    assert not thread.is_alive()
+
+def test_scrape_multiple_locations():
+    """Test fanning out over locations on one session with deduplication"""
+    scraper = AsyncBidFTAScraper(location_id="616,700", request_delay=0)
+    pages = {"616": make_page(["a", "shared"]), "700": make_page(["shared", "b"])}
+
+    async def fake_fetch_response(session, url, *args):
+        return PageResponse(pages[url.split("locations=")[1]], 200)
+
+    async def stream():
+        return [(item.title, item.location_id) async for item in scraper.iter_items(["aquarium"])]
+
+    with patch.object(scraper, 'fetch_response', side_effect=fake_fetch_response):
+        df = asyncio.run(scraper.scrape_search_terms(["aquarium"]))
+        streamed = asyncio.run(stream())
+
+    assert df['title'].tolist() == ["a", "shared", "b"]
+    assert df['location_id'].tolist() == ["616", "616", "700"]
+    # Streamed pages arrive in completion order, so either copy of "shared" may win
+    assert sorted(title for title, _ in streamed) == ["a", "b", "shared"]
+
+def test_context_manager_reuses_session():
+    """Test that calls inside the context manager share one pooled session"""
+    async def run():
+        server = ReplayServer(items_per_page=3, total_pages=2)
+        async with server as url:
+            async with AsyncBidFTAScraper(base_url=url, request_delay=0, max_concurrent_requests=1) as scraper:
+                session = scraper.session
+                for _ in range(3):
+                    await scraper.scrape_search_terms(["tank"])
+                assert scraper.session is session
+                assert session.connector.limit_per_host == 1
+            assert scraper.session is None and session.closed
+
+            # Without the context manager every call opens its own session
+            scraper = AsyncBidFTAScraper(base_url=url, request_delay=0, max_concurrent_requests=1)
+            reused = len(server.connections)
+            await scraper.scrape_search_terms(["tank"])
+            await scraper.scrape_search_terms(["tank"])
+        return server, reused
+
+    server, reused = asyncio.run(run())
+    assert server.requests == 10
+    assert reused == 1
+    assert len(server.connections) == 3
+    assert server.user_agents == {USER_AGENT}
@@ -0,0 +1,23 @@
+"""
+Tests for the stage benchmark harness
+"""
+
+import json
+
+from benchmarks.bench_stages import compare, run_stages
+
+def test_run_stages_is_json_serializable():
+    """Test that a tiny run measures every stage and round-trips through JSON"""
+    results = json.loads(json.dumps(run_stages(pages=2, items=3, repeat=1)))
+    assert {'extract', 'json_loads', 'extract_items_from_json', 'item_build', 'to_dict',
+            'dataframe_from_rows', 'end_to_end_async'} <= set(results['stages'])
+    assert results['stages']['item_build']['units'] == 6
+    assert results['meta']['pages'] == 2
+
+def test_compare_reports_ratios_and_new_stages():
+    """Test the comparison against a baseline run"""
+    current = {'stages': {'extract': {'median': 2.0}, 'to_dict': {'median': 1.0}}}
+    baseline = {'stages': {'extract': {'median': 1.0}}}
+    lines = compare(current, baseline)
+    assert "2.00x" in lines[0]
+    assert "(new)" in lines[1]
@@ -0,0 +1,118 @@
+"""
+Tests for the on-disk response cache
+"""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+from bidfta_scraper import AsyncBidFTAScraper, BidFTAScraper, ResponseCache
+from bidfta_scraper.cache import PageResponse
+
+PAGE = (
+    '<html><script id="__NEXT_DATA__" type="application/json">'
+    + json.dumps({"props": {"pageProps": {"initialData": {"items": [{"title": "Tank", "lotCode": "L1"}]}}}})
+    + '</script></html>'
+).encode()
+
+def test_set_and_get(tmp_path):
+    """Test storing a body with its parsed rows and reading both back"""
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    cache.set("http://a", b"body", [("Tank", 1.5)], 3)
+
+    entry = cache.get("http://a")
+    assert entry.body == b"body"
+    assert entry.rows == [("Tank", 1.5)]
+    assert entry.page_count == 3
+    assert cache.get("http://missing") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_persists_across_instances(tmp_path):
+    """Test that entries survive reopening the cache file"""
+    path = str(tmp_path / "cache.sqlite")
+    ResponseCache(path).set("http://a", b"body")
+    assert ResponseCache(path).get("http://a").body == b"body"
+
+def test_ttl_expiry():
+    """Test that expired entries are not returned"""
+    cache = ResponseCache(":memory:", ttl=10)
+    with patch('bidfta_scraper.cache.time.time', return_value=1000.0):
+        cache.set("http://a", b"body")
+    with patch('bidfta_scraper.cache.time.time', return_value=1011.0):
+        assert cache.get("http://a") is None
+
+def test_lru_eviction():
+    """Test that the least recently used entries are evicted past max_bytes"""
+    cache = ResponseCache(":memory:", max_bytes=25)
+    with patch('bidfta_scraper.cache.time.time') as now:
+        for second, url in enumerate(["http://a", "http://b"]):
+            now.return_value = 1000.0 + second
+            cache.set(url, b"x" * 10)
+        now.return_value = 1002.0
+        cache.get("http://a")
+        now.return_value = 1003.0
+        cache.set("http://c", b"x" * 10)
+
+        assert cache.get("http://a") is not None
+        assert cache.get("http://b") is None
+        assert len(cache) == 2
+
+def test_scraper_cache_hit_skips_network():
+    """Test that a second scrape is served from the cache"""
+    scraper = BidFTAScraper(request_delay=0, cache=ResponseCache(":memory:"))
+    with patch.object(scraper, 'fetch_response', return_value=PageResponse(PAGE, 200)) as mock_fetch:
+        first = scraper.scrape_search_term("tank")
+        second = scraper.scrape_search_term("tank")
+
+    assert mock_fetch.call_count == 1
+    assert [item.to_dict() for item in first] == [item.to_dict() for item in second]
+
+def test_stale_entry_without_validators_is_dropped():
+    """Test that expired entries are only kept when they can be revalidated"""
+    cache = ResponseCache(":memory:", ttl=0)
+    cache.set("http://plain", b"body")
+    cache.set("http://tagged", b"body", etag='"v1"')
+
+    assert cache.get("http://plain", allow_stale=True) is None
+    entry = cache.get("http://tagged", allow_stale=True)
+    assert not entry.fresh
+    assert entry.conditional_headers() == {"If-None-Match": '"v1"'}
+
+def test_sync_not_modified_reuses_items():
+    """Test that a 304 reuses the cached items and is counted"""
+    scraper = BidFTAScraper(request_delay=0, cache=ResponseCache(":memory:", ttl=0))
+    responses = [
+        PageResponse(PAGE, 200, '"v1"', "Wed, 21 Oct 2015 07:28:00 GMT"),
+        PageResponse(None, 304),
+    ]
+    with patch.object(scraper, 'fetch_response', side_effect=responses) as mock_fetch:
+        scraper.scrape_search_term("tank")
+        items = scraper.scrape_search_term("tank")
+
+    assert [item.title for item in items] == ["Tank"]
+    assert mock_fetch.call_args.args[3] == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT",
+    }
+    assert scraper.cache.stats()["not_modified"] == 1
+
+def test_async_not_modified_reuses_items():
+    """Test conditional requests in the async scraper"""
+    scraper = AsyncBidFTAScraper(request_delay=0, cache=ResponseCache(":memory:", ttl=0))
+    responses = [PageResponse(PAGE, 200, '"v1"'), PageResponse(None, 304)]
+    sent_headers = []
+
+    async def fake_fetch_response(session, url, search_term, page_id, headers):
+        sent_headers.append(headers)
+        return responses.pop(0)
+
+    async def scrape_twice():
+        await scraper.scrape_search_term(None, "tank")
+        return await scraper.scrape_search_term(None, "tank")
+
+    with patch.object(scraper, 'fetch_response', side_effect=fake_fetch_response):
+        items = asyncio.run(scrape_twice())
+
+    assert [item.title for item in items] == ["Tank"]
+    assert sent_headers == [None, {"If-None-Match": '"v1"'}]
+    assert scraper.cache.not_modified == 1
@@ -0,0 +1,82 @@
+"""
+Tests for the adaptive concurrency controller
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from bidfta_scraper import AsyncBidFTAScraper
+from bidfta_scraper.concurrency import AdaptiveConcurrencyController, parse_retry_after
+
+def test_parse_retry_after():
+    """Test parsing both Retry-After formats"""
+    assert parse_retry_after("12") == 12.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+def test_additive_increase():
+    """Test that flat latency grows the window by one per window of successes"""
+    controller = AdaptiveConcurrencyController(initial=2, max_limit=4)
+    for _ in range(2):
+        controller.record(0.1, 200)
+    assert controller.window == 3
+    for _ in range(100):
+        controller.record(0.1, 200)
+    assert controller.window == 4
+
+def test_backoff_on_429_with_cooldown():
+    """Test that a burst of 429s halves the window once and honours Retry-After"""
+    controller = AdaptiveConcurrencyController(initial=8)
+    with patch('bidfta_scraper.concurrency.time.monotonic', return_value=50.0):
+        controller.record(0.1, 429, retry_after=3)
+        controller.record(0.1, 503)
+    assert controller.window == 4
+    assert controller._paused_until == 53.0
+
+def test_backoff_on_rising_latency():
+    """Test that p95 latency above the baseline shrinks the window"""
+    controller = AdaptiveConcurrencyController(initial=10, max_limit=10, sample_size=5)
+    for _ in range(5):
+        controller.record(0.1, 200)
+    for _ in range(5):
+        controller.record(1.0, 200)
+    assert controller.window == 5
+
+def test_limits_in_flight():
+    """Test that no more than window requests run at once"""
+    controller = AdaptiveConcurrencyController(initial=2, max_limit=2)
+    peak = 0
+
+    async def request():
+        nonlocal peak
+        async with controller:
+            peak = max(peak, controller.in_flight)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        tasks = [asyncio.ensure_future(request()) for _ in range(6)]
+        await asyncio.sleep(0)
+        tasks[-1].cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    asyncio.run(asyncio.wait_for(run(), 2))
+    assert peak == 2
+    assert controller.in_flight == 0
+
+def test_scraper_uses_controller():
+    """Test plugging the controller into the async scraper"""
+    scraper = AsyncBidFTAScraper(max_concurrent_requests=3, adaptive_concurrency=True)
+    assert scraper.semaphore is scraper.concurrency_controller
+    assert scraper.concurrency_controller.window == 3
+    assert scraper.concurrency_controller.max_limit == 64
+    assert scraper.rate_limiter.rate == AsyncBidFTAScraper(max_concurrent_requests=3).rate_limiter.rate == 6
+    assert scraper.limit_per_host == 64
+    capped = AsyncBidFTAScraper(max_concurrent_requests=3, adaptive_concurrency=True, max_adaptive_concurrency=12)
+    assert (capped.concurrency_controller.window, capped.concurrency_controller.max_limit) == (3, 12)
+    assert capped.limit_per_host == 12
+    assert AsyncBidFTAScraper().concurrency_controller is None
+    with pytest.raises(ValueError):
+        AdaptiveConcurrencyController(initial=0)
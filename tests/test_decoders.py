@@ -0,0 +1,66 @@
+"""
+Tests for the __NEXT_DATA__ decoders
+"""
+
+import json
+
+import pytest
+
+from bidfta_scraper.decoders import decode_items, decode_items_or_full, get_decoder, PartialDecodeError
+
+DOCUMENT = {
+    "props": {
+        "pageProps": {
+            "locale": {"greeting": "hello \"initialData\" }"},
+            "initialData": {
+                "filters": [{"name": "a]b{"}, {"nested": [1, [2, 3]]}],
+                "items": [{"title": "Test", "lotCode": "A1", "currentBid": 1.5}],
+                "totalPages": 3,
+                "query": None,
+            },
+        },
+    },
+    "buildId": "abc",
+}
+
+def test_decode_items_keeps_items_and_metadata():
+    """Test that only the items subtree and scalar metadata are decoded"""
+    result = decode_items(json.dumps(DOCUMENT, indent=2).encode())
+    initial_data = result["props"]["pageProps"]["initialData"]
+
+    assert initial_data["items"] == DOCUMENT["props"]["pageProps"]["initialData"]["items"]
+    assert initial_data["totalPages"] == 3
+    assert initial_data["query"] is None
+    assert "filters" not in initial_data
+    assert "locale" not in result["props"]["pageProps"]
+
+def test_decode_items_rejects_unexpected_structure():
+    """Test that unexpected structure raises rather than guessing"""
+    with pytest.raises(PartialDecodeError):
+        decode_items('{"props": {"pageProps": {"initialData": null}}}')
+
+def test_decode_items_ignores_nested_keys():
+    """Test that an initialData key nested deeper than pageProps is not matched"""
+    document = {"props": {"pageProps": {
+        "other": {"initialData": {"items": [1]}},
+        "initialData": {"items": [{"title": "Real"}]},
+    }}}
+    result = decode_items(json.dumps(document))
+    assert result["props"]["pageProps"]["initialData"] == {"items": [{"title": "Real"}]}
+
+    # Only a nested one: fall back to the full decode instead of guessing
+    nested_only = json.dumps({"props": {"pageProps": {"query": {"initialData": {"items": [1]}}}}})
+    with pytest.raises(PartialDecodeError):
+        decode_items(nested_only)
+    assert decode_items_or_full(nested_only) == json.loads(nested_only)
+
+def test_decode_items_or_full_falls_back():
+    """Test falling back to a full decode"""
+    payload = '{"props": {"pageProps": {"initialData": null}}}'
+    assert decode_items_or_full(payload) == json.loads(payload)
+
+def test_get_decoder():
+    """Test resolving decoding modes"""
+    assert get_decoder("full")('{"a": 1}') == {"a": 1}
+    with pytest.raises(ValueError):
+        get_decoder("lazy")
@@ -0,0 +1,114 @@
+"""
+Tests for change detection between polls
+"""
+
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from bidfta_scraper import BidFTAItem, DeltaEngine
+from bidfta_scraper.delta import BID_CHANGED, ENDED, NEW, REMOVED
+from bidfta_scraper.frames import FrameBuilder
+
+END = "2024-01-20T14:00:00Z"
+BEFORE_END = datetime(2024, 1, 20, 13, tzinfo=timezone.utc).timestamp()
+AFTER_END = datetime(2024, 1, 20, 15, tzinfo=timezone.utc).timestamp()
+
+def make_item(lot_code, bid=5.0, bids=0, term="tank", end=END):
+    return BidFTAItem({
+        "title": f"Item {lot_code}",
+        "currentBid": bid,
+        "bidsCount": bids,
+        "utcEndDateTime": end,
+        "lotCode": lot_code,
+        "auctionId": "A1",
+    }, term)
+
+def kinds(events):
+    return [(event.kind, event.lot_code) for event in events]
+
+def test_new_and_unchanged():
+    """Test that only the first sighting of an item is reported"""
+    engine = DeltaEngine()
+    assert kinds(engine.update([make_item("L1"), make_item("L2")], now=BEFORE_END)) == [(NEW, "L1"), (NEW, "L2")]
+    assert engine.update([make_item("L1"), make_item("L2")], now=BEFORE_END) == []
+    assert len(engine) == 2
+
+def test_bid_changed():
+    """Test that bid and bid count changes carry the previous bid"""
+    engine = DeltaEngine()
+    engine.update([make_item("L1", bid=5.0)], now=BEFORE_END)
+    events = engine.update([make_item("L1", bid=7.5, bids=1)], now=BEFORE_END)
+    assert kinds(events) == [(BID_CHANGED, "L1")]
+    assert (events[0].previous_bid, events[0].current_bid, events[0].bids_count) == (5.0, 7.5, 1)
+
+def test_ended_and_removed():
+    """Test that missing items are ended after their end time and removed before it"""
+    engine = DeltaEngine()
+    engine.update([make_item("L1"), make_item("L2", end="2024-01-21T14:00:00Z")], now=BEFORE_END)
+    assert kinds(engine.update([], now=AFTER_END)) == [(ENDED, "L1"), (REMOVED, "L2")]
+    assert len(engine) == 0
+
+def test_ended_while_listed_is_reported_once():
+    """Test that an item past its end time is reported as ended a single time"""
+    engine = DeltaEngine()
+    engine.update([make_item("L1")], now=BEFORE_END)
+    assert kinds(engine.update([make_item("L1")], now=AFTER_END)) == [(ENDED, "L1")]
+    assert engine.update([make_item("L1")], now=AFTER_END) == []
+    assert engine.update([], now=AFTER_END) == []
+
+def test_naive_end_times_are_utc(monkeypatch):
+    """Test that end times without an offset are read as UTC, not local time"""
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    try:
+        engine = DeltaEngine()
+        items = [make_item("L1", end="2024-01-20T14:00:00"), make_item("L2")]
+        engine.update(items, now=BEFORE_END)
+        assert kinds(engine.update(items, now=AFTER_END)) == [(ENDED, "L1"), (ENDED, "L2")]
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+def test_partial_polls_keep_other_terms():
+    """Test that items of terms not polled are neither removed nor forgotten"""
+    engine = DeltaEngine()
+    engine.update([make_item("L1", term="tank"), make_item("L2", term="filter")], now=BEFORE_END)
+    assert engine.update([make_item("L1", term="tank")], search_terms=["tank"], now=BEFORE_END) == []
+    assert kinds(engine.update([], search_terms=["filter"], now=BEFORE_END)) == [(REMOVED, "L2")]
+    assert len(engine) == 1
+
+def test_update_frame_matches_items():
+    """Test DataFrame input, including currency strings"""
+    builder = FrameBuilder()
+    builder.extend([make_item("L1", bid=5.0)])
+    engine = DeltaEngine()
+    engine.update([make_item("L1", bid=5.0)], now=BEFORE_END)
+    assert engine.update_frame(builder.build(), now=BEFORE_END) == []
+
+    builder = FrameBuilder()
+    builder.extend([make_item("L1", bid=1250.0)])
+    df = builder.build().assign(current_bid=["$1,250.00"])
+    events = engine.update_frame(df, now=AFTER_END)
+    assert kinds(events) == [(BID_CHANGED, "L1"), (ENDED, "L1")]
+    assert events[0].current_bid == 1250.0
+
+def test_update_frame_mixed_end_time_forms():
+    """Test that naive and offset strings after a 'Z' one still parse in a DataFrame"""
+    items = [make_item("L1"), make_item("L2", end="2024-01-20T14:00:00"), make_item("L3", end="2024-01-20T09:00:00-05:00")]
+    engine = DeltaEngine()
+    engine.update_frame(pd.DataFrame([item.to_dict() for item in items]), now=BEFORE_END)
+    assert kinds(engine.update_frame(pd.DataFrame([item.to_dict() for item in items]), now=AFTER_END)) == [
+        (ENDED, "L1"), (ENDED, "L2"), (ENDED, "L3")]
+
+def test_persistence(tmp_path):
+    """Test that the snapshot survives a restart"""
+    path = str(tmp_path / "snapshot.json")
+    DeltaEngine(path).update([make_item("L1")], now=BEFORE_END)
+
+    engine = DeltaEngine(path)
+    assert len(engine) == 1
+    assert kinds(engine.update([make_item("L1", bid=6.0), make_item("L2")], now=BEFORE_END)) == [
+        (NEW, "L2"), (BID_CHANGED, "L1")
+    ]
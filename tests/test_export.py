@@ -0,0 +1,82 @@
+"""
+Tests for partitioned Parquet export
+"""
+
+import sys
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from bidfta_scraper import BidFTAItem, read_parquet, write_parquet
+from bidfta_scraper.frames import FrameBuilder, merge_duplicate_terms
+
+def make_frame(*lots, term="tank"):
+    builder = FrameBuilder()
+    builder.extend(
+        BidFTAItem({
+            "title": f"Item {lot}",
+            "currentBid": 12.5,
+            "bidsCount": 2,
+            "utcEndDateTime": "2024-01-20T14:00:00Z",
+            "itemTimeRemaining": "3600",
+            "lotCode": lot,
+        }, term)
+        for lot in lots
+    )
+    return builder.build()
+
+def test_requires_pyarrow(tmp_path):
+    """Test the error raised when pyarrow is not installed"""
+    with patch.dict(sys.modules, {'pyarrow': None}):
+        with pytest.raises(ImportError, match="pip install pyarrow"):
+            write_parquet(make_frame("L1"), str(tmp_path), location_id="616")
+
+def test_roundtrip_keeps_dtypes(tmp_path):
+    """Test that numeric and datetime columns survive a round trip"""
+    pytest.importorskip("pyarrow")
+    df = make_frame("L1", "L2")
+    assert write_parquet(df, str(tmp_path), location_id="616", scrape_date="2024-01-20") == 2
+
+    result = read_parquet(str(tmp_path))
+    assert result['current_bid'].dtype == 'float64'
+    assert result['bids_count'].dtype == 'int64'
+    assert str(result['end_datetime'].dt.tz) == 'UTC'
+    assert result['end_datetime'][0] == pd.Timestamp("2024-01-20T14:00:00Z")
+    assert result['location_id'].tolist() == ["616", "616"]
+    assert (tmp_path / "scrape_date=2024-01-20" / "location_id=616").is_dir()
+
+def test_append_and_partition_filters(tmp_path):
+    """Test that runs append and that reads prune by date and location"""
+    pytest.importorskip("pyarrow")
+    root = str(tmp_path)
+    write_parquet(make_frame("L1"), root, location_id="616", scrape_date="2024-01-20")
+    write_parquet(make_frame("L2"), root, location_id="616", scrape_date="2024-01-20")
+    write_parquet(make_frame("L3"), root, location_id="700", scrape_date="2024-01-21")
+    write_parquet(make_frame("L4").assign(location_id="800"), root, scrape_date="2024-01-22")
+
+    assert len(read_parquet(root)) == 4
+    assert sorted(read_parquet(root, end="2024-01-20")['lot_code']) == ["L1", "L2"]
+    assert read_parquet(root, start="2024-01-21", location_id="700")['lot_code'].tolist() == ["L3"]
+    assert sorted(read_parquet(root, location_id=["700", "800"])['lot_code']) == ["L3", "L4"]
+    assert list(read_parquet(root, columns=["title"]).columns) == ["title"]
+
+def test_append_runs_with_different_columns(tmp_path):
+    """Test reading back runs written with and without dedupe_terms"""
+    pytest.importorskip("pyarrow")
+    root = str(tmp_path)
+    write_parquet(make_frame("L1"), root, location_id="616", scrape_date="2024-01-20")
+    write_parquet(merge_duplicate_terms(make_frame("L2", "L3")), root, location_id="616", scrape_date="2024-01-21")
+    write_parquet(make_frame("L4"), root, location_id="616", scrape_date="2024-01-22")
+
+    result = read_parquet(root).sort_values('lot_code').reset_index(drop=True)
+    assert result['lot_code'].tolist() == ["L1", "L2", "L3", "L4"]
+    assert [None if terms is None else list(terms) for terms in result['search_terms']] == [
+        None, ["tank"], ["tank"], None]
+    assert read_parquet(root, end="2024-01-20")['lot_code'].tolist() == ["L1"]
+
+def test_location_required(tmp_path):
+    """Test that a location is needed when the frame has none"""
+    pytest.importorskip("pyarrow")
+    with pytest.raises(ValueError):
+        write_parquet(make_frame("L1"), str(tmp_path))
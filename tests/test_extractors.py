@@ -0,0 +1,52 @@
+"""
+Tests for the __NEXT_DATA__ extractors
+"""
+
+import json
+
+import pytest
+
+from bidfta_scraper.extractors import (
+    FallbackExtractor, ScanExtractor, SoupExtractor, get_extractor, scan_next_data
+)
+
+PAYLOAD = '{"props": {"pageProps": {"initialData": {"items": []}}}}'
+PAGE = (
+    '<html><head><script>window.__NEXT_DATA__ = null;</script></head><body>'
+    f'<script id="__NEXT_DATA__" type="application/json">{PAYLOAD}</script>'
+    '</body></html>'
+)
+
+def test_scan_bytes_and_text():
+    """Test the scanner on both raw bytes and decoded text"""
+    assert scan_next_data(PAGE) == PAYLOAD
+    assert scan_next_data(PAGE.encode()) == PAYLOAD.encode()
+
+def test_scan_missing_tag():
+    """Test the scanner on a page without a payload"""
+    assert scan_next_data("<html><body>nothing here</body></html>") is None
+    assert scan_next_data('<script id="__NEXT_DATA__">{"truncated"') is None
+
+@pytest.mark.parametrize("name", ["scan", "soup", "auto"])
+def test_extractors_agree(name):
+    """Test that every extractor returns the same JSON"""
+    payload = get_extractor(name).extract(PAGE.encode())
+    assert json.loads(payload) == json.loads(PAYLOAD)
+
+def test_fallback_extractor():
+    """Test falling back to BeautifulSoup when the scanner finds nothing"""
+    class Broken:
+        name = 'broken'
+        def extract(self, html):
+            return None
+
+    extractor = FallbackExtractor(Broken(), SoupExtractor())
+    assert json.loads(extractor.extract(PAGE)) == json.loads(PAYLOAD)
+
+def test_get_extractor():
+    """Test resolving extractors by name or instance"""
+    scanner = ScanExtractor()
+    assert get_extractor(scanner) is scanner
+    assert isinstance(get_extractor(None), FallbackExtractor)
+    with pytest.raises(ValueError):
+        get_extractor("regex")
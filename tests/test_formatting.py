@@ -0,0 +1,64 @@
+"""
+Tests for presentation formatting of result DataFrames
+"""
+
+import math
+from unittest.mock import patch
+
+import pandas as pd
+
+from bidfta_scraper import BidFTAItem, BidFTAScraper, format_results
+from bidfta_scraper.formatting import format_currency, format_currency_columns
+
+def test_format_currency():
+    """Test dollar formatting with separators, negatives and missing values"""
+    values = pd.Series([0, 10.5, 1234.5, 1234567.891, -5, math.nan], index=list("abcdef"))
+    formatted = format_currency(values)
+    assert formatted.tolist() == ["$0.00", "$10.50", "$1,234.50", "$1,234,567.89", "$-5.00", ""]
+    assert formatted.index.tolist() == list("abcdef")
+
+def test_format_currency_columns_leaves_strings():
+    """Test that only numeric currency columns are formatted, on a copy"""
+    df = pd.DataFrame({'current_bid': [12.0], 'msrp': ['$99.00'], 'title': ['Lamp']})
+    formatted = format_currency_columns(df)
+    assert formatted['current_bid'].tolist() == ["$12.00"]
+    assert formatted['msrp'].tolist() == ["$99.00"]
+    assert df['current_bid'].dtype == 'float64'
+
+def make_scraper(**kwargs):
+    scraper = BidFTAScraper(**kwargs)
+    row = BidFTAItem.row_from_data({"title": "Test Item", "currentBid": 1250.0, "msrp": 20.0})
+    return scraper, patch.object(scraper, 'scrape_search_term_rows', return_value=[row])
+
+def test_scrape_keeps_prices_numeric():
+    """Test that scraped prices are floats by default"""
+    scraper, patched = make_scraper()
+    with patched:
+        df = scraper.scrape_search_terms(["term"])
+    assert df['current_bid'].dtype == 'float64'
+    assert df['current_bid'].tolist() == [1250.0]
+    assert df.sort_values('msrp')['msrp'].tolist() == [20.0]
+
+def test_scrape_currency_strings():
+    """Test the compatibility flag for string prices"""
+    scraper, patched = make_scraper(currency_strings=True)
+    with patched:
+        df = scraper.scrape_search_terms(["term"])
+    assert df['current_bid'].tolist() == ["$1,250.00"]
+    assert df['msrp'].tolist() == ["$20.00"]
+
+def test_format_results_formats_prices(tmp_path, capsys):
+    """Test that display and CSV export format numeric prices"""
+    df = pd.DataFrame({
+        'title': ['Test Item'],
+        'current_bid': [1250.0],
+        'msrp': [20.0],
+        'hours_remaining': [2.0],
+        'search_term': ['test']
+    })
+    save_path = tmp_path / "results.csv"
+    format_results(df, str(save_path))
+    assert "$1,250.00" in capsys.readouterr().out
+    saved = pd.read_csv(save_path)
+    assert saved['current_bid'][0] == "$1,250.00"
+    assert df['current_bid'].dtype == 'float64'
@@ -0,0 +1,101 @@
+"""
+Tests for columnar DataFrame construction
+"""
+
+import math
+
+import pandas as pd
+import pytest
+
+from bidfta_scraper import BidFTAItem
+from bidfta_scraper.frames import FrameBuilder, merge_duplicate_terms
+
+ITEM_DATA = {
+    "title": "Test Item",
+    "currentBid": 10.5,
+    "utcEndDateTime": "2024-01-20T14:19:00Z",
+    "itemTimeRemaining": "7200",
+    "msrp": "20",
+    "lotCode": "ABC123",
+    "bidsCount": 3,
+    "auctionId": "54321",
+}
+
+def test_build_dtypes():
+    """Test that columns come out with numeric and datetime dtypes"""
+    builder = FrameBuilder()
+    builder.append(BidFTAItem(ITEM_DATA, "test"))
+    builder.extend_rows([BidFTAItem.row_from_data({"title": "Sparse", "itemTimeRemaining": ""})], "other")
+    df = builder.build()
+
+    assert len(builder) == 2
+    assert df['current_bid'].dtype == 'float64'
+    assert df['bids_count'].dtype == 'int64'
+    assert pd.api.types.is_datetime64_any_dtype(df['end_datetime'])
+    assert df['msrp'].tolist() == [20.0, 0.0]
+    assert df['hours_remaining'][0] == 2.0
+    assert math.isnan(df['hours_remaining'][1])
+    assert df['search_term'].tolist() == ["test", "other"]
+
+def test_build_mixed_end_times():
+    """Test that 'Z', offset and naive end times all parse to UTC in one column"""
+    builder = FrameBuilder()
+    for end in ("2024-01-20T14:00:00Z", "2024-01-20T14:00:00", "2024-01-20T19:00:00+05:00", "soon"):
+        builder.extend_rows([BidFTAItem.row_from_data({"title": end, "utcEndDateTime": end})], "test")
+    df = builder.build()
+
+    assert str(df['end_datetime'].dt.tz) == "UTC"
+    assert df['end_datetime'][:3].tolist() == [pd.Timestamp("2024-01-20T14:00:00Z")] * 3
+    assert pd.isna(df['end_datetime'][3])
+
+def test_build_matches_row_path():
+    """Test that the columnar path keeps the to_dict column order"""
+    item = BidFTAItem(ITEM_DATA, "test")
+    builder = FrameBuilder()
+    builder.append(item)
+
+    assert list(builder.build().columns) == list(item.to_dict()) + ['hours_remaining']
+
+def test_item_views():
+    """Test reading buffered items back, with their converted values"""
+    items = [BidFTAItem({"title": "A", "currentBid": 1.0, "itemTimeRemaining": "60"}, "x"), BidFTAItem({"title": "B"}, "y")]
+    builder = FrameBuilder(items)
+    builder.extend_rows([BidFTAItem.row_from_data({"title": "C", "lotCode": "L3"})], "z")
+
+    assert len(builder) == 3
+    assert builder.columns["title"] == ["A", "B", "C"]
+    assert builder.columns["search_term"] == ["x", "y", "z"]
+    assert builder[2].lot_code == "L3"
+    assert builder[0].time_remaining == 60.0
+    assert math.isnan(builder[1].time_remaining)
+    assert list(builder.to_dicts()[0]) == list(items[0].to_dict())
+    assert builder.to_dicts()[0]['current_bid'] == 1.0
+    assert [item.title for item in builder] == ["A", "B", "C"]
+
+def test_build_empty():
+    """Test building a frame with no items"""
+    df = FrameBuilder().build()
+    assert df.empty
+    assert 'current_bid' in df.columns
+
+def test_build_arrow():
+    """Test building an Arrow table when pyarrow is installed"""
+    pytest.importorskip("pyarrow")
+    builder = FrameBuilder()
+    builder.append(BidFTAItem(ITEM_DATA, "test"))
+    assert builder.build_arrow().num_rows == 1
+
+def test_merge_duplicate_terms():
+    """Test that lots found by several terms collapse into one row"""
+    builder = FrameBuilder()
+    for term, lots in (("aquarium", ["L1", "L2"]), ("fish tank", ["L2", "L3"]), ("tank", ["L2"])):
+        builder.extend(BidFTAItem({"title": lot, "lotCode": lot, "auctionId": "A1"}, term) for lot in lots)
+    builder.extend([BidFTAItem({"title": "no key"}, "tank"), BidFTAItem({"title": "no key"}, "tank")])
+
+    df = merge_duplicate_terms(builder.build())
+    assert df['title'].tolist() == ["L1", "L2", "L3", "no key", "no key"]
+    assert df['search_term'].tolist() == ["aquarium", "aquarium", "fish tank", "tank", "tank"]
+    assert df['search_terms'].tolist() == [
+        ["aquarium"], ["aquarium", "fish tank", "tank"], ["fish tank"], ["tank"], ["tank"]
+    ]
+    assert df.index.tolist() == list(range(5))
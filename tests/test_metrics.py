@@ -0,0 +1,77 @@
+"""
+Tests for scrape metrics
+"""
+
+import asyncio
+
+from benchmarks.replay_server import ReplayServer
+from bidfta_scraper import AsyncBidFTAScraper, BidFTAScraper, PrometheusExporter, ResponseCache
+from bidfta_scraper.metrics import InMemoryMetrics, RunMetrics
+
+def test_run_metrics_forward_to_sink():
+    """Test that run metrics are summarized and forwarded"""
+    sink = InMemoryMetrics()
+    metrics = RunMetrics(sink)
+    metrics.increment('requests')
+    metrics.increment('bytes', 100)
+    with metrics.time('parse'):
+        pass
+    metrics.observe('parse', 0.5)
+
+    summary = metrics.summary()
+    assert summary['counters'] == {'requests': 1, 'bytes': 100}
+    assert summary['timings']['parse']['count'] == 2
+    assert summary['timings']['parse']['max'] == 0.5
+    assert sink.summary() == summary
+
+def test_prometheus_render(tmp_path):
+    """Test the Prometheus text format"""
+    exporter = PrometheusExporter(prefix='test')
+    exporter.increment('requests', 3)
+    exporter.increment('bytes', 1234567)
+    exporter.observe('fetch', 0.25)
+    exporter.observe('fetch', 0.5)
+    text = exporter.render()
+    assert "# TYPE test_requests_total counter\ntest_requests_total 3\n" in text
+    assert "test_bytes_total 1234567\n" in text
+    assert 'test_stage_seconds_sum{stage="fetch"} 0.750000' in text
+    assert 'test_stage_seconds_count{stage="fetch"} 2' in text
+
+    path = tmp_path / "bidfta.prom"
+    exporter.write(str(path))
+    assert path.read_text() == text
+
+def test_async_scrape_metrics():
+    """Test counters and stage timings of an async run against the replay server"""
+    exporter = PrometheusExporter()
+
+    async def run():
+        async with ReplayServer(items_per_page=4, total_pages=2) as url:
+            scraper = AsyncBidFTAScraper(base_url=url, request_delay=0, metrics=exporter)
+            await scraper.scrape_search_terms(["tank"])
+            first = scraper.last_metrics.summary()
+            await scraper.scrape_search_terms(["tank"])
+        return first, scraper.last_metrics.summary()
+
+    first, second = asyncio.run(run())
+    counters = first['counters']
+    assert counters['requests'] == 2
+    assert counters['items'] == 8
+    assert counters['bytes'] > 0
+    assert {'fetch', 'parse', 'dataframe', 'run'} <= set(first['timings'])
+    assert first['timings']['fetch']['count'] == 2
+    # Each run starts afresh while the exporter accumulates
+    assert second['counters']['requests'] == 2
+    assert exporter.counters['requests'] == 4
+
+def test_sync_cache_hit_metrics(tmp_path):
+    """Test that cache hits are counted and skip the network"""
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    with ReplayServer(items_per_page=2, total_pages=1).running_in_thread() as url:
+        scraper = BidFTAScraper(base_url=url, request_delay=0, cache=cache)
+        scraper.scrape_search_terms(["tank"])
+        scraper.scrape_search_terms(["tank"])
+    counters = scraper.last_metrics.summary()['counters']
+    assert counters.get('requests', 0) == 0
+    assert counters['cache_hits'] == 1
+    assert counters['items'] == 2
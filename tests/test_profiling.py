@@ -0,0 +1,74 @@
+"""
+Tests for profiling hooks
+"""
+
+import asyncio
+import os
+import pstats
+import time
+import tracemalloc
+
+import pytest
+
+from benchmarks.replay_server import ReplayServer
+from bidfta_scraper import AsyncBidFTAScraper, BidFTAScraper, Profiler
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(100))
+
+def test_cprofile_artifact(tmp_path):
+    """Test that a cProfile run writes stats pstats can load"""
+    profiler = Profiler(str(tmp_path))
+    with profiler.run("unit"):
+        busy(0.01)
+    [path] = profiler.last_artifacts
+    assert path.endswith("-unit.prof")
+    assert pstats.Stats(path).total_calls > 0
+
+def test_sampling_artifact(tmp_path):
+    """Test that the stack sampler writes collapsed stacks"""
+    profiler = Profiler(str(tmp_path), cpu='sample', sample_interval=0.001)
+    with profiler.run():
+        busy(0.1)
+    [path] = profiler.last_artifacts
+    with open(path) as file:
+        lines = file.read().splitlines()
+    assert lines
+    assert any("busy (test_profiling.py" in line for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+def test_memory_snapshots_during_async_scrape(tmp_path):
+    """Test tracemalloc snapshots at the configured stages of a scrape"""
+    profiler = Profiler(str(tmp_path), cpu=None, memory=True, memory_stages=['scraped', 'dataframe'])
+
+    async def run():
+        async with ReplayServer(items_per_page=5, total_pages=2) as url:
+            await AsyncBidFTAScraper(base_url=url, request_delay=0, profiler=profiler).scrape_search_terms(["tank"])
+
+    asyncio.run(run())
+    names = sorted(os.path.basename(path).split("-async-")[1] for path in profiler.last_artifacts)
+    assert names == ["dataframe.tracemalloc", "memory.txt", "scraped.tracemalloc"]
+    assert set(profiler.summary()) == {'scraped', 'dataframe'}
+    snapshot = tracemalloc.Snapshot.load(profiler.last_artifacts[0])
+    assert snapshot.statistics('filename')
+    assert not tracemalloc.is_tracing()
+
+def test_sync_scraper_profile(tmp_path):
+    """Test that each sync run gets its own profile"""
+    profiler = Profiler(str(tmp_path))
+    with ReplayServer(items_per_page=2, total_pages=1).running_in_thread() as url:
+        scraper = BidFTAScraper(base_url=url, request_delay=0, profiler=profiler)
+        scraper.scrape_search_terms(["tank"])
+        first = profiler.last_artifacts
+        scraper.scrape_search_terms(["tank"])
+    assert first != profiler.last_artifacts
+    assert len(os.listdir(tmp_path)) == 2
+
+def test_invalid_options():
+    """Test that unknown modes and stages are rejected"""
+    with pytest.raises(ValueError):
+        Profiler(cpu='perf')
+    with pytest.raises(ValueError):
+        Profiler(memory=True, memory_stages=['parse'])
@@ -0,0 +1,74 @@
+"""
+Tests for the token-bucket rate limiter
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from bidfta_scraper import AsyncBidFTAScraper, BidFTAScraper
+from bidfta_scraper.rate_limit import TokenBucket, make_rate_limiter
+
+def test_burst_then_wait():
+    """Test that a full bucket allows a burst and then spaces requests out"""
+    with patch('bidfta_scraper.rate_limit.time.monotonic', return_value=100.0):
+        bucket = TokenBucket(rate=2, burst=3)
+        delays = [bucket.reserve() for _ in range(5)]
+
+    assert delays == [0.0, 0.0, 0.0, 0.5, 1.0]
+
+def test_refill():
+    """Test that tokens refill over time up to the burst size"""
+    with patch('bidfta_scraper.rate_limit.time.monotonic') as monotonic:
+        monotonic.return_value = 0.0
+        bucket = TokenBucket(rate=10, burst=2)
+        bucket.reserve()
+        bucket.reserve()
+        monotonic.return_value = 60.0
+        delays = [bucket.reserve() for _ in range(3)]
+
+    assert delays == [0.0, 0.0, pytest.approx(0.1)]
+
+def test_acquire_async():
+    """Test waiting on the event loop for a token"""
+    bucket = TokenBucket(rate=1000, burst=1)
+
+    async def acquire_all():
+        await asyncio.gather(*[bucket.acquire_async() for _ in range(5)])
+
+    asyncio.run(asyncio.wait_for(acquire_all(), 1))
+
+def test_cancelled_waiters_return_tokens():
+    """Test that tasks cancelled while waiting for a token do not delay later callers"""
+    bucket = TokenBucket(rate=10, burst=1)
+
+    async def run():
+        waiters = [asyncio.ensure_future(bucket.acquire_async()) for _ in range(50)]
+        await asyncio.sleep(0.01)
+        for waiter in waiters[1:]:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.sleep(0.1)
+        return bucket.reserve()
+
+    assert asyncio.run(run()) < 0.05
+
+def test_make_rate_limiter():
+    """Test building limiters from scraper settings"""
+    shared = TokenBucket(5)
+    assert make_rate_limiter(None) is None
+    assert make_rate_limiter(0) is None
+    assert make_rate_limiter(3, rate_limiter=shared) is shared
+    assert make_rate_limiter(3, burst=4).burst == 4
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+def test_scraper_defaults():
+    """Test that scrapers derive their rate from request_delay and can share a limiter"""
+    assert BidFTAScraper(request_delay=2).rate_limiter.rate == 0.5
+    assert AsyncBidFTAScraper(request_delay=0.5, max_concurrent_requests=5).rate_limiter.rate == 10
+    assert AsyncBidFTAScraper(request_delay=0).rate_limiter is None
+
+    shared = TokenBucket(20, burst=5)
+    assert BidFTAScraper(rate_limiter=shared).rate_limiter is AsyncBidFTAScraper(rate_limiter=shared).rate_limiter
@@ -0,0 +1,75 @@
+"""
+Tests for the offline replay server
+"""
+
+import asyncio
+
+import aiohttp
+
+from benchmarks.replay_server import ReplayServer, write_fixtures
+from bidfta_scraper import AsyncBidFTAScraper, BidFTAScraper
+from bidfta_scraper.retry import RetryPolicy
+
+def test_async_scraper_against_replay_server():
+    """Test that the async scraper follows pagination on the replay server"""
+    async def run():
+        server = ReplayServer(items_per_page=5, total_pages=3)
+        async with server as url:
+            scraper = AsyncBidFTAScraper(base_url=url, request_delay=0)
+            df = await scraper.scrape_search_terms(["tank", "lamp"])
+        return server, df
+
+    server, df = asyncio.run(run())
+    assert len(df) == 2 * 5 * 3
+    assert set(df['search_term']) == {"tank", "lamp"}
+    assert server.requests >= 6
+
+def test_sync_scraper_against_replay_server():
+    """Test the sync scraper against a server on a background thread"""
+    server = ReplayServer(items_per_page=4, total_pages=2)
+    with server.running_in_thread() as url:
+        df = BidFTAScraper(base_url=url, request_delay=0).scrape_search_terms(["tank"])
+    assert len(df) == 8
+
+def test_pages_are_deterministic_per_term():
+    """Test that a term always gets the same page and other terms differ"""
+    server = ReplayServer(items_per_page=3, total_pages=2)
+    assert server.page("tank", "616", 1) == ReplayServer(items_per_page=3, total_pages=2).page("tank", "616", 1)
+    assert server.page("tank", "616", 1) != server.page("lamp", "616", 1)
+
+def test_errors_and_conditional_requests():
+    """Test simulated 503s and If-None-Match handling"""
+    async def run():
+        server = ReplayServer(items_per_page=2, total_pages=1, error_rate=1.0)
+        async with server as url:
+            scraper = AsyncBidFTAScraper(base_url=url, request_delay=0,
+                                         retry_policy=RetryPolicy(max_attempts=2, backoff_base=0))
+            df = await scraper.scrape_search_terms(["tank"])
+            failures = len(scraper.last_report.failures)
+
+            server.error_rate = 0.0
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"{url}?pageId=1&itemSearchKeywords=tank&locations=616") as response:
+                    etag = response.headers["ETag"]
+                async with session.get(f"{url}?pageId=1&itemSearchKeywords=tank&locations=616",
+                                       headers={"If-None-Match": etag}) as response:
+                    status = response.status
+        return server, df, failures, status
+
+    server, df, failures, status = asyncio.run(run())
+    assert df.empty
+    assert failures == 1
+    assert server.errors == 2
+    assert status == 304
+    assert server.not_modified == 1
+
+def test_fixture_corpus(tmp_path):
+    """Test serving a written fixture corpus for any search term"""
+    write_fixtures(str(tmp_path), items_per_page=3, total_pages=2)
+
+    async def run():
+        async with ReplayServer(fixtures_dir=str(tmp_path)) as url:
+            return await AsyncBidFTAScraper(base_url=url, request_delay=0).scrape_search_terms(["anything"])
+
+    df = asyncio.run(run())
+    assert len(df) == 6
@@ -0,0 +1,123 @@
+"""
+Tests for retry handling and failure reporting
+"""
+
+import asyncio
+from unittest.mock import Mock, patch
+
+import aiohttp
+import pytest
+import requests
+
+from bidfta_scraper import AsyncBidFTAScraper, BidFTAItem, BidFTAScraper
+from bidfta_scraper.retry import RetryPolicy, ScrapeReport
+
+class FakeResponse:
+    """Minimal stand-in for an aiohttp response"""
+
+    def __init__(self, status, body=b"", headers=None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(Mock(real_url="http://test"), (), status=self.status, headers=self.headers)
+
+    async def read(self):
+        return self.body
+
+class FakeSession:
+    """Serves a fixed sequence of responses"""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        return self.responses.pop(0)
+
+def test_should_retry():
+    """Test which failures are retried"""
+    policy = RetryPolicy(max_attempts=3)
+    assert policy.should_retry(1, None)
+    assert policy.should_retry(2, 503)
+    assert not policy.should_retry(1, 404)
+    assert not policy.should_retry(3, 503)
+    with pytest.raises(ValueError):
+        RetryPolicy(max_attempts=0)
+
+def test_backoff():
+    """Test exponential backoff with cap, jitter and Retry-After"""
+    policy = RetryPolicy(backoff_base=1, backoff_cap=5, jitter=False)
+    assert [policy.backoff(attempt) for attempt in (1, 2, 3, 4)] == [1, 2, 4, 5]
+    assert policy.backoff(1, retry_after=3) == 3
+    jittered = RetryPolicy(backoff_base=1, backoff_cap=5)
+    assert all(0 <= jittered.backoff(3) <= 4 for _ in range(20))
+
+def test_report():
+    """Test summarizing failures by term"""
+    report = ScrapeReport()
+    assert report.ok
+    report.add_failure("u1", "boom", 3, "monitor", 2)
+    report.add_failure("u2", "boom", 3, "monitor", 5)
+    report.add_failure("u3", "boom", 1, "aquarium", 1)
+    assert not report.ok
+    assert report.failed_terms == ["aquarium", "monitor"]
+    assert report.failed_pages() == {"monitor": [2, 5], "aquarium": [1]}
+
+def test_async_fetch_page_retries():
+    """Test that transient statuses are retried until the page arrives"""
+    scraper = AsyncBidFTAScraper(request_delay=0, retry_policy=RetryPolicy(backoff_base=0))
+    session = FakeSession([FakeResponse(503), FakeResponse(429, headers={"Retry-After": "0"}), FakeResponse(200, b"ok")])
+
+    assert asyncio.run(scraper.fetch_page(session, "http://test")) == b"ok"
+    assert session.calls == 3
+    assert scraper.last_report.retries == 2
+    assert scraper.last_report.ok
+
+def test_async_fetch_page_gives_up():
+    """Test that permanent failures are reported with their term and page"""
+    scraper = AsyncBidFTAScraper(request_delay=0, retry_policy=RetryPolicy(max_attempts=2, backoff_base=0))
+    session = FakeSession([FakeResponse(500), FakeResponse(500)])
+
+    assert asyncio.run(scraper.fetch_page(session, "http://test", "monitor", 4)) is None
+    assert scraper.last_report.failed_pages() == {"monitor": [4]}
+    assert scraper.last_report.failures[0].attempts == 2
+
+def test_async_failed_page_does_not_end_listing():
+    """Test that a failed middle page is skipped rather than truncating the term"""
+    scraper = AsyncBidFTAScraper(request_delay=0)
+    results = {2: None, 3: [BidFTAItem.row_from_data({"title": "c"})]}
+
+    async def fake_fetch_page_rows(session, search_term, page_id, location_id=None):
+        return results[page_id]
+
+    with patch.object(scraper, 'fetch_page_rows', side_effect=fake_fetch_page_rows):
+        rows = asyncio.run(scraper.scrape_remaining_pages(None, "monitor", 3))
+
+    assert [BidFTAItem.from_row(row, "monitor").title for row in rows] == ["c"]
+
+def test_sync_fetch_page_retries():
+    """Test retrying connection errors in the sync scraper"""
+    scraper = BidFTAScraper(request_delay=0, retry_policy=RetryPolicy(backoff_base=0))
+    response = Mock(content=b"ok", status_code=200, headers={})
+    with patch.object(scraper.session, 'get', side_effect=[requests.exceptions.ConnectionError("down"), response]):
+        assert scraper.fetch_page("http://test") == b"ok"
+    assert scraper.last_report.retries == 1
+
+def test_sync_scrape_records_failure():
+    """Test that a term whose request keeps failing is reported"""
+    scraper = BidFTAScraper(request_delay=0, retry_policy=RetryPolicy(max_attempts=2, backoff_base=0))
+    with patch.object(scraper.session, 'get', side_effect=requests.exceptions.ConnectionError("down")):
+        df = scraper.scrape_search_terms(["monitor"])
+
+    assert df.empty
+    assert scraper.last_report.failed_terms == ["monitor"]
@@ -0,0 +1,67 @@
+"""
+Tests for vectorized deal scoring
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bidfta_scraper import DealScorer, top_deals
+
+def make_frame():
+    return pd.DataFrame({
+        'title': ['half off', 'full price', 'no msrp', 'contested', 'ended'],
+        'current_bid': [50.0, 100.0, 10.0, 10.0, 1.0],
+        'msrp': [100.0, 100.0, 0.0, 100.0, 100.0],
+        'bids_count': [0, 0, 0, 100, 0],
+        'hours_remaining': [12.0, 12.0, 12.0, 12.0, -1.0],
+    })
+
+def test_components():
+    """Test the individual score components"""
+    components = DealScorer(urgency_horizon=24).components(make_frame())
+    assert components['discount'].tolist() == [0.5, 0.0, 0.0, 0.9, 0.99]
+    assert components['competition'][0] == 1.0
+    assert components['competition'][3] == pytest.approx(1 / (1 + 100 / 12))
+    assert components['urgency'].tolist() == [0.5, 0.5, 0.5, 0.5, 0.0]
+
+def test_score_weights():
+    """Test that the score is the weighted mean of the components and ended items score 0"""
+    df = make_frame()
+    scores = DealScorer(discount_weight=1, competition_weight=0, urgency_weight=0).score(df)
+    assert scores.tolist() == pytest.approx([0.5, 0.0, 0.0, 0.9, 0.0])
+    with pytest.raises(ValueError):
+        DealScorer(discount_weight=0, competition_weight=0, urgency_weight=0)
+
+def test_missing_values():
+    """Test that missing prices and times score as neutral instead of NaN"""
+    df = pd.DataFrame({'current_bid': [math.nan], 'msrp': [math.nan], 'hours_remaining': [math.nan]})
+    scores = DealScorer().score(df)
+    assert not scores.isna().any()
+
+def test_top_matches_full_sort():
+    """Test that top-K selection agrees with sorting every score"""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'current_bid': rng.random(1000) * 100,
+        'msrp': rng.random(1000) * 200,
+        'bids_count': rng.integers(0, 20, 1000),
+        'hours_remaining': rng.random(1000) * 48,
+    })
+    scorer = DealScorer()
+    top = scorer.top(df, 25)
+    expected = scorer.score(df).sort_values(ascending=False).head(25)
+    assert top['score'].tolist() == pytest.approx(expected.tolist())
+    assert top.index.tolist() == top.sort_values('score', ascending=False).index.tolist()
+
+def test_top_deals_edge_cases():
+    """Test k larger than the frame, k=0 and currency strings"""
+    df = make_frame()
+    assert len(top_deals(df, k=50)) == len(df)
+    assert top_deals(df, k=0).empty
+    assert top_deals(df, k=1)['title'].tolist() == ['half off']
+
+    as_strings = df.assign(current_bid=['$50.00', '$100.00', '$10.00', '$10.00', '$1.00'])
+    assert top_deals(as_strings, k=1)['title'].tolist() == ['half off']
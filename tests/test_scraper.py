@@ -2,10 +2,12 @@
 Tests for the BidFTA Scraper
 """
 
+import json
 import pytest
 from bidfta_scraper import BidFTAScraper, BidFTAItem, format_results
+from bidfta_scraper.cache import PageResponse
 import pandas as pd
-from unittest.mock import Mock, patch
+from unittest.mock import patch
 
 @pytest.fixture
 def mock_response():
@@ -65,15 +67,13 @@ def test_bidfta_item_creation():
     assert item.current_bid == 10.00
     assert item.search_term == "test"
 
-@patch('requests.Session')
-def test_scrape_search_term(mock_session, scraper, mock_response):
+def test_scrape_search_term(scraper, mock_response):
     """Test scraping a single search term"""
     # Setup mock response
-    mock_get = Mock()
-    mock_get.text = '<script id="__NEXT_DATA__">' + str(mock_response) + '</script>'
-    mock_session.return_value.get.return_value = mock_get
+    body = ('<script id="__NEXT_DATA__">' + json.dumps(mock_response) + '</script>').encode()
     
-    items = scraper.scrape_search_term("aquarium")
+    with patch.object(scraper, 'fetch_response', return_value=PageResponse(body, 200)):
+        items = scraper.scrape_search_term("aquarium")
     
     assert len(items) == 1
     assert items[0].title == "Test Aquarium"
@@ -129,21 +129,130 @@ def test_scrape_search_terms():
     """Test scraping multiple search terms"""
     scraper = BidFTAScraper()
     
-    # Mock the scrape_search_term method
-    with patch.object(scraper, 'scrape_search_term') as mock_scrape:
+    # Mock the scrape_search_term_rows method
+    with patch.object(scraper, 'scrape_search_term_rows') as mock_scrape:
         # Setup mock return values
-        mock_item = BidFTAItem({
+        mock_row = BidFTAItem.row_from_data({
             "title": "Test Item",
             "currentBid": 10.00,
             "msrp": 20.00,
             "condition": "New",
             "lotCode": "ABC123"
-        }, "test")
-        mock_scrape.return_value = [mock_item]
+        })
+        mock_scrape.return_value = [mock_row]
         
         # Test with multiple search terms
         results_df = scraper.scrape_search_terms(["term1", "term2"])
         
         # Verify the method was called for each search term
         assert mock_scrape.call_count == 2
-        assert len(results_df) == 2  # One result per search term
\ No newline at end of file
+        assert len(results_df) == 2  # One result per search term
+
+def make_payload(titles, **metadata):
+    """Build a __NEXT_DATA__ payload holding the given item titles"""
+    initial_data = {"items": [{"title": title, "lotCode": title} for title in titles]}
+    initial_data.update(metadata)
+    return {"props": {"pageProps": {"initialData": initial_data}}}
+
+def make_page(titles, **metadata):
+    """Build a results page whose __NEXT_DATA__ holds the given item titles"""
+    payload = json.dumps(make_payload(titles, **metadata))
+    return f'<html><script id="__NEXT_DATA__" type="application/json">{payload}</script></html>'.encode()
+
+def page_id_of(url):
+    """Return the pageId query value of a search URL"""
+    return int(url.split("pageId=")[1].split("&")[0])
+
+def test_build_url_page(scraper):
+    """Test URL building for later result pages"""
+    url = scraper.build_url("aquarium", page_id=3)
+    assert "pageId=3&" in url
+
+def test_get_page_count():
+    """Test reading the page count from page metadata"""
+    from bidfta_scraper.pagination import get_page_count
+
+    assert get_page_count(make_payload(["a"], totalPages=4), 1) == 4
+    assert get_page_count(make_payload(["a", "b"], totalItems=5), 2) == 3
+    assert get_page_count(make_payload(["a"]), 1) == 1
+    assert get_page_count({}, 0) == 1
+
+def test_scrape_search_term_pagination(scraper):
+    """Test that every result page is followed until an empty page"""
+    pages = {
+        1: make_page(["a", "b"], totalPages=4),
+        2: make_page(["c", "d"]),
+        3: make_page([]),
+        4: make_page(["never"]),
+    }
+    with patch.object(scraper, 'fetch_response', side_effect=lambda url, *args: PageResponse(pages[page_id_of(url)], 200)):
+        items = scraper.scrape_search_term("aquarium")
+
+    assert [item.title for item in items] == ["a", "b", "c", "d"]
+    assert scraper.page_counts["aquarium"] == 4
+
+def test_scrape_search_term_max_pages():
+    """Test capping the number of pages fetched per term"""
+    scraper = BidFTAScraper(max_pages=1)
+    with patch.object(scraper, 'fetch_response', return_value=PageResponse(make_page(["a"], totalPages=9), 200)) as mock_fetch:
+        items = scraper.scrape_search_term("aquarium")
+
+    assert len(items) == 1
+    assert mock_fetch.call_count == 1
+
+def test_bidfta_item_rows():
+    """Test round-tripping items through compact row tuples"""
+    item_data = {"title": "Test Item", "currentBid": 10.0, "lotCode": "ABC123", "bidsCount": 3}
+    row = BidFTAItem.row_from_data(item_data)
+    item = BidFTAItem.from_row(row, "test")
+
+    assert item.to_dict() == BidFTAItem(item_data, "test").to_dict()
+
+def test_bidfta_item_slots():
+    """Test that items carry no per-instance __dict__"""
+    item = BidFTAItem({"title": "Test"}, "test")
+    assert not hasattr(item, "__dict__")
+    with pytest.raises(AttributeError):
+        item.unknown = 1
+
+def location_of(url):
+    """Return the locations query value of a search URL"""
+    return url.split("locations=")[1].split("&")[0]
+
+def test_parse_location_ids():
+    """Test the accepted forms of the location_id argument"""
+    from bidfta_scraper.locations import parse_location_ids
+
+    assert parse_location_ids("616") == ["616"]
+    assert parse_location_ids("616, 700") == ["616", "700"]
+    assert parse_location_ids([616, "700", "616"]) == ["616", "700"]
+    with pytest.raises(ValueError):
+        parse_location_ids([])
+
+def test_scrape_multiple_locations():
+    """Test fanning out over locations with a location_id column and deduplication"""
+    scraper = BidFTAScraper(location_id=["616", "700"], request_delay=0)
+    pages = {"616": make_page(["a", "shared"]), "700": make_page(["shared", "b"])}
+
+    assert scraper.build_url("aquarium", 2, "700").endswith("pageId=2&itemSearchKeywords=aquarium&locations=700")
+    with patch.object(scraper, 'fetch_response', side_effect=lambda url, *args: PageResponse(pages[location_of(url)], 200)):
+        df = scraper.scrape_search_terms(["aquarium"])
+
+    assert df['title'].tolist() == ["a", "shared", "b"]
+    assert df['location_id'].tolist() == ["616", "616", "700"]
+    assert scraper.page_counts == {("aquarium", "616"): 1, ("aquarium", "700"): 1}
+
+def test_scrape_search_terms_dedupe_terms():
+    """Test merging lots returned by overlapping terms"""
+    pages = {"aquarium": make_page(["a", "shared"]), "fish+tank": make_page(["shared", "b"])}
+
+    def fake_fetch_response(url, *args):
+        return PageResponse(pages[url.split("itemSearchKeywords=")[1].split("&")[0]], 200)
+
+    for dedupe, expected in ((False, 4), (True, 3)):
+        scraper = BidFTAScraper(request_delay=0, dedupe_terms=dedupe)
+        with patch.object(scraper, 'fetch_response', side_effect=fake_fetch_response):
+            df = scraper.scrape_search_terms(["aquarium", "fish+tank"])
+        assert len(df) == expected
+
+    assert df['search_terms'].tolist() == [["aquarium"], ["aquarium", "fish+tank"], ["fish+tank"]]
@@ -0,0 +1,128 @@
+"""
+Tests for the incremental SQLite item store
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from bidfta_scraper import BidFTAItem, BidFTAScraper, ItemStore
+from bidfta_scraper.frames import FrameBuilder
+
+def make_data(lot_code, bid, bids=0, end="2024-01-20T14:00:00Z", auction="A1"):
+    return {
+        "title": f"Item {lot_code}",
+        "currentBid": bid,
+        "bidsCount": bids,
+        "utcEndDateTime": end,
+        "lotCode": lot_code,
+        "auctionId": auction,
+    }
+
+def make_item(lot_code, bid, bids=0, term="tank", end="2024-01-20T14:00:00Z", auction="A1"):
+    return BidFTAItem(make_data(lot_code, bid, bids, end, auction), term)
+
+def test_upsert_updates_in_place(tmp_path):
+    """Test that repeated writes update items keyed by auction and lot"""
+    store = ItemStore(str(tmp_path / "items.sqlite"))
+    assert store.upsert([make_item("L1", 5.0), make_item("L2", 7.0)], observed_at=100) == 2
+    store.upsert([make_item("L1", 6.0, bids=1)], observed_at=200)
+
+    assert len(store) == 2
+    items = store.query().set_index('lot_code')
+    assert items.loc['L1', 'current_bid'] == 6.0
+    assert items.loc['L1', 'first_seen'] == 100
+    assert items.loc['L1', 'last_seen'] == 200
+    assert store._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+def test_bid_snapshots_only_on_change():
+    """Test that a snapshot is recorded for new items and bid changes only"""
+    store = ItemStore(":memory:")
+    store.upsert([make_item("L1", 5.0)], observed_at=100)
+    store.upsert([make_item("L1", 5.0)], observed_at=200)
+    store.upsert([make_item("L1", 8.0, bids=2)], observed_at=300)
+
+    history = store.bid_history("A1", "L1")
+    assert history['current_bid'].tolist() == [5.0, 8.0]
+    assert history['bids_count'].tolist() == [0, 2]
+    assert history['observed_at'][1] == pd.Timestamp(300, unit='s', tz='UTC')
+
+def test_batched_writes():
+    """Test writes spanning several transactions and duplicates within a batch"""
+    store = ItemStore(":memory:", batch_size=3)
+    items = [make_item(f"L{i}", float(i)) for i in range(10)] + [make_item("L0", 99.0)]
+    assert store.upsert(items) == 11
+    assert len(store) == 10
+    assert store.query(min_price=99)['lot_code'].tolist() == ["L0"]
+
+def test_query_filters():
+    """Test the term, end time and price filters"""
+    store = ItemStore(":memory:")
+    store.upsert([
+        make_item("L1", 5.0, term="tank", end="2024-01-20T10:00:00Z"),
+        make_item("L2", 50.0, term="tank", end="2024-01-21T10:00:00Z"),
+        make_item("L3", 20.0, term="filter", end="2024-01-20T12:00:00-05:00"),
+    ])
+
+    assert store.query(search_term="tank")['lot_code'].tolist() == ["L1", "L2"]
+    assert store.query(ending_before="2024-01-20T18:00:00Z")['lot_code'].tolist() == ["L1", "L3"]
+    assert store.query(ending_after=datetime(2024, 1, 20, 17, tzinfo=timezone.utc))['lot_code'].tolist() == ["L2"]
+    assert store.query(min_price=10, max_price=30)['lot_code'].tolist() == ["L3"]
+    assert store.query(limit=1)['end_datetime'][0] == pd.Timestamp("2024-01-20T10:00:00Z")
+    with pytest.raises(ValueError):
+        store.query(ending_before="soon")
+
+def test_query_by_any_matching_term(tmp_path):
+    """Test that an item found by several terms is returned for each of them"""
+    store = ItemStore(str(tmp_path / "items.sqlite"))
+    store.upsert([make_item("L1", 5.0, term="aquarium"), make_item("L1", 5.0, term="fish tank")])
+    store.upsert([make_item("L2", 9.0, term="fish tank")])
+    df = pd.DataFrame([make_item("L3", 1.0, term="aquarium").to_dict()]).assign(search_terms=[["aquarium", "filter"]])
+    store.upsert_frame(df)
+
+    assert store.query(search_term="aquarium")['lot_code'].tolist() == ["L1", "L3"]
+    assert store.query(search_term="fish tank", max_price=6)['lot_code'].tolist() == ["L1"]
+    assert store.query(search_term="filter")['lot_code'].tolist() == ["L3"]
+    assert len(store) == 3
+
+def test_item_terms_backfilled_for_older_stores(tmp_path):
+    """Test that opening a store without item_terms keeps its items queryable by term"""
+    path = str(tmp_path / "items.sqlite")
+    store = ItemStore(path)
+    store.upsert([make_item("L1", 5.0, term="aquarium")])
+    store._conn.execute("DROP TABLE item_terms")
+    store.close()
+
+    assert ItemStore(path).query(search_term="aquarium")['lot_code'].tolist() == ["L1"]
+
+def test_end_times_match_between_items_and_frames():
+    """Test that upsert and upsert_frame store the same UTC text for every end time form"""
+    ends = ["2024-01-20T14:00:00Z", "2024-01-20T14:00:00", "2024-01-20T09:00:00-05:00"]
+    items = [make_item(f"L{i}", 1.0, end=end) for i, end in enumerate(ends)]
+    df = pd.DataFrame([item.to_dict() for item in items])
+
+    texts = []
+    for write in (lambda store: store.upsert(items), lambda store: store.upsert_frame(df)):
+        store = ItemStore(":memory:")
+        write(store)
+        texts.append([row[0] for row in store._conn.execute("SELECT end_datetime FROM items ORDER BY lot_code")])
+    assert texts[0] == texts[1] == ["2024-01-20 14:00:00"] * 3
+
+def test_upsert_frame_and_scraper_integration():
+    """Test storing result DataFrames, including currency strings"""
+    store = ItemStore(":memory:")
+    builder = FrameBuilder()
+    builder.extend([make_item("L1", 1250.0, bids=3)])
+    df = builder.build()
+    assert store.upsert_frame(df.assign(current_bid=["$1,250.00"])) == 1
+    stored = store.query()
+    assert stored['current_bid'][0] == 1250.0
+    assert stored['bids_count'][0] == 3
+    assert stored['end_datetime'][0] == pd.Timestamp("2024-01-20T14:00:00Z")
+
+    scraper = BidFTAScraper(store=store)
+    with patch.object(scraper, 'scrape_search_term_rows', return_value=[BidFTAItem.row_from_data(make_data("L2", 3.0))]):
+        scraper.scrape_search_terms(["tank"])
+    assert len(store) == 2
@@ -0,0 +1,25 @@
+"""
+Tests for end time parsing
+"""
+
+import pandas as pd
+
+from bidfta_scraper import times
+
+VALUES = ["2024-01-20T14:00:00Z", "2024-01-20T14:00:00", "2024-01-20T09:00:00-05:00", "soon", "", None]
+
+def test_to_utc():
+    """Test that naive times are UTC and offsets are converted"""
+    expected = pd.Timestamp("2024-01-20T14:00:00Z")
+    assert [times.to_utc(value) for value in VALUES] == [expected] * 3 + [None] * 3
+    assert times.to_epoch_seconds("2024-01-20T14:00:00") == expected.timestamp()
+
+def test_to_utc_series_without_iso8601_format(monkeypatch):
+    """Test that the per-value fallback for pandas < 2.0 parses like format='ISO8601'"""
+    values = pd.Series(VALUES, index=list("abcdef"))
+    parsed = times.to_utc_series(values)
+    monkeypatch.setattr(times, "_HAS_ISO8601_FORMAT", False)
+    fallback = times.to_utc_series(values)
+
+    assert fallback.isna().tolist() == [False] * 3 + [True] * 3
+    assert fallback.equals(parsed)
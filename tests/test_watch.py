@@ -0,0 +1,126 @@
+"""
+Tests for the watch mode scheduler
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from bidfta_scraper import AsyncBidFTAScraper, BidFTAItem, DeltaEngine, ItemStore, WatchScheduler
+from bidfta_scraper.delta import BID_CHANGED, NEW
+from bidfta_scraper.watch import seconds_left
+
+def make_item(lot_code, seconds, bid=1.0, term="tank"):
+    end = datetime.fromtimestamp(time.time() + seconds, tz=timezone.utc).isoformat()
+    return BidFTAItem({"title": lot_code, "lotCode": lot_code, "currentBid": bid, "utcEndDateTime": end}, term)
+
+def test_seconds_left():
+    """Test end time parsing with a time_remaining fallback"""
+    item = BidFTAItem({"utcEndDateTime": "2024-01-20T14:00:00Z"}, "t")
+    now = datetime(2024, 1, 20, 13, tzinfo=timezone.utc).timestamp()
+    assert seconds_left(item, now) == 3600
+    assert seconds_left(BidFTAItem({"utcEndDateTime": "2024-01-20T14:00:00"}, "t"), now) == 3600
+    assert seconds_left(BidFTAItem({"itemTimeRemaining": "90"}, "t"), now) == 90
+    assert seconds_left(BidFTAItem({}, "t"), now) is None
+
+def test_interval_tiers():
+    """Test that terms ending sooner are polled more often"""
+    scheduler = WatchScheduler(AsyncBidFTAScraper(), [], tiers=[(3600, 60), (600, 10)], idle_interval=1000)
+    assert scheduler.interval_for([make_item("a", 300), make_item("b", 5000)]) == 10
+    assert scheduler.interval_for([make_item("a", 1800)]) == 60
+    assert scheduler.interval_for([make_item("a", 86400)]) == 1000
+    assert scheduler.interval_for([make_item("ended", -60)]) == 1000
+    assert scheduler.interval_for([]) == 1000
+
+def test_watch_polls_urgent_terms_more_often():
+    """Test that the priority queue re-polls the term with items ending soon first"""
+    scraper = AsyncBidFTAScraper(request_delay=0)
+    responses = {
+        "soon": [make_item("s1", 60, term="soon")],
+        "later": [make_item("l1", 86400, term="later")],
+    }
+
+    async def fake_scrape(session, term, on_page=None, location_id=None):
+        return responses[term]
+
+    scheduler = WatchScheduler(scraper, ["soon", "later"], tiers=[(3600, 0.01)], idle_interval=60)
+
+    async def run():
+        return [result async for result in scheduler.watch(max_polls=5)]
+
+    with patch.object(scraper, 'scrape_search_term', side_effect=fake_scrape):
+        results = asyncio.run(run())
+
+    terms = [result.search_term for result in results]
+    assert sorted(terms[:2]) == ["later", "soon"]
+    assert terms[2:] == ["soon", "soon", "soon"]
+    assert results[-1].next_poll == 0.01
+
+def test_watch_feeds_delta_and_store():
+    """Test that polls report changes and are written to the store"""
+    scraper = AsyncBidFTAScraper(request_delay=0)
+    bids = iter([1.0, 1.0, 2.0])
+
+    async def fake_scrape(session, term, on_page=None, location_id=None):
+        return [make_item("L1", 60, bid=next(bids))]
+
+    store = ItemStore(":memory:")
+    scheduler = WatchScheduler(scraper, ["tank"], tiers=[(3600, 0.01)], delta=DeltaEngine(), store=store)
+
+    async def run():
+        return [result async for result in scheduler.watch(max_polls=3)]
+
+    with patch.object(scraper, 'scrape_search_term', side_effect=fake_scrape):
+        results = asyncio.run(run())
+
+    assert [[event.kind for event in result.events] for result in results] == [[NEW], [], [BID_CHANGED]]
+    assert store.query()['current_bid'].tolist() == [2.0]
+
+def test_watch_stops_cleanly_on_break():
+    """Test that breaking out of the loop cancels polls still in flight"""
+    scraper = AsyncBidFTAScraper(request_delay=0)
+
+    async def fake_scrape(session, term, on_page=None, location_id=None):
+        if term == "slow":
+            await asyncio.sleep(10)
+        return []
+
+    scheduler = WatchScheduler(scraper, ["fast", "slow"])
+
+    async def run():
+        async for result in scheduler.watch():
+            return result.search_term
+
+    with patch.object(scraper, 'scrape_search_term', side_effect=fake_scrape):
+        start = time.monotonic()
+        assert asyncio.run(run()) == "fast"
+    assert time.monotonic() - start < 5
+
+def test_failed_poll_skips_delta_and_retries_soon():
+    """Test that a poll with a failed request is not taken as an empty result"""
+    scraper = AsyncBidFTAScraper(request_delay=0)
+    polls = iter([True, False])
+
+    async def fake_scrape(session, term, on_page=None, location_id=None):
+        if next(polls):
+            return [make_item("L1", 300)]
+        scraper.last_report.add_failure("http://example", "503", 3, term, 1)
+        return []
+
+    delta = DeltaEngine()
+    store = ItemStore(":memory:")
+    scheduler = WatchScheduler(scraper, ["tank"], tiers=[(3600, 0.01)], retry_interval=0.02,
+                               idle_interval=7200, delta=delta, store=store)
+
+    async def run():
+        return [result async for result in scheduler.watch(max_polls=2)]
+
+    with patch.object(scraper, 'scrape_search_term', side_effect=fake_scrape):
+        first, second = asyncio.run(run())
+
+    assert [event.kind for event in first.events] == [NEW]
+    assert second.failed and second.events == []
+    assert second.next_poll == 0.02
+    assert len(delta) == 1
+    assert len(store) == 1